@@ -0,0 +1,31 @@
+"""store consignment images by storage key
+
+Revision ID: d41f0b8e6c37
+Revises: a3c9e71d5b20
+Create Date: 2026-10-18 11:03:27.904615
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd41f0b8e6c37'
+down_revision = 'a3c9e71d5b20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # image_path used to hold a path relative to the working directory
+    # ("uploads/consignments/..."); it now holds a key relative to the storage root.
+    op.execute(
+        "UPDATE consignments SET image_path = substr(image_path, length('uploads/') + 1) "
+        "WHERE image_path LIKE 'uploads/%'"
+    )
+
+
+def downgrade():
+    op.execute(
+        "UPDATE consignments SET image_path = 'uploads/' || image_path "
+        "WHERE image_path IS NOT NULL AND image_path NOT LIKE 'uploads/%'"
+    )
@@ -1,5 +1,5 @@
 from app.api.api_v1.routers import accounts, auth, roles, user_roles, users, exchanges, stores, consignments, \
-    product_categories, deposit_bills, shipments, fulfillments, change_logs, user_addresses
+    product_categories, deposit_bills, shipments, fulfillments, change_logs, user_addresses, internal, user_finances
 from fastapi import APIRouter
 
 api_router = APIRouter()
@@ -17,4 +17,6 @@ api_router.include_router(deposit_bills.router)
 api_router.include_router(shipments.router)
 api_router.include_router(fulfillments.router)
 api_router.include_router(change_logs.router)
-api_router.include_router(user_addresses.router)
\ No newline at end of file
+api_router.include_router(user_addresses.router)
+api_router.include_router(user_finances.router)
+api_router.include_router(internal.router)
@@ -3,7 +3,7 @@ from typing import Any, List
 from fastapi import APIRouter, Body, Depends, HTTPException, Security
 from sqlalchemy.orm import Session
 
-from app import crud, models, schemas
+from app import crud, schemas
 from app.api import deps
 from app.constants.role import Role
 from app.schemas.base.response import Response
@@ -19,8 +19,8 @@ def get_accounts(
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
-    current_user: models.User = Security(
-        deps.get_current_active_user,
+    current_user: schemas.Principal = Security(
+        deps.get_current_active_principal,
         scopes=[Role.ADMIN["name"], Role.SUPER_ADMIN["name"]],
     ),
 ) -> Any:
@@ -38,7 +38,7 @@ def get_account_for_user(
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
-    current_user: models.User = Depends(deps.get_current_active_user),
+    current_user: schemas.Principal = Depends(deps.get_current_active_principal),
 ) -> Any:
     """
     Retrieve account for a logged in user.
@@ -53,7 +53,7 @@ def create_account(
     *,
     db: Session = Depends(deps.get_db),
     account_in: schemas.AccountCreate,
-    current_user: models.User = Depends(deps.get_current_active_user),
+    current_user: schemas.Principal = Depends(deps.get_current_active_principal),
 ) -> Any:
     """
     Create an user account
@@ -68,8 +68,8 @@ def update_account(
     db: Session = Depends(deps.get_db),
     account_id: int,
     account_in: schemas.AccountUpdate,
-    current_user: models.User = Security(
-        deps.get_current_active_user,
+    current_user: schemas.Principal = Security(
+        deps.get_current_active_principal,
         scopes=[
             Role.ADMIN["name"],
             Role.SUPER_ADMIN["name"],
@@ -90,7 +90,7 @@ def add_user_to_account(
     db: Session = Depends(deps.get_db),
     account_id: int,
     user_id: str = Body(..., embed=True),
-    current_user: models.User = Depends(deps.get_current_active_user),
+    current_user: schemas.Principal = Depends(deps.get_current_active_principal),
 ) -> Any:
     """
     Add a user to an account.
@@ -106,8 +106,8 @@ def retrieve_users_for_account(
     skip: int = 0,
     limit: int = 100,
     account_id: int,
-    current_user: models.User = Security(
-        deps.get_current_active_user,
+    current_user: schemas.Principal = Security(
+        deps.get_current_active_principal,
         scopes=[Role.ADMIN["name"], Role.SUPER_ADMIN["name"]],
     ),
 ) -> Any:
@@ -124,8 +124,8 @@ def retrieve_users_for_own_account(
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
-    current_user: models.User = Security(
-        deps.get_current_active_user,
+    current_user: schemas.Principal = Security(
+        deps.get_current_active_principal,
         scopes=[
             Role.ADMIN["name"],
             Role.SUPER_ADMIN["name"],
@@ -1,53 +1,44 @@
-from datetime import timedelta
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
-from app import crud, schemas
+from app import schemas
 from app.api import deps
-from app.core import security
-from app.core.config import settings
+from app.services.auth_service import login_access_token_service, refresh_access_token_service
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 @router.post("/access-token", response_model=schemas.Token)
-def login_access_token(
+async def login_access_token(
     db: Session = Depends(deps.get_db),
     form_data: OAuth2PasswordRequestForm = Depends(),
 ) -> Any:
     """
     OAuth2 compatible token login, get an access token for future requests
+
+    Answers 429 when the password hashing pool is saturated.
     """
-    user = crud.user.authenticate(
+    return await login_access_token_service(
         db, email=form_data.username, password=form_data.password
     )
-    if not user:
-        raise HTTPException(
-            status_code=400, detail="Incorrect email or password"
-        )
-    elif not crud.user.is_active(user):
-        raise HTTPException(status_code=400, detail="Inactive user")
-    access_token_expires = timedelta(
-        minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
-    )
-    if not user.user_role:
-        role = "USER"
-    else:
-        role = user.user_role.role.name
-    token_payload = {
-        "id": str(user.id),
-        "role": role,
-        "account_id": str(user.account_id),
-    }
-    return {
-        "access_token": security.create_access_token(
-            token_payload, expires_delta=access_token_expires
-        ),
-        "token_type": "bearer",
-    }
+
+
+@router.post("/refresh-token", response_model=schemas.Token)
+def refresh_access_token(
+    db: Session = Depends(deps.get_db),
+    refresh_token: str = Body(..., embed=True),
+) -> Any:
+    """
+    Get a new access token (and a new refresh token) without re-sending credentials.
+
+    ## Request Body Parameters
+    - **refresh_token** (`string`, required): The refresh token returned by the last login or refresh.
+      Each refresh token can be used once; reusing one signs the user out everywhere.
+    """
+    return refresh_access_token_service(db, refresh_token=refresh_token)
 
 
 # @router.post("/test-token", response_model=schemas.User)
@@ -1,26 +1,29 @@
-from typing import Any, List
+from typing import Any, List, Optional
 
 from fastapi import APIRouter, Depends, Security, HTTPException, Query, Path
 from sqlalchemy.orm import Session
 
-from app import schemas, models, crud
+from app import schemas, crud
 from app.api import deps
 from app.constants.role import Role
-from app.schemas.base.response import Response
+from app.schemas.base.response import Response, PaginatedResponse
 from app.services.change_log_service import get_change_log_by_id
 
 router = APIRouter(prefix="/change_logs", tags=["change_logs"])
 
 
-@router.get("", response_model=Response[List[schemas.ChangeLog]])
+@router.get("", response_model=PaginatedResponse[List[schemas.ChangeLog]])
 def read_change_logs(
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_read_db),
         skip: int = Query(0, description="Number of records to skip (for pagination)"),
         limit: int = Query(100, description="Maximum number of records to return"),
+        cursor: Optional[str] = Query(
+            None, description="Opaque cursor from a previous page's next_cursor. Overrides skip"
+        ),
         user_id: int = Query(0, description="Filter by user ID"),
         object_type: str = Query("", description="Filter by object type"),
-        current_user: models.User = Security(
-        deps.get_current_active_user,
+        current_user: schemas.Principal = Security(
+        deps.get_current_active_principal,
         scopes=[Role.ADMIN["name"], Role.SUPER_ADMIN["name"]],
     ),
 ) -> Any:
@@ -33,9 +36,10 @@ def read_change_logs(
     if object_type:
         filters["object_type"] = object_type
 
-    change_logs = crud.change_log.get_multi(db, skip=skip, limit=limit, filters=filters)
+    change_logs = crud.change_log.get_multi(db, skip=skip, limit=limit, filters=filters, cursor=cursor)
+    next_cursor = crud.change_log.next_cursor(change_logs, limit=limit)
 
-    return Response(message="", data=change_logs)
+    return PaginatedResponse(message="", data=change_logs, next_cursor=next_cursor)
 
 
 @router.post("", response_model=Response[schemas.ChangeLog])
@@ -43,8 +47,8 @@ def create_change_log(
     *,
     db: Session = Depends(deps.get_db),
     change_log_in: schemas.ChangeLogCreate,
-    current_user: models.User = Security(
-        deps.get_current_active_user,
+    current_user: schemas.Principal = Security(
+        deps.get_current_active_principal,
         scopes=[Role.ADMIN["name"], Role.SUPER_ADMIN["name"]],
     ),
 ) -> Any:
@@ -67,10 +71,10 @@ def create_change_log(
 @router.get("/{change_log_id}", response_model=Response[schemas.ChangeLog])
 def read_change_log(
     *,
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_read_db),
     change_log_id: int = Path(..., description= "The ID of the change log to retrieve"),
-    current_user: models.User = Security(
-        deps.get_current_active_user,
+    current_user: schemas.Principal = Security(
+        deps.get_current_active_principal,
         scopes=[Role.ADMIN["name"], Role.SUPER_ADMIN["name"]],
     ),
 ) -> Any:
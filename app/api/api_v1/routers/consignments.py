@@ -4,21 +4,24 @@ import uuid
 from datetime import datetime, UTC
 from typing import List, Any, Optional
 
-from fastapi import APIRouter, Depends, Security, HTTPException, Query, Path
+from fastapi import APIRouter, Depends, Security, HTTPException, Query, Path, File, UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app import schemas, models, crud
+from app import schemas, crud
 from app.api import deps
 from app.constants.role import Role
-from app.schemas.base.response import Response
-from app.services.consignment_service import create_consignment_with_shipments, update_consignment_with_shipments
+from app.schemas.base.response import Response, PaginatedResponse
+from app.services.consignment_import_service import import_consignments_service
+from app.services.consignment_service import create_consignment_with_shipments, update_consignment_with_shipments, \
+    upload_consignment_image
 
 router = APIRouter(prefix="/consignments", tags=["consignments"])
 
 
-@router.get("", response_model=Response[List[schemas.Consignment]])
-def read_consignments(
-    db: Session = Depends(deps.get_db),
+@router.get("", response_model=PaginatedResponse[List[schemas.Consignment]])
+async def read_consignments(
+    db: AsyncSession = Depends(deps.get_async_read_db),
         skip: int = Query(
             0,
             description="Number of records to skip for pagination",
@@ -30,6 +33,10 @@ def read_consignments(
             ge=1,
             le=1000
         ),
+        cursor: Optional[str] = Query(
+            None,
+            description="Opaque cursor from a previous page's next_cursor. Overrides skip"
+        ),
         id: Optional[int] = Query(
             None,
             description="Filter consignments by ID"
@@ -52,14 +59,14 @@ def read_consignments(
         ),
         order_by: str = Query(
             "id",
-            description="Field to order results by (e.g., 'id', 'code', 'created_at')"
+            description="Field to order results by: 'id', 'code', 'created_at', 'source_store_id' or 'dest_store_id'"
         ),
         direction: str = Query(
             "desc",
             description="Sort direction ('asc' for ascending, 'desc' for descending)"
         ),
-    current_user: models.User = Security(
-        deps.get_current_active_user,
+    current_user: schemas.Principal = Security(
+        deps.get_current_active_principal,
         scopes=[Role.ADMIN["name"], Role.SUPER_ADMIN["name"], Role.USER["name"]],
     ),
 ) -> Any:
@@ -78,13 +85,15 @@ def read_consignments(
     if created_at_end is not None:
         filters["created_at_end"] = created_at_end
 
-    if current_user.user_role.role.name == Role.USER["name"]:
+    if current_user.role == Role.USER["name"]:
        filters["user_id"] = current_user.id
 
-    consignments = crud.consignment.get_multi(db, skip=skip, limit=limit, filters=filters,
-                                                 order_by=order_by, direction=direction)
+    consignments = await crud.consignment.aio.get_multi(db, skip=skip, limit=limit, filters=filters,
+                                                        order_by=order_by, direction=direction, cursor=cursor,
+                                                        profile="with_foreign_codes")
+    next_cursor = crud.consignment.next_cursor(consignments, limit=limit, order_by=order_by, direction=direction)
 
-    return Response(message="", data=consignments)
+    return PaginatedResponse(message="", data=consignments, next_cursor=next_cursor)
 
 
 @router.post("", response_model=Response[schemas.Consignment])
@@ -92,8 +101,8 @@ def create_consignment(
     *,
     db: Session = Depends(deps.get_db),
     consignment_in: schemas.ConsignmentCreate,
-    current_user: models.User = Security(
-        deps.get_current_active_user,
+    current_user: schemas.Principal = Security(
+        deps.get_current_active_principal,
         scopes=[Role.ADMIN["name"], Role.SUPER_ADMIN["name"], Role.USER["name"]],
     ),
 ):
@@ -122,22 +131,69 @@ def create_consignment(
     - **product_name** (`string`, optional): Name of the product.
     - **note** (`string`, optional): Additional notes about the consignment.
     - **foreign_shipment_codes** (`list[str]`, optional): List of foreign shipment tracking codes.
-    - **image_base64** (`string`, optional): Base64 encoded image of the consignment.
-    - **image_path** (`string`, optional): File path of the consignment image uploaded during creation.
+    - **image_base64** (`string`, optional): Base64 encoded image of the consignment. Legacy, prefer
+      `POST /consignments/{consignment_id}/image`.
     """
 
     consignment = create_consignment_with_shipments(db, consignment_in, current_user)
     return Response(message="", data=consignment)
 
 
+@router.post("/import", response_model=Response[schemas.ConsignmentImportResult])
+def import_consignments(
+    *,
+    db: Session = Depends(deps.get_db),
+    file: UploadFile = File(..., description="CSV or XLSX file with one consignment per row"),
+    current_user: schemas.Principal = Security(
+        deps.get_current_active_principal,
+        scopes=[Role.ADMIN["name"], Role.SUPER_ADMIN["name"], Role.USER["name"]],
+    ),
+) -> Any:
+    """
+    Bulk import consignments from a CSV or XLSX file.
+
+    The first row holds the column names, which are the consignment creation fields
+    (see `POST /consignments`). `foreign_shipment_codes` is a list of codes separated
+    by `;`, `,` or spaces. `image_base64` is ignored.
+
+    Valid rows are created with their foreign shipments; the response reports how many
+    rows were created and the errors of every rejected row (row 1 being the header).
+    """
+    result = import_consignments_service(db, file, current_user)
+    return Response(message="", data=result)
+
+
+@router.post("/{consignment_id}/image", response_model=Response[schemas.Consignment])
+def upload_image(
+    *,
+    db: Session = Depends(deps.get_db),
+    consignment_id: int = Path(..., description="The ID of the consignment the image belongs to"),
+    file: UploadFile = File(..., description="JPEG, PNG or WebP image of the consignment"),
+    current_user: schemas.Principal = Security(
+        deps.get_current_active_principal,
+        scopes=[Role.ADMIN["name"], Role.SUPER_ADMIN["name"], Role.USER["name"]],
+    ),
+) -> Any:
+    """
+    Upload the image of a consignment as multipart/form-data.
+
+    The image is streamed to disk and stored under the hash of its content, so
+    identical uploads share one file. A thumbnail and a recompressed display
+    variant are generated as well and returned as `image_thumbnail_url` and
+    `image_display_url`. Prefer this over `image_base64`.
+    """
+    consignment = upload_consignment_image(db, consignment_id, file, current_user)
+    return Response(message="", data=consignment)
+
+
 @router.put("/{consignment_id}", response_model=Response[schemas.Consignment])
 def update_consignment(
     *,
     db: Session = Depends(deps.get_db),
     consignment_id: int = Path(..., description= "The ID of the consignment to retrieve"),
     consignment_in: schemas.ConsignmentUpdate,
-    current_user: models.User = Security(
-        deps.get_current_active_user,
+    current_user: schemas.Principal = Security(
+        deps.get_current_active_principal,
         scopes=[Role.ADMIN["name"], Role.SUPER_ADMIN["name"], Role.USER["name"]],
     ),
 ) -> Any:
@@ -165,7 +221,8 @@ def update_consignment(
     - **product_category_id** (`integer`, optional): ID of the product category.
     - **product_name** (`string`, optional): Name of the product.
     - **note** (`string`, optional): Additional notes about the consignment.
-    - **foreign_shipment_codes** (`list[str]`, optional): List of foreign shipment tracking codes.
+    - **foreign_shipment_codes** (`list[str]`, optional): The full list of foreign shipment tracking codes. Shipments
+      of removed codes are deleted (only while FOREIGN_SHIPPING), new codes get a shipment. Omit to keep them.
     - **image_base64** (`string`, optional): Base64 encoded image of the consignment.
 
     """
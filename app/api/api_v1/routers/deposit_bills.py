@@ -4,17 +4,17 @@ from typing import Any, List, Optional
 from fastapi import APIRouter, Depends, Security, HTTPException, Query, Path
 from sqlalchemy.orm import Session
 
-from app import schemas, models, crud
+from app import schemas, crud
 from app.api import deps
 from app.constants.deposit import DepositStatus
 from app.constants.role import Role
 from app.schemas import UserFinanceUpdate, UserFinanceCreate
-from app.schemas.base.response import Response
+from app.schemas.base.response import Response, PaginatedResponse
 from app.services.deposit_bill_service import update_deposit_bill_service
 
 router = APIRouter(prefix="/deposit-bills", tags=["deposit-bills"])
 
-@router.get("", response_model=Response[List[schemas.DepositBill]])
+@router.get("", response_model=PaginatedResponse[List[schemas.DepositBill]])
 def read_deposit_bills(
     db: Session = Depends(deps.get_db),
         skip: int = Query(
@@ -27,12 +27,16 @@ def read_deposit_bills(
             description="Maximum number of records to return",
             ge=1, le=1000
         ),
+        cursor: Optional[str] = Query(
+            None,
+            description="Opaque cursor from a previous page's next_cursor. Overrides skip"
+        ),
     created_at: Optional[datetime] = Query(
         None,
         description="Filter users created on or after this date and time (format: YYYY-MM-DDTHH:MM:SS)"
     ),
-    current_user: models.User = Security(
-        deps.get_current_active_user,
+    current_user: schemas.Principal = Security(
+        deps.get_current_active_principal,
         scopes=[Role.ADMIN["name"], Role.SUPER_ADMIN["name"], Role.USER["name"]],
     ),
 ) -> Any:
@@ -41,22 +45,23 @@ def read_deposit_bills(
     """
     filters = {}
     if created_at is not None:
-        filters["created_at"] = created_at
+        filters["created_at_start"] = created_at
 
-    if current_user.user_role.role.name == Role.USER["name"]:
+    if current_user.role == Role.USER["name"]:
         filters["user_id"] = current_user.id
 
-    deposit_bills = crud.deposit_bill.get_multi(db, skip=skip, limit=limit, filters=filters)
+    deposit_bills = crud.deposit_bill.get_multi(db, skip=skip, limit=limit, filters=filters, cursor=cursor)
+    next_cursor = crud.deposit_bill.next_cursor(deposit_bills, limit=limit)
 
-    return Response(message="", data=deposit_bills)
+    return PaginatedResponse(message="", data=deposit_bills, next_cursor=next_cursor)
 
 @router.post("", response_model=Response[schemas.DepositBill])
 def create_deposit_bill(
     *,
     db: Session = Depends(deps.get_db),
     deposit_bill_in: schemas.DepositBillCreate,
-    current_user: models.User = Security(
-        deps.get_current_active_user,
+    current_user: schemas.Principal = Security(
+        deps.get_current_active_principal,
         scopes=[Role.ADMIN["name"], Role.SUPER_ADMIN["name"]],
     ),
 ) -> Any:
@@ -83,8 +88,8 @@ def update_deposit_bill(
     db: Session = Depends(deps.get_db),
     deposit_bill_id: int = Path(... , description= "The ID of the deposit bill to retrieve"),
     deposit_bill_in: schemas.DepositBillUpdate,
-    current_user: models.User = Security(
-        deps.get_current_active_user,
+    current_user: schemas.Principal = Security(
+        deps.get_current_active_principal,
         scopes=[Role.ADMIN["name"], Role.SUPER_ADMIN["name"]],
     ),
 ) -> Any:
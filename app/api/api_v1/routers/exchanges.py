@@ -3,7 +3,7 @@ from typing import Any, List
 from fastapi import APIRouter, Depends, Security, HTTPException, Query, Path
 from sqlalchemy.orm import Session
 
-from app import schemas, models, crud
+from app import schemas, crud
 from app.api import deps
 from app.constants.role import Role
 from app.schemas.base.response import Response
@@ -24,8 +24,8 @@ def read_exchanges(
             description="Maximum number of records to return",
             ge=1, le=1000
         ),
-    current_user: models.User = Security(
-        deps.get_current_active_user,
+    current_user: schemas.Principal = Security(
+        deps.get_current_active_principal,
         scopes=[Role.ADMIN["name"], Role.SUPER_ADMIN["name"], Role.USER["name"]],
     ),
 ) -> Any:
@@ -72,8 +72,8 @@ def update_exchange(
     db: Session = Depends(deps.get_db),
     exchange_id: int = Path(..., description="The ID of the exchange to update."),
     exchange_in: schemas.ExchangeUpdate,
-    current_user: models.User = Security(
-        deps.get_current_active_user,
+    current_user: schemas.Principal = Security(
+        deps.get_current_active_principal,
         scopes=[Role.SUPER_ADMIN["name"]],
     ),
 ) -> Any:
@@ -89,6 +89,7 @@ def update_exchange(
     exchange = update_exchange_service(
         db,
         exchange_id,
-        exchange_in
+        exchange_in,
+        current_user_id=current_user.id
     )
     return Response(message="", data=exchange)
\ No newline at end of file
@@ -1,31 +1,35 @@
 from typing import Any, List, Optional
 
 from fastapi import APIRouter, Depends, Security, HTTPException, Query, Path
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app import schemas, models, crud
+from app import schemas, crud
 from app.api import deps
 from app.constants.role import Role
-from app.schemas.base.response import Response
+from app.schemas.base.response import Response, PaginatedResponse
 from app.services.fulfillment_service import update_fulfillment_service
 
 router = APIRouter(prefix="/fulfillments", tags=["fulfillments"])
 
-@router.get("", response_model=Response[List[schemas.Fulfillment]])
-def read_fulfillments(
-        db: Session = Depends(deps.get_db),
+@router.get("", response_model=PaginatedResponse[List[schemas.Fulfillment]])
+async def read_fulfillments(
+        db: AsyncSession = Depends(deps.get_async_read_db),
         skip: int = Query(0, description="Number of records to skip for pagination"),
         limit: int = Query(100, description="Maximum number of records to return"),
+        cursor: Optional[str] = Query(
+            None, description="Opaque cursor from a previous page's next_cursor. Overrides skip"
+        ),
         consignment_id: Optional[int] = Query(None, description="Filter by consignment ID"),
         fulfillment_status: Optional[int] = Query(None, description="Filter by fulfillment status"),
         finance_status: Optional[int] = Query(None, description="Filter by finance status"),
         foreign_shipping_codes: Optional[str] = Query(
             None, description="Comma-separated list of foreign shipping codes to filter by"
         ),
-        order_by: str = Query("id", description="Field to sort by (e.g., id, created_at)"),
+        order_by: str = Query("id", description="Field to sort by: id or created_at"),
         direction: str = Query("desc", description="Sort direction: 'asc' for ascending, 'desc' for descending"),
-        current_user: models.User = Security(
-        deps.get_current_active_user,
+        current_user: schemas.Principal = Security(
+        deps.get_current_active_principal,
         scopes=[Role.ADMIN["name"], Role.SUPER_ADMIN["name"], Role.USER["name"]],
     ),
 ) -> Any:
@@ -43,23 +47,25 @@ def read_fulfillments(
         codes_list = [code.strip() for code in foreign_shipping_codes.split(",")] if foreign_shipping_codes else None
         if codes_list:
             shipment_filters = {
-                "codes": foreign_shipping_codes
+                "codes": codes_list
             }
-            shipments = crud.shipment.get_multi(db, filters=shipment_filters)
+            shipments = await crud.shipment.aio.get_multi(db, filters=shipment_filters)
             if not shipments:
                 raise HTTPException(
                     status_code=404,
                     detail="The shipments do not exist in the system."
                 )
-            filters["shipment_id"] = [shipment.id for shipment in shipments]
+            filters["shipment_ids"] = [shipment.id for shipment in shipments]
 
-    if current_user.user_role.role.name == Role.USER["name"]:
+    if current_user.role == Role.USER["name"]:
         filters["user_id"] = current_user.id
 
-    fulfillments = crud.fulfillment.get_multi(db, skip=skip, limit=limit, filters=filters,
-                                              order_by=order_by, direction=direction)
+    fulfillments = await crud.fulfillment.aio.get_multi(db, skip=skip, limit=limit, filters=filters,
+                                                        order_by=order_by, direction=direction, cursor=cursor,
+                                                        profile="with_shipment_and_consignment")
+    next_cursor = crud.fulfillment.next_cursor(fulfillments, limit=limit, order_by=order_by, direction=direction)
 
-    return Response(message="", data=fulfillments)
+    return PaginatedResponse(message="", data=fulfillments, next_cursor=next_cursor)
 
 @router.put("/{fulfillment_id}", response_model=Response[schemas.Fulfillment])
 def update_fulfillment(
@@ -67,8 +73,8 @@ def update_fulfillment(
     db: Session = Depends(deps.get_db),
     fulfillment_id: int = Path(..., description= "The ID of the fulfillment to retrieve"),
     fulfillment_in: schemas.FulfillmentUpdate,
-    current_user: models.User = Security(
-        deps.get_current_active_user,
+    current_user: schemas.Principal = Security(
+        deps.get_current_active_principal,
         scopes=[Role.ADMIN["name"], Role.SUPER_ADMIN["name"]],
     ),
 ) -> Any:
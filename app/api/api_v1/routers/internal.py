@@ -0,0 +1,32 @@
+from typing import Any, Dict
+
+from fastapi import APIRouter, Security
+
+from app import schemas
+from app.api import deps
+from app.constants.role import Role
+from app.core.security import password_hash_pool
+from app.db.pool import pool_stats
+from app.db.session import async_engine, async_replica_engines, engine, replica_engines
+from app.schemas.base.response import Response
+
+router = APIRouter(prefix="/internal", tags=["internal"])
+
+
+@router.get("/pool-stats", response_model=Response[Dict[str, Any]])
+def read_pool_stats(
+    current_user: schemas.Principal = Security(
+        deps.get_current_active_principal,
+        scopes=[Role.SUPER_ADMIN["name"]],
+    ),
+) -> Any:
+    """
+    Connection pool and password hash pool statistics of this worker process.
+    """
+    return Response(message="", data={
+        "db": pool_stats(engine),
+        "db_async": pool_stats(async_engine.sync_engine),
+        "db_replicas": [pool_stats(replica_engine) for replica_engine in replica_engines],
+        "db_replicas_async": [pool_stats(replica_engine.sync_engine) for replica_engine in async_replica_engines],
+        "password_hash": password_hash_pool.stats(),
+    })
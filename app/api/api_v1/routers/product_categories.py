@@ -3,7 +3,7 @@ from typing import Any, List
 from fastapi import APIRouter, Depends, Security, HTTPException, Query, Path
 from sqlalchemy.orm import Session
 
-from app import schemas, models, crud
+from app import schemas, crud
 from app.api import deps
 from app.constants.role import Role
 from app.schemas.base.response import Response
@@ -24,8 +24,8 @@ def read_product_categories(
             description="Maximum number of records to return",
             ge=1, le=1000
         ),
-    current_user: models.User = Security(
-        deps.get_current_active_user,
+    current_user: schemas.Principal = Security(
+        deps.get_current_active_principal,
         scopes=[Role.ADMIN["name"], Role.SUPER_ADMIN["name"], Role.USER["name"]],
     ),
 ) -> Any:
@@ -41,8 +41,8 @@ def create_product_category(
     *,
     db: Session = Depends(deps.get_db),
     product_category_in: schemas.ProductCategoryCreate,
-    current_user: models.User = Security(
-        deps.get_current_active_user,
+    current_user: schemas.Principal = Security(
+        deps.get_current_active_principal,
         scopes=[Role.SUPER_ADMIN["name"]],
     ),
 ) -> Any:
@@ -66,8 +66,8 @@ def update_product_category(
     db: Session = Depends(deps.get_db),
     product_category_id: int = Path(..., description= "The ID of the product category to retrieve"),
     product_category_in: schemas.ProductCategoryUpdate,
-    current_user: models.User = Security(
-        deps.get_current_active_user,
+    current_user: schemas.Principal = Security(
+        deps.get_current_active_principal,
         scopes=[Role.SUPER_ADMIN["name"]],
     ),
 ) -> Any:
@@ -1,21 +1,23 @@
 from typing import Any, List, Optional
 
 from fastapi import APIRouter, Depends, Security, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app import schemas, models, crud
+from app import schemas, crud
 from app.api import deps
 from app.constants.fulfillment import FulfillmentShippingType, FulfillmentStatus
 from app.constants.role import Role
 from app.constants.shipment import ShipmentStatus
-from app.schemas.base.response import Response
-from app.services.shipments_service import update_shipment_service
+from app.schemas.base.response import Response, PaginatedResponse
+from app.services.shipments_service import scan_shipments_service, transition_shipments_service, \
+    update_shipment_service
 
 router = APIRouter(prefix="/shipments", tags=["shipments"])
 
-@router.get("", response_model=Response[List[schemas.Shipment]])
-def read_shipments(
-    db: Session = Depends(deps.get_db),
+@router.get("", response_model=PaginatedResponse[List[schemas.Shipment]])
+async def read_shipments(
+    db: AsyncSession = Depends(deps.get_async_read_db),
         skip: int = Query(
             0,
             description="Number of records to skip for pagination.",
@@ -26,6 +28,10 @@ def read_shipments(
             description="Maximum number of records to return.",
             ge=1, le=1000
         ),
+        cursor: Optional[str] = Query(
+            None,
+            description="Opaque cursor from a previous page's next_cursor. Overrides skip."
+        ),
         consignment_id: Optional[int] = Query(
             None,
             description="Filter shipments by consignment ID."
@@ -44,14 +50,14 @@ def read_shipments(
         ),
         order_by: str = Query(
             "id",
-            description="Field to order results by ."
+            description="Field to order results by: 'id', 'code' or 'created_at'."
         ),
         direction: str = Query(
             "desc",
             description="Sort direction: 'asc' for ascending, 'desc' for descending."
         ),
-    current_user: models.User = Security(
-        deps.get_current_active_user,
+    current_user: schemas.Principal = Security(
+        deps.get_current_active_principal,
         scopes=[Role.ADMIN["name"], Role.SUPER_ADMIN["name"], Role.USER["name"]],
     ),
 ) -> Any:
@@ -68,16 +74,61 @@ def read_shipments(
     if foreign_shipment_code is not None:
         filters["code"] = foreign_shipment_code
 
-    if current_user.user_role.role.name == Role.USER["name"]:
+    if current_user.role == Role.USER["name"]:
         filters["user_id"] = current_user.id
 
-    shipments = crud.shipment.get_multi(db, skip=skip, limit=limit, filters=filters,
-                                             order_by=order_by, direction=direction)
+    shipments = await crud.shipment.aio.get_multi(db, skip=skip, limit=limit, filters=filters,
+                                                  order_by=order_by, direction=direction, cursor=cursor,
+                                                  profile="with_consignment")
+    next_cursor = crud.shipment.next_cursor(shipments, limit=limit, order_by=order_by, direction=direction)
+
+    return PaginatedResponse(message="", data=shipments, next_cursor=next_cursor)
+
+@router.post("/scan", response_model=Response[schemas.ShipmentScanResult])
+def scan_shipments(
+    *,
+    db: Session = Depends(deps.get_db),
+    scan_in: schemas.ShipmentScan,
+    current_user: schemas.Principal = Security(
+        deps.get_current_active_principal,
+        scopes=[Role.ADMIN["name"], Role.SUPER_ADMIN["name"]],
+    ),
+) -> Any:
+    """
+    Look up scanned foreign shipment codes in bulk, for warehouse receiving.
+
+    Request Body Parameters
+    - **codes** (`list[string]`, required): Up to 1000 scanned codes, matched case-insensitively.
+
+    Returns the matching shipments with their consignment and customer, and
+    the codes that matched nothing in `not_found`.
+    """
+    result = scan_shipments_service(db=db, scan_in=scan_in)
+    return Response(message="", data=result)
+
+@router.post("/status-transitions", response_model=Response[schemas.ShipmentStatusTransitionResult])
+def transition_shipments(
+    *,
+    db: Session = Depends(deps.get_db),
+    transition_in: schemas.ShipmentStatusTransition,
+    current_user: schemas.Principal = Security(
+        deps.get_current_active_principal,
+        scopes=[Role.ADMIN["name"], Role.SUPER_ADMIN["name"]],
+    ),
+) -> Any:
+    """
+    Move many shipments to one status at once, e.g. a pallet to VN_RECEIVED.
 
-    # shipments = crud.shipment.get_multi(db, skip=skip, limit=limit, filters=filters,
-    #                                           order_by=order_by, direction=direction)
+    Request Body Parameters
+    - **ids** (`list[integer]`, required): Up to 1000 shipment IDs.
+    - **shipment_status** (`integer`, required): The new status. VN_SHIPMENT_REQUESTED
+      needs a fulfillment and is only set through PUT /shipments/{shipment_id}.
 
-    return Response(message="", data=shipments)
+    Shipments whose current status doesn't lead to the new one, or not weighed
+    when leaving FOREIGN_SHIPPING, are returned in `rejected` with the reason.
+    """
+    result = transition_shipments_service(db=db, transition_in=transition_in, current_user=current_user)
+    return Response(message="", data=result)
 
 @router.put("/{shipment_id}", response_model=Response[schemas.Shipment])
 def update_shipment(
@@ -85,8 +136,8 @@ def update_shipment(
     db: Session = Depends(deps.get_db),
     shipment_id: int,
     shipment_in: schemas.ShipmentUpdate,
-    current_user: models.User = Security(
-        deps.get_current_active_user,
+    current_user: schemas.Principal = Security(
+        deps.get_current_active_principal,
         scopes=[Role.ADMIN["name"], Role.SUPER_ADMIN["name"]],
     ),
 ) -> Any:
@@ -3,7 +3,7 @@ from typing import Any, List, Optional
 from fastapi import APIRouter, Depends, Security, HTTPException, Query, Path
 from sqlalchemy.orm import Session
 
-from app import schemas, models, crud
+from app import schemas, crud
 from app.api import deps
 from app.constants.role import Role
 from app.schemas.base.response import Response
@@ -25,8 +25,8 @@ def read_stores(
             ge=1, le=1000
         ),
     type_store: Optional[int] = Query(None, description="Filter stores by their type."),
-    current_user: models.User = Security(
-        deps.get_current_active_user,
+    current_user: schemas.Principal = Security(
+        deps.get_current_active_principal,
         scopes=[Role.ADMIN["name"], Role.SUPER_ADMIN["name"], Role.USER["name"]],
     ),
 ) -> Any:
@@ -45,8 +45,8 @@ def create_store(
     *,
     db: Session = Depends(deps.get_db),
     store_in: schemas.StoreCreate,
-    current_user: models.User = Security(
-        deps.get_current_active_user,
+    current_user: schemas.Principal = Security(
+        deps.get_current_active_principal,
         scopes=[Role.SUPER_ADMIN["name"]],
     ),
 ) -> Any:
@@ -3,7 +3,7 @@ from typing import Any, List, Optional
 from fastapi import APIRouter, Depends, Security, HTTPException, Query, Path
 from sqlalchemy.orm import Session
 
-from app import schemas, models, crud
+from app import schemas, crud
 from app.api import deps
 from app.constants.role import Role
 from app.schemas.base.response import Response
@@ -19,8 +19,8 @@ def read_user_addresses(
     skip: int = Query(0, description="Number of records to skip (for pagination)"),
     limit: int = Query(100, description="Maximum number of records to return"),
     user_id: Optional[int] = Query(None, description="Filter addresses by user ID (optional)"),
-    current_user: models.User = Security(
-        deps.get_current_active_user,
+    current_user: schemas.Principal = Security(
+        deps.get_current_active_principal,
         scopes=[Role.ADMIN["name"], Role.SUPER_ADMIN["name"], Role.USER["name"]],
     ),
 ) -> Any:
@@ -42,8 +42,8 @@ def create_user_addresses(
     db: Session = Depends(deps.get_db),
     addresses_in: schemas.UserAddressCreate,
     user_id: Optional[int] = Query(None, description= "The ID of the user to retrieve"),
-    current_user: models.User = Security(
-        deps.get_current_active_user,
+    current_user: schemas.Principal = Security(
+        deps.get_current_active_principal,
         scopes=[Role.USER["name"], Role.ADMIN["name"], Role.SUPER_ADMIN["name"]],
     ),
 ) -> Any:
@@ -69,8 +69,8 @@ def update_user_address(
     user_address_id: int = Path (..., description= "The ID of the user address to retrieve"),
     address_in: schemas.UserAddressUpdate,
     user_id: Optional[int] = Query(None, description= "The ID of the user to retrieve"),
-    current_user: models.User = Security(
-        deps.get_current_active_user,
+    current_user: schemas.Principal = Security(
+        deps.get_current_active_principal,
         scopes=[Role.USER["name"], Role.ADMIN["name"], Role.SUPER_ADMIN["name"]],
     ),
 ) -> Any:
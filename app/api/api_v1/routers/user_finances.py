@@ -0,0 +1,39 @@
+from datetime import datetime
+from typing import Any, Optional
+
+from fastapi import APIRouter, Depends, Query, Security
+from sqlalchemy.orm import Session
+
+from app import schemas
+from app.api import deps
+from app.constants.role import Role
+from app.schemas.base.response import Response
+from app.services.user_finance_service import get_finance_statement_service
+
+router = APIRouter(prefix="/user-finances", tags=["user-finances"])
+
+
+@router.get("/statement", response_model=Response[schemas.FinanceStatement])
+def read_finance_statement(
+    db: Session = Depends(deps.get_read_db),
+    user_id: Optional[int] = Query(
+        None, description="User whose statement to read. Ignored for customers, who get their own"
+    ),
+    start: Optional[datetime] = Query(
+        None, description="Include transactions from this date and time (format: YYYY-MM-DDTHH:MM:SS)"
+    ),
+    end: Optional[datetime] = Query(
+        None, description="Include transactions before this date and time (format: YYYY-MM-DDTHH:MM:SS)"
+    ),
+    limit: int = Query(1000, description="Maximum number of transactions to return", ge=1, le=5000),
+    current_user: schemas.Principal = Security(
+        deps.get_current_active_principal,
+        scopes=[Role.ADMIN["name"], Role.SUPER_ADMIN["name"], Role.USER["name"]],
+    ),
+) -> Any:
+    """
+    Retrieve the balance statement of a user for a date range.
+    """
+    statement = get_finance_statement_service(db, user_id, start, end, limit, current_user)
+
+    return Response(message="", data=statement)
@@ -3,7 +3,7 @@ from typing import Any
 from fastapi import APIRouter, Depends, HTTPException, Security
 from sqlalchemy.orm import Session
 
-from app import crud, models, schemas
+from app import crud, schemas
 from app.api import deps
 from app.constants.role import Role
 from app.schemas.base.response import Response
@@ -17,7 +17,7 @@ def assign_user_role(
     *,
     db: Session = Depends(deps.get_db),
     user_role_in: schemas.UserRoleCreate,
-    current_user: models.User = Depends(deps.get_current_active_user),
+    current_user: schemas.Principal = Depends(deps.get_current_active_principal),
 ) -> Any:
     """
     Assign a role to a user after creation of a user
@@ -36,8 +36,8 @@ def update_user_role(
     db: Session = Depends(deps.get_db),
     user_id: int,
     user_role_in: schemas.UserRoleUpdate,
-    current_user: models.User = Security(
-        deps.get_current_active_user,
+    current_user: schemas.Principal = Security(
+        deps.get_current_active_principal,
         scopes=[
             Role.SUPER_ADMIN["name"]
         ],
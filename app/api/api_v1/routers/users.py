@@ -8,7 +8,7 @@ from app import crud, models, schemas
 from app.api import deps
 from app.constants.role import Role
 from app.core.config import settings
-from app.schemas.base.response import Response
+from app.schemas.base.response import Response, PaginatedResponse
 
 from sqlalchemy.orm import Session
 from typing import Any, List, Optional
@@ -16,7 +16,7 @@ from typing import Any, List, Optional
 router = APIRouter(prefix="/users", tags=["users"])
 
 
-@router.get("", response_model=Response[List[schemas.User]], summary="Read Users")
+@router.get("", response_model=PaginatedResponse[List[schemas.User]], summary="Read Users")
 def read_users(
     db: Session = Depends(deps.get_db),
     skip: int = Query(
@@ -29,6 +29,10 @@ def read_users(
         description="Maximum number of records to return",
         ge=1, le=1000
     ),
+    cursor: Optional[str] = Query(
+        None,
+        description="Opaque cursor from a previous page's next_cursor. Overrides skip"
+    ),
     id: Optional[int] = Query(
         None,
         description="Filter users by ID"
@@ -55,14 +59,14 @@ def read_users(
     ),
     order_by: str = Query(
         "id",
-        description="Field to order results by (e.g., 'id', 'email', 'created_at')"
+        description="Field to order results by: 'id', 'email', 'user_code', 'full_name', 'phone_number' or 'created_at'"
     ),
     direction: str = Query(
         "desc",
         description="Sort direction ('asc' for ascending, 'desc' for descending)"
     ),
-    current_user: models.User = Security(
-        deps.get_current_active_user,
+    current_user: schemas.Principal = Security(
+        deps.get_current_active_principal,
         scopes=[Role.ADMIN["name"], Role.SUPER_ADMIN["name"]],
     ),
 ) -> Any:
@@ -84,9 +88,10 @@ def read_users(
         filters["created_at_end"] = created_at_end
 
     users = crud.user.get_multi(db, skip=skip, limit=limit, filters=filters,
-                                order_by=order_by, direction=direction)
+                                order_by=order_by, direction=direction, cursor=cursor)
+    next_cursor = crud.user.next_cursor(users, limit=limit, order_by=order_by, direction=direction)
 
-    return Response(message="", data=users)
+    return PaginatedResponse(message="", data=users, next_cursor=next_cursor)
 
 
 @router.post("", response_model=Response[schemas.User])
@@ -245,8 +250,8 @@ def create_user_open(
 @router.get("/{user_id}", response_model=Response[schemas.User])
 def read_user_by_id(
     user_id: int = Path(..., description="The ID of the user to retrieve"),
-    current_user: models.User = Security(
-        deps.get_current_active_user,
+    current_user: schemas.Principal = Security(
+        deps.get_current_active_principal,
         scopes=[Role.ADMIN["name"], Role.SUPER_ADMIN["name"]],
     ),
     db: Session = Depends(deps.get_db),
@@ -265,8 +270,8 @@ def update_user(
     db: Session = Depends(deps.get_db),
     user_id: int = Path(..., description="The ID of the user to retrieve" ),
     user_in: schemas.UserUpdate,
-    current_user: models.User = Security(
-        deps.get_current_active_user,
+    current_user: schemas.Principal = Security(
+        deps.get_current_active_principal,
         scopes=[Role.ADMIN["name"], Role.SUPER_ADMIN["name"]],
     ),
 ) -> Any:
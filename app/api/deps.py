@@ -1,15 +1,17 @@
 import logging
-from typing import Generator
+from typing import AsyncGenerator, Generator, Optional
 
 from app import crud, models, schemas
 from app.constants.role import Role
 from app.core import security
 from app.core.config import settings
-from app.db.session import SessionLocal
-from fastapi import Depends, HTTPException, Security, status
+from app.db.routing import PRINCIPAL_ID_KEY, read_router, request_write_marker
+from app.db.session import AsyncReplicaSessionLocals, AsyncSessionLocal, ReplicaSessionLocals, SessionLocal
+from fastapi import Depends, HTTPException, Request, Security, status
 from fastapi.security import OAuth2PasswordBearer, SecurityScopes
 from jose import jwt
 from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 reusable_oauth2 = OAuth2PasswordBearer(
@@ -35,11 +37,49 @@ def get_db() -> Generator:
         db.close()
 
 
-def get_current_user(
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def _token_user_id(token: str) -> Optional[int]:
+    # Only picks the database; the endpoint's own security dependency authenticates
+    try:
+        return jwt.get_unverified_claims(token).get("id")
+    except jwt.JWTError:
+        return None
+
+
+def get_read_db(request: Request, token: str = Depends(reusable_oauth2)) -> Generator:
+    """
+    Session for read-only endpoints: a replica when configured, or the
+    primary while the caller is inside the read-your-writes window.
+    """
+    session_factory = read_router.choose(
+        _token_user_id(token), SessionLocal, ReplicaSessionLocals, request_write_marker(request)
+    )
+    try:
+        db = session_factory()
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(
+    request: Request, token: str = Depends(reusable_oauth2)
+) -> AsyncGenerator[AsyncSession, None]:
+    session_factory = read_router.choose(
+        _token_user_id(token), AsyncSessionLocal, AsyncReplicaSessionLocals, request_write_marker(request)
+    )
+    async with session_factory() as db:
+        yield db
+
+
+def get_current_principal(
     security_scopes: SecurityScopes,
     db: Session = Depends(get_db),
     token: str = Depends(reusable_oauth2),
-) -> models.User:
+) -> schemas.Principal:
     if security_scopes.scopes:
         authenticate_value = f'Bearer scope="{security_scopes.scope_str}"'
     else:
@@ -53,7 +93,7 @@ def get_current_user(
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
         )
-        if payload.get("id") is None:
+        if payload.get("id") is None or payload.get("typ") == security.REFRESH_TOKEN_TYPE:
             raise credentials_exception
         token_data = schemas.TokenPayload(**payload)
     except (jwt.JWTError, ValidationError):
@@ -62,8 +102,13 @@ def get_current_user(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    user = crud.user.get(db, id=token_data.id)
-    if not user:
+    # Served from the principal cache for repeated requests with the same token
+    principal = crud.user.get_principal(db, id=token_data.id, issued_at=token_data.iat)
+    if not principal or principal.token_version != token_data.ver:
+        raise credentials_exception
+    # Commits of this request's session put the caller into the read-your-writes window
+    db.info[PRINCIPAL_ID_KEY] = principal.id
+    if token_data.role and token_data.role not in crud.role.get_names(db):
         raise credentials_exception
     if security_scopes.scopes and not token_data.role:
         raise HTTPException(
@@ -80,6 +125,28 @@ def get_current_user(
             detail="Not enough permissions",
             headers={"WWW-Authenticate": authenticate_value},
         )
+    # The role claim is trusted: role changes bump the token version
+    return principal.model_copy(update={"role": token_data.role})
+
+
+def get_current_active_principal(
+    current_user: schemas.Principal = Security(get_current_principal, scopes=[],),
+) -> schemas.Principal:
+    if not current_user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return current_user
+
+
+def get_current_user(
+    db: Session = Depends(get_db),
+    principal: schemas.Principal = Security(get_current_principal, scopes=[],),
+) -> models.User:
+    """
+    The full user row, for endpoints that need more than the principal.
+    """
+    user = db.get(models.User, principal.id)
+    if not user:
+        raise HTTPException(status_code=401, detail="Could not validate credentials")
     return user
 
 
@@ -5,6 +5,9 @@ class ObjectType(Enum):
     SHIPMENT = 1
     EXCHANGE = 2
     DEPOSIT_BILL = 3
+    FULFILLMENT = 4
+    CONSIGNMENT = 5
+    USER_FINANCE = 6
 
 
 class ActionType(Enum):
@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class FinanceTransactionType(Enum):
+    DEPOSIT = 1
+    FULFILLMENT_CHARGE = 2
+    REFUND = 3
+    ADJUSTMENT = 4
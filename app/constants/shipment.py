@@ -11,4 +11,19 @@ class ShipmentStatus(Enum):
 
 class ShipmentFinanceStatus(Enum):
     NOT_APPROVED = 0
-    APPROVED = 1
\ No newline at end of file
+    APPROVED = 1
+
+# Status a shipment can move to from each status, in the normal flow
+SHIPMENT_STATUS_TRANSITIONS = {
+    ShipmentStatus.FOREIGN_SHIPPING: (ShipmentStatus.FOREIGN_STORE_RECEIVED,),
+    ShipmentStatus.FOREIGN_STORE_RECEIVED: (ShipmentStatus.VN_RECEIVED,),
+    ShipmentStatus.VN_RECEIVED: (ShipmentStatus.VN_SHIPMENT_REQUESTED,),
+    ShipmentStatus.VN_SHIPMENT_REQUESTED: (ShipmentStatus.VN_SHIPPED,),
+    ShipmentStatus.VN_SHIPPED: (),
+}
+
+# The same table inverted: target status -> statuses it can be reached from
+SHIPMENT_STATUS_SOURCES = {
+    target: tuple(source for source, targets in SHIPMENT_STATUS_TRANSITIONS.items() if target in targets)
+    for target in ShipmentStatus
+}
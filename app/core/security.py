@@ -1,13 +1,87 @@
+import asyncio
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta, UTC
-from typing import Any, Union
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar, Union
 
 from app.core.config import settings
 from jose import jwt
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes made with other rounds are flagged by verify_and_update and rehashed on login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+    bcrypt__min_desired_rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+    bcrypt__max_desired_rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+)
+
+T = TypeVar("T")
+
+
+class PasswordHashingBusy(Exception):
+    """
+    Raised when too many password hashes are already queued; answered with 429.
+    """
+
+
+class PasswordHashPool:
+    """
+    Dedicated, bounded thread pool for bcrypt.
+
+    bcrypt releases the GIL, so threads hash in parallel without occupying the
+    request threadpool. At most `max_pending` jobs are queued or running;
+    beyond that `PasswordHashingBusy` is raised instead of letting logins
+    pile up behind each other.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def submit(self, fn: Callable[..., T], *args: Any) -> "Future[T]":
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise PasswordHashingBusy()
+        with self._lock:
+            self._pending += 1
+        future = self._executor.submit(fn, *args)
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, _: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+            self._completed += 1
+        self._slots.release()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+
+password_hash_pool = PasswordHashPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
 
 ALGORITHM = "HS256"
+REFRESH_TOKEN_TYPE = "refresh"
 
 
 def create_access_token(
@@ -19,16 +93,42 @@ def create_access_token(
         expire = datetime.now(UTC) + timedelta(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
-    to_encode = {"exp": expire, **subject}
+    to_encode = {"exp": expire, "iat": datetime.now(UTC), **subject}
     encoded_jwt = jwt.encode(
         to_encode, settings.SECRET_KEY, algorithm=ALGORITHM
     )
     return encoded_jwt
 
 
+def create_refresh_token(
+    subject: Union[str, Any], expires_delta: timedelta = None
+) -> str:
+    """
+    Long-lived, single-use token exchanged at /auth/refresh-token for a new
+    access/refresh pair. It is identified by its `jti` so reuse can be detected.
+    """
+    if not expires_delta:
+        expires_delta = timedelta(minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES)
+    return create_access_token(
+        {**subject, "typ": REFRESH_TOKEN_TYPE, "jti": uuid.uuid4().hex},
+        expires_delta=expires_delta,
+    )
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_hash_pool.submit(pwd_context.verify, plain_password, hashed_password).result()
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return password_hash_pool.submit(pwd_context.hash, password).result()
+
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password without blocking the event loop or a request thread.
+
+    :return: whether the password matches, and a new hash when the stored one
+        was made with outdated CryptContext settings
+    """
+    future = password_hash_pool.submit(pwd_context.verify_and_update, plain_password, hashed_password)
+    return await asyncio.wrap_future(future)
@@ -0,0 +1,155 @@
+import os
+import shutil
+import tempfile
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import BinaryIO, Optional
+
+from app.core.config import settings
+
+
+class StorageBackend(ABC):
+    """
+    Blob storage for uploaded files, addressed by key.
+
+    Keys are relative, "/"-separated paths such as
+    "consignments/ab/cd/abcd....jpg". Callers derive them from the content
+    hash, so a key always refers to the same bytes and writes are idempotent.
+    """
+
+    @abstractmethod
+    def save(self, key: str, file: BinaryIO, content_type: Optional[str] = None) -> None:
+        ...
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    def url(self, key: str) -> str:
+        ...
+
+
+class LocalStorage(StorageBackend):
+    """
+    Files on the local disk under `root`, served by a StaticFiles mount at `base_url`.
+    """
+
+    def __init__(self, root: str, base_url: str):
+        self.root = root
+        self.base_url = base_url.rstrip("/")
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.root, *key.split("/"))
+
+    def save(self, key: str, file: BinaryIO, content_type: Optional[str] = None) -> None:
+        path = self.path(key)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        # Write next to the target and rename, so readers never see a partial file
+        with tempfile.NamedTemporaryFile(dir=directory, suffix=".part", delete=False) as tmp:
+            try:
+                shutil.copyfileobj(file, tmp)
+            except BaseException:
+                tmp.close()
+                os.remove(tmp.name)
+                raise
+        os.chmod(tmp.name, 0o644)
+        os.replace(tmp.name, path)
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self.path(key))
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self.path(key))
+        except FileNotFoundError:
+            pass
+
+    def url(self, key: str) -> str:
+        return f"{self.base_url}/{key}"
+
+
+class S3Storage(StorageBackend):
+    """
+    Objects in an S3-compatible bucket (AWS S3, MinIO, ...).
+
+    URLs are built from `public_url` when the bucket is exposed through a
+    CDN or public endpoint, and presigned otherwise.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        *,
+        endpoint_url: Optional[str] = None,
+        region: Optional[str] = None,
+        access_key_id: Optional[str] = None,
+        secret_access_key: Optional[str] = None,
+        public_url: Optional[str] = None,
+        presigned_url_expire_seconds: int = 3600,
+    ):
+        import boto3
+        from botocore.exceptions import ClientError
+
+        self.bucket = bucket
+        self.public_url = public_url.rstrip("/") if public_url else None
+        self.presigned_url_expire_seconds = presigned_url_expire_seconds
+        self._client_error = ClientError
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            region_name=region,
+            aws_access_key_id=access_key_id,
+            aws_secret_access_key=secret_access_key,
+        )
+
+    def save(self, key: str, file: BinaryIO, content_type: Optional[str] = None) -> None:
+        # Content-addressed objects never change, so they can be cached forever
+        extra_args = {"CacheControl": "public, max-age=31536000, immutable"}
+        if content_type:
+            extra_args["ContentType"] = content_type
+        self.client.upload_fileobj(file, self.bucket, key, ExtraArgs=extra_args)
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+        except self._client_error as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+        return True
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+    def url(self, key: str) -> str:
+        if self.public_url:
+            return f"{self.public_url}/{key}"
+        return self.client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": key},
+            ExpiresIn=self.presigned_url_expire_seconds,
+        )
+
+
+@lru_cache()
+def get_storage() -> StorageBackend:
+    if settings.STORAGE_BACKEND == "s3":
+        return S3Storage(
+            settings.S3_BUCKET,
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            region=settings.S3_REGION,
+            access_key_id=settings.S3_ACCESS_KEY_ID,
+            secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+            public_url=settings.S3_PUBLIC_URL,
+            presigned_url_expire_seconds=settings.S3_PRESIGNED_URL_EXPIRE_SECONDS,
+        )
+    if settings.STORAGE_BACKEND == "local":
+        return LocalStorage(settings.STORAGE_LOCAL_DIR, settings.STORAGE_LOCAL_URL)
+    raise ValueError(f"Unknown storage backend: {settings.STORAGE_BACKEND}")
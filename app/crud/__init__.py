@@ -12,3 +12,5 @@ from .crud_fulfillment import fulfillment
 from .crud_change_log import change_log
 from .crud_user_address import user_address
 from .crud_user_finance import user_finance
+from .crud_used_refresh_token import used_refresh_token
+from .crud_finance_transaction import finance_transaction
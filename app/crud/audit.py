@@ -0,0 +1,77 @@
+from typing import Any, Dict, List, Optional, Union
+
+from pydantic import BaseModel
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+
+from app.constants.change_log import ActionType, ObjectType
+from app.crud.crud_change_log import change_log
+
+
+class AuditedCRUDMixin:
+    """
+    Logs every update of the model to change_logs, as one entry with the
+    old and new value of each column that changed.
+
+    The diff is read from the attribute history SQLAlchemy keeps for the
+    pending flush, so only the columns that were actually set are compared,
+    with the column type's own equality. The entry is recorded in the same
+    transaction as the update.
+
+    Put it before CRUDBase in the bases and set `audit_object_type`:
+
+        class CRUDShipment(AuditedCRUDMixin, CRUDBase[Shipment, ShipmentCreate, ShipmentUpdate]):
+            audit_object_type = ObjectType.SHIPMENT
+    """
+    audit_object_type: ObjectType
+
+    def update(
+        self,
+        db: Session,
+        *,
+        db_obj: Any,
+        obj_in: Union[BaseModel, Dict[str, Any]],
+        commit: bool = True,
+        current_user_id: Optional[int] = None,
+        **kwargs: Any
+    ) -> Any:
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.model_dump(exclude_unset=True)
+
+        # The history has no old value for expired attributes: load them first, in one SELECT
+        if inspect(db_obj).expired_attributes & update_data.keys():
+            db.refresh(db_obj)
+
+        self.apply_update(db_obj, update_data)
+
+        changes = self.diff(db_obj)
+        if changes:
+            if current_user_id is None:
+                raise ValueError("current_user_id is required for update operation")
+            change_log.record(
+                db,
+                user_id=current_user_id,
+                object_type=self.audit_object_type,
+                object_id=db_obj.id,
+                action=ActionType.UPDATE,
+                changes=changes
+            )
+
+        return self.save(db, db_obj=db_obj, commit=commit)
+
+    @staticmethod
+    def diff(db_obj: Any) -> List[Dict[str, Any]]:
+        """The column changes of `db_obj` not flushed yet."""
+        state = inspect(db_obj)
+        changes = []
+        for key in state.mapper.column_attrs.keys():
+            history = state.attrs[key].history
+            if history.has_changes():
+                changes.append({
+                    "field": key,
+                    "old": history.deleted[0] if history.deleted else None,
+                    "new": history.added[0] if history.added else None,
+                })
+        return changes
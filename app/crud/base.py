@@ -1,19 +1,49 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+import operator
+from datetime import datetime
+from typing import Any, Dict, FrozenSet, Generic, List, Optional, Tuple, Type, TypeVar, Union
 
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from sqlalchemy import desc, asc
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, bindparam, insert, inspect, or_, tuple_
+from sqlalchemy.orm import Query, Session
 
+from app.constants.general import CompareOperator
+from app.crud.base_async import AsyncCRUDBase
 from app.db.base import Base
+from app.utils.pagination import InvalidPageRequest, decode_cursor, encode_cursor
 
 # Define custom types for SQLAlchemy model, and Pydantic schemas
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+# A filter key resolves to a model column and the operator applied to it
+FilterSpec = Tuple[str, CompareOperator]
+
+_COMPARATORS = {
+    CompareOperator.EQUAL: operator.eq,
+    CompareOperator.NOT_EQUAL: operator.ne,
+    CompareOperator.GREATER_THAN: operator.gt,
+    CompareOperator.GREATER_THAN_OR_EQUAL: operator.ge,
+    CompareOperator.LESS_THAN: operator.lt,
+    CompareOperator.LESS_THAN_OR_EQUAL: operator.le,
+}
+
+
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
 
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    # Filter keys that are not a plain equality on the column of the same
+    # name, e.g. {"created_at_start": ("created_at", CompareOperator.GREATER_THAN_OR_EQUAL)}
+    filter_fields: Dict[str, FilterSpec] = {}
+    # Columns accepted as order_by. Keep them backed by an index.
+    sortable_fields: Tuple[str, ...] = ("id",)
+    # Named sets of loader options, picked by callers to eagerly load the
+    # relationships their response schema serializes
+    loader_profiles: Dict[str, Tuple[Any, ...]] = {}
+
     def __init__(self, model: Type[ModelType]):
         """Base class that can be extend by other action classes.
            Provides basic CRUD and listing operations.
@@ -22,38 +52,264 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         :type model: Type[ModelType]
         """
         self.model = model
+        self._column_keys: FrozenSet[str] = frozenset(inspect(model).column_attrs.keys())
+        self._compiled_filters: Dict[FrozenSet[str], Any] = {}
+        # Same reads over an AsyncSession: `await crud.x.aio.get_multi(async_db, ...)`
+        self.aio: AsyncCRUDBase[ModelType] = AsyncCRUDBase(self)
 
     def get_multi(
         self, db: Session, *, skip: int = 0, limit: int = 100, filters: Dict[str, Any] = None,
-                                              order_by = "id", direction = "desc"
+                                              order_by = "id", direction = "desc", cursor: Optional[str] = None,
+        profile: Optional[str] = None
     ) -> List[ModelType]:
-        query = db.query(self.model)
-        if filters:
-            for key, value in filters.items():
-                if hasattr(self.model, key):  # Ensure the key exists in the model
-                    query = query.filter(getattr(self.model, key) == value)
-                else:
-                    raise ValueError(f"Invalid filter key: {key}")
-
-        try:
-            if direction.lower() == "desc":
-                query = query.order_by(desc(order_by))
-            else:
-                query = query.order_by(asc(order_by))
-        except Exception as e:
-            raise ValueError(f"Invalid order_by format: {order_by}") from e
-
-        return query.offset(skip).limit(limit).all()
+        query = self.apply_filters(self._base_query(db, profile), filters)
+
+        return self.paginate(query, skip=skip, limit=limit, order_by=order_by,
+                             direction=direction, cursor=cursor)
+
+    def apply_filters(self, query: Query, filters: Optional[Dict[str, Any]]) -> Query:
+        """Filter a query by the given filter values.
+
+        Each key is resolved through `filter_fields` (equality on the column
+        of the same name otherwise). The resulting SQL expression only
+        depends on the set of keys, so it is compiled once per shape and
+        reused with fresh bound values. Keys whose value is None are ignored.
+
+        :raises ValueError: if a key matches neither `filter_fields` nor a column
+        """
+        active = {key: value for key, value in (filters or {}).items() if value is not None}
+        if not active:
+            return query
+
+        shape = frozenset(active)
+        clause = self._compiled_filters.get(shape)
+        if clause is None:
+            clause = and_(*(self._compile_filter(key) for key in sorted(shape)))
+            self._compiled_filters[shape] = clause
+
+        params: Dict[str, Any] = {}
+        for key, value in active.items():
+            params.update(self._filter_params(key, value))
+        return query.filter(clause).params(**params)
+
+    def paginate(
+        self, query: Query, *, skip: int = 0, limit: int = 100, order_by: str = "id",
+        direction: str = "desc", cursor: Optional[str] = None
+    ) -> List[ModelType]:
+        """Order and slice a query, by keyset when a cursor is given.
+
+        With a cursor the page starts right after the `(order_by, id)` pair
+        it encodes and `skip` is ignored, so every page costs the same as
+        the first one. Without a cursor the legacy offset paging is used.
+
+        :param cursor: Opaque cursor returned by `next_cursor`
+        :type cursor: Optional[str]
+        """
+        return self.order_page(query, skip=skip, limit=limit, order_by=order_by,
+                               direction=direction, cursor=cursor).all()
+
+    def order_page(
+        self, query, *, skip: int = 0, limit: int = 100, order_by: str = "id",
+        direction: str = "desc", cursor: Optional[str] = None
+    ):
+        """Apply the ordering and slicing of `paginate` without executing.
+
+        Works on both a `Query` and a 2.0 `select()`, which is how the async
+        CRUD variant shares it.
+        """
+        column = self._get_order_column(order_by)
+        if direction.lower() not in ("asc", "desc"):
+            raise InvalidPageRequest(f"Invalid direction: {direction}")
+        descending = direction.lower() == "desc"
+
+        if cursor:
+            state = decode_cursor(cursor)
+            if state.get("order_by") != order_by or state.get("direction") != direction.lower():
+                raise InvalidPageRequest("Cursor does not match the requested order_by/direction")
+            query = query.filter(self._cursor_clause(column, state, descending))
+            skip = 0
+
+        # NULLs sort last ascending and first descending, as PostgreSQL does by default;
+        # _cursor_clause relies on it
+        ordering = [column.desc().nulls_first() if descending else column.asc().nulls_last()]
+        if column is not self.model.id:
+            ordering.append(self.model.id.desc() if descending else self.model.id.asc())
+
+        return query.order_by(*ordering).offset(skip).limit(limit)
+
+    def next_cursor(
+        self, items: List[ModelType], *, limit: int, order_by: str = "id", direction: str = "desc"
+    ) -> Optional[str]:
+        """Build the cursor pointing after the last item of a full page.
+
+        :return: The cursor for the next page, or None when this page is the last one
+        :rtype: Optional[str]
+        """
+        if not items or len(items) < limit:
+            return None
+        last = items[-1]
+        return encode_cursor({
+            "order_by": order_by,
+            "direction": direction.lower(),
+            "value": getattr(last, order_by),
+            "id": last.id,
+        })
+
+    def loader_options(self, profile: Optional[str] = None) -> Tuple[Any, ...]:
+        """Loader options of a named profile, none for profile=None.
+
+        :raises ValueError: if the profile is not declared in `loader_profiles`
+        """
+        if profile is None:
+            return ()
+        if profile not in self.loader_profiles:
+            raise ValueError(f"Invalid loader profile: {profile}")
+        return self.loader_profiles[profile]
+
+    def _base_query(self, db: Session, profile: Optional[str] = None) -> Query:
+        return db.query(self.model).options(*self.loader_options(profile))
+
+    def _get_order_column(self, order_by: str):
+        if order_by not in self.sortable_fields:
+            raise InvalidPageRequest(f"Invalid order_by format: {order_by}")
+        return getattr(self.model, order_by)
+
+    def _filter_spec(self, key: str) -> FilterSpec:
+        column_name, compare = self.filter_fields.get(key, (key, CompareOperator.EQUAL))
+        if column_name not in self.model.__table__.columns.keys():
+            raise ValueError(f"Invalid filter key: {key}")
+        return column_name, compare
+
+    def _compile_filter(self, key: str):
+        column_name, compare = self._filter_spec(key)
+        column = getattr(self.model, column_name)
+        param = f"filter_{key}"
+
+        if compare is CompareOperator.BETWEEN:
+            return column.between(bindparam(f"{param}_start"), bindparam(f"{param}_end"))
+        if compare is CompareOperator.IN:
+            return column.in_(bindparam(param, expanding=True))
+        if compare is CompareOperator.NOT_IN:
+            return column.not_in(bindparam(param, expanding=True))
+        if compare is CompareOperator.LIKE:
+            return column.like(bindparam(param))
+        if compare is CompareOperator.NOT_LIKE:
+            return column.not_like(bindparam(param))
+        return _COMPARATORS[compare](column, bindparam(param))
+
+    def _filter_params(self, key: str, value: Any) -> Dict[str, Any]:
+        _, compare = self._filter_spec(key)
+        param = f"filter_{key}"
+
+        if compare is CompareOperator.BETWEEN:
+            start, end = value
+            return {f"{param}_start": start, f"{param}_end": end}
+        if compare in (CompareOperator.IN, CompareOperator.NOT_IN):
+            return {param: list(value)}
+        return {param: value}
+
+    def _cursor_clause(self, column, state: Dict[str, Any], descending: bool):
+        last_id = state["id"]
+        if not _is_int(last_id):
+            raise InvalidPageRequest("Invalid cursor: id must be an integer")
+        if column is self.model.id:
+            return column < last_id if descending else column > last_id
+
+        value = self._cursor_value(column, state.get("value"))
+
+        if not self.model.__table__.c[column.key].nullable:
+            key = tuple_(column, self.model.id)
+            return key < tuple_(value, last_id) if descending else key > tuple_(value, last_id)
+
+        # NULL never compares in a row comparison: spell the order out
+        after_id = self.model.id < last_id if descending else self.model.id > last_id
+        if value is None:
+            # Descending, the non-NULL values still follow; ascending, only NULLs remain
+            same = and_(column.is_(None), after_id)
+            return or_(same, column.is_not(None)) if descending else same
+        after_value = column < value if descending else column > value
+        after = or_(after_value, and_(column == value, after_id))
+        return after if descending else or_(after, column.is_(None))
+
+    def _cursor_value(self, column, value: Any) -> Any:
+        # The cursor comes back from the client: a value of the wrong type would
+        # only fail in the database
+        python_type = column.type.python_type
+        if value is None:
+            valid = self.model.__table__.c[column.key].nullable
+        elif python_type is datetime:
+            try:
+                return datetime.fromisoformat(value)
+            except (TypeError, ValueError):
+                valid = False
+        elif python_type is int:
+            valid = _is_int(value)
+        else:
+            valid = isinstance(value, python_type)
+        if not valid:
+            raise InvalidPageRequest(f"Invalid cursor: bad value for {column.key}")
+        return value
 
     def get(self, db: Session, id: int) -> Optional[ModelType]:
         return db.query(self.model).filter(self.model.id == id).first()
 
-    def create(self, db: Session, *, obj_in: CreateSchemaType, **kwargs) -> ModelType:
+    def get_for_update(self, db: Session, id: int) -> Optional[ModelType]:
+        """Fetch an object and lock its row until the transaction ends."""
+        return db.query(self.model).filter(self.model.id == id).with_for_update().first()
+
+    def get_by_ids(self, db: Session, *, ids: List[int]) -> Dict[int, ModelType]:
+        """Fetch many objects with a single IN query, keyed by id."""
+        if not ids:
+            return {}
+        objs = db.query(self.model).filter(self.model.id.in_(set(ids))).all()
+        return {obj.id: obj for obj in objs}
+
+    def create(self, db: Session, *, obj_in: CreateSchemaType, commit: bool = True, **kwargs) -> ModelType:
         obj_in_data = jsonable_encoder(obj_in)
         db_obj = self.model(**obj_in_data)  # type: ignore
+        return self.save(db, db_obj=db_obj, commit=commit)
+
+    def create_multi(
+        self, db: Session, *, objs_in: List[Union[CreateSchemaType, Dict[str, Any]]], commit: bool = True
+    ) -> List[ModelType]:
+        """Insert many rows with a single multi-row INSERT ... RETURNING.
+
+        Keys that are not columns of the model are dropped.
+
+        :param commit: False to leave the rows in the caller's transaction
+        :type commit: bool
+        """
+        if not objs_in:
+            return []
+        columns = self.model.__table__.columns.keys()
+        rows = [
+            {
+                key: value
+                for key, value in (obj_in if isinstance(obj_in, dict) else obj_in.model_dump()).items()
+                if key in columns
+            }
+            for obj_in in objs_in
+        ]
+        db_objs = db.scalars(
+            insert(self.model).returning(self.model, sort_by_parameter_order=True), rows
+        ).all()
+        if commit:
+            db.commit()
+        return db_objs
+
+    def save(self, db: Session, *, db_obj: ModelType, commit: bool = True) -> ModelType:
+        """Persist a new or modified object.
+
+        With commit=False the object is only flushed, so it gets its primary
+        key but stays in the caller's transaction (unit-of-work mode) and is
+        not refreshed.
+        """
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        if commit:
+            db.commit()
+            db.refresh(db_obj)
+        else:
+            db.flush()
         return db_obj
 
     def update(
@@ -62,20 +318,20 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         *,
         db_obj: ModelType,
         obj_in: Union[UpdateSchemaType, Dict[str, Any]],
+        commit: bool = True,
         **kwargs: Any
     ) -> ModelType:
-        obj_data = jsonable_encoder(db_obj)
         if isinstance(obj_in, dict):
             update_data = obj_in
         else:
             update_data = obj_in.model_dump(exclude_unset=True)
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-        return db_obj
+        self.apply_update(db_obj, update_data)
+        return self.save(db, db_obj=db_obj, commit=commit)
+
+    def apply_update(self, db_obj: ModelType, update_data: Dict[str, Any]) -> None:
+        """Set the columns of `db_obj` present in `update_data`; other keys are ignored."""
+        for field in self._column_keys & update_data.keys():
+            setattr(db_obj, field, update_data[field])
 
     def remove(self, db: Session, *, id: int) -> ModelType:
         obj = db.query(self.model).get(id)
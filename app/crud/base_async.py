@@ -0,0 +1,49 @@
+from typing import Any, Dict, Generic, List, Optional, TYPE_CHECKING, TypeVar
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+if TYPE_CHECKING:
+    from app.crud.base import CRUDBase
+
+ModelType = TypeVar("ModelType")
+
+
+class AsyncCRUDBase(Generic[ModelType]):
+    """Async read path of a CRUD object, for `AsyncSession`.
+
+    Filters, sortable fields and loader profiles are the ones declared on the
+    wrapped `CRUDBase`, so both variants accept exactly the same arguments.
+    Relationships are never lazy loaded under asyncio: pick a `profile` that
+    covers everything the response schema serializes.
+    """
+
+    def __init__(self, crud: "CRUDBase"):
+        self.crud = crud
+        self.model = crud.model
+
+    async def get(self, db: AsyncSession, id: int, *, profile: Optional[str] = None) -> Optional[ModelType]:
+        statement = select(self.model).options(*self.crud.loader_options(profile)).where(self.model.id == id)
+        return (await db.scalars(statement)).first()
+
+    async def get_by_ids(self, db: AsyncSession, *, ids: List[int]) -> Dict[int, ModelType]:
+        if not ids:
+            return {}
+        objs = await db.scalars(select(self.model).where(self.model.id.in_(set(ids))))
+        return {obj.id: obj for obj in objs}
+
+    async def get_multi(
+        self, db: AsyncSession, *, skip: int = 0, limit: int = 100, filters: Dict[str, Any] = None,
+        order_by: str = "id", direction: str = "desc", cursor: Optional[str] = None,
+        profile: Optional[str] = None
+    ) -> List[ModelType]:
+        statement = select(self.model).options(*self.crud.loader_options(profile))
+        statement = self.crud.apply_filters(statement, filters)
+        statement = self.crud.order_page(statement, skip=skip, limit=limit, order_by=order_by,
+                                         direction=direction, cursor=cursor)
+        return (await db.scalars(statement)).unique().all()
+
+    def next_cursor(
+        self, items: List[ModelType], *, limit: int, order_by: str = "id", direction: str = "desc"
+    ) -> Optional[str]:
+        return self.crud.next_cursor(items, limit=limit, order_by=order_by, direction=direction)
@@ -1,26 +1,88 @@
-from typing import Dict, Any, Union
+from typing import Any, Dict, List
 
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
+from app.constants.change_log import ActionType, ObjectType
+from app.core.config import settings
 from app.crud.base import CRUDBase
+from app.db.change_log_writer import PENDING_CHANGE_LOGS_KEY
 from app.models.change_log import ChangeLog
 from app.schemas.change_log import ChangeLogCreate
 
 
 class CRUDChangeLog(CRUDBase[ChangeLog, ChangeLogCreate, None]):
     def create(self, db: Session, *, obj_in: ChangeLogCreate, **kwargs) -> ChangeLog:
-        db_obj = ChangeLog(
-            user_id=obj_in.user_id,
-            object_type=obj_in.object_type,
-            object_id=obj_in.object_id,
-            action=obj_in.action,
-            changes=obj_in.changes,
-            created_at=obj_in.created_at,
-        )
+        # Without created_at the database default applies
+        db_obj = ChangeLog(**obj_in.model_dump(exclude_none=True))
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
         return db_obj
 
+    def record(
+        self,
+        db: Session,
+        *,
+        user_id: int,
+        object_type: ObjectType,
+        object_id: int,
+        action: ActionType,
+        changes: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Log a change made in the current transaction of `db`. Does not commit:
+        the entry is written only if the caller's transaction commits.
 
-change_log = CRUDChangeLog(ChangeLog)
\ No newline at end of file
+        With CHANGE_LOG_WRITE_MODE "transaction" the row is inserted by that
+        commit; with "async" it is handed to the background change log writer
+        once the commit succeeds.
+        """
+        row = self._row(user_id, object_type, object_id, action, changes)
+        if settings.CHANGE_LOG_WRITE_MODE == "async":
+            db.info.setdefault(PENDING_CHANGE_LOGS_KEY, []).append(row)
+        else:
+            db.add(ChangeLog(**row))
+
+    def record_multi(
+        self,
+        db: Session,
+        *,
+        user_id: int,
+        object_type: ObjectType,
+        action: ActionType,
+        changes_by_object_id: Dict[int, List[Dict[str, Any]]]
+    ) -> None:
+        """
+        Like `record`, for many objects at once: in "transaction" mode the
+        entries are written with a single multi-row INSERT.
+        """
+        rows = [
+            self._row(user_id, object_type, object_id, action, changes)
+            for object_id, changes in changes_by_object_id.items()
+        ]
+        if not rows:
+            return
+        if settings.CHANGE_LOG_WRITE_MODE == "async":
+            db.info.setdefault(PENDING_CHANGE_LOGS_KEY, []).extend(rows)
+        else:
+            db.execute(insert(ChangeLog.__table__), rows)
+
+    @staticmethod
+    def _row(
+        user_id: int,
+        object_type: ObjectType,
+        object_id: int,
+        action: ActionType,
+        changes: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        return {
+            "user_id": user_id,
+            "object_type": object_type.value,
+            "object_id": object_id,
+            "action": action.value,
+            "changes": jsonable_encoder(changes),
+        }
+
+change_log = CRUDChangeLog(ChangeLog)
@@ -1,18 +1,37 @@
-from datetime import datetime, UTC
-from typing import Union, Dict, Any, List
+from typing import Union, Dict, Any, List, Optional, Tuple
 
-from sqlalchemy import desc, asc
-from sqlalchemy.orm import Session
+from sqlalchemy import String, any_, bindparam, func, insert, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session, selectinload
 
 from app import crud
+from app.constants.change_log import ObjectType
+from app.constants.general import CompareOperator
+from app.crud.audit import AuditedCRUDMixin
 from app.crud.base import CRUDBase
-from app.models import Consignment
+from app.models import Consignment, Store
+from app.models.consignment import consignment_code_seq
 from app.models.consignment_foreign_shipment_code import ConsignmentForeignShipmentCode
 from app.schemas.consignment import ConsignmentUpdate, ConsignmentCreate
 
 
-class CRUDConsignment(CRUDBase[Consignment, ConsignmentCreate, ConsignmentUpdate]):
-    def create(self, db: Session, *, obj_in: ConsignmentCreate, **kwargs) -> Consignment:
+class CRUDConsignment(AuditedCRUDMixin, CRUDBase[Consignment, ConsignmentCreate, ConsignmentUpdate]):
+    audit_object_type = ObjectType.CONSIGNMENT
+
+    filter_fields = {
+        "created_at_start": ("created_at", CompareOperator.GREATER_THAN_OR_EQUAL),
+        "created_at_end": ("created_at", CompareOperator.LESS_THAN_OR_EQUAL),
+        "codes": ("code", CompareOperator.IN),
+    }
+    sortable_fields = ("id", "code", "created_at", "source_store_id", "dest_store_id")
+    loader_profiles = {
+        # schemas.Consignment -> foreign_shipment_codes
+        "with_foreign_codes": (
+            selectinload(Consignment.foreign_shipment_codes),
+        ),
+    }
+
+    def create(self, db: Session, *, obj_in: ConsignmentCreate, commit: bool = True, **kwargs) -> Consignment:
         source_store = crud.store.get(db, id=obj_in.source_store_id)
         if not source_store:
             raise ValueError(f"Store with id {obj_in.source_store_id} does not exist.")
@@ -21,7 +40,7 @@ class CRUDConsignment(CRUDBase[Consignment, ConsignmentCreate, ConsignmentUpdate
         if not dest_store:
             raise ValueError(f"Store with id {obj_in.dest_store} does not exist.")
 
-        code = f"{source_store.code}-{dest_store.code}-{obj_in.user_id}{round(datetime.now(UTC).timestamp() * 1000)}"
+        code = self.generate_code(source_store, dest_store, obj_in.user_id, self.next_code_numbers(db)[0])
 
         user_address = crud.user_address.get(db, id=obj_in.user_address_id)
         if not user_address:
@@ -44,7 +63,6 @@ class CRUDConsignment(CRUDBase[Consignment, ConsignmentCreate, ConsignmentUpdate
             height_packaged=obj_in.height_packaged,
             wide_packaged=obj_in.wide_packaged,
             length_packaged=obj_in.length_packaged,
-            image_path=obj_in.image_path,
             product_category_id=obj_in.product_category_id,
             product_name=obj_in.product_name,
             number_of_packages=obj_in.number_of_packages,
@@ -53,20 +71,91 @@ class CRUDConsignment(CRUDBase[Consignment, ConsignmentCreate, ConsignmentUpdate
             note=obj_in.note
         )
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        db.flush()
 
         if obj_in.foreign_shipment_codes:
-            for code in obj_in.foreign_shipment_codes:
-                db_obj_foreign_code = ConsignmentForeignShipmentCode(
-                    consignment_id=db_obj.id,
-                    foreign_shipment_code=code
-                )
-                db.add(db_obj_foreign_code)
-        db.commit()
+            self.add_foreign_shipment_codes(db, codes_by_consignment={db_obj.id: obj_in.foreign_shipment_codes})
 
+        if commit:
+            db.commit()
+            db.refresh(db_obj)
         return db_obj
 
+    def next_code_numbers(self, db: Session, *, count: int = 1) -> List[int]:
+        """Reserve `count` numbers for consignment codes with a single query."""
+        return db.execute(
+            select(consignment_code_seq.next_value()).select_from(func.generate_series(1, count))
+        ).scalars().all()
+
+    def generate_code(self, source_store: Store, dest_store: Store, user_id: int, number: int) -> str:
+        """
+        Build a consignment code from the store pair, the owner and a number
+        reserved with `next_code_numbers`.
+        """
+        return f"{source_store.code}-{dest_store.code}-{user_id}-{number}"
+
+    def add_foreign_shipment_codes(self, db: Session, *, codes_by_consignment: Dict[int, List[str]]) -> None:
+        """
+        Insert the foreign shipment codes of one or more consignments with a
+        single multi-row insert. Does not commit.
+        """
+        rows = [
+            {"consignment_id": consignment_id, "foreign_shipment_code": code}
+            for consignment_id, codes in codes_by_consignment.items()
+            for code in codes
+        ]
+        if rows:
+            db.execute(insert(ConsignmentForeignShipmentCode), rows)
+
+    def get_taken_foreign_shipment_codes(
+        self, db: Session, *, codes: List[str], exclude_consignment_id: Optional[int] = None
+    ) -> List[str]:
+        """
+        Return which of `codes` already belong to a consignment (other than
+        `exclude_consignment_id`), compared case-insensitively.
+        """
+        if not codes:
+            return []
+        query = db.query(ConsignmentForeignShipmentCode.foreign_shipment_code).filter(
+            func.upper(ConsignmentForeignShipmentCode.foreign_shipment_code) == any_(
+                bindparam("codes", [code.upper() for code in codes], type_=ARRAY(String))
+            )
+        )
+        if exclude_consignment_id is not None:
+            query = query.filter(ConsignmentForeignShipmentCode.consignment_id != exclude_consignment_id)
+        return [code for code, in query.all()]
+
+    def sync_foreign_shipment_codes(
+        self, db: Session, *, consignment_id: int, codes: List[str]
+    ) -> Tuple[List[str], List[str], List[str]]:
+        """
+        Make `codes` the foreign shipment codes of the consignment, touching
+        only the codes that changed: one DELETE for the removed codes and one
+        multi-row INSERT for the new ones. Codes are compared
+        case-insensitively. Does not commit.
+
+        :return: The added, removed and retained codes, as stored
+        """
+        existing = {
+            code.upper(): code
+            for code, in db.query(ConsignmentForeignShipmentCode.foreign_shipment_code).filter(
+                ConsignmentForeignShipmentCode.consignment_id == consignment_id
+            )
+        }
+        wanted = {code.upper(): code for code in codes}
+
+        added = [code for key, code in wanted.items() if key not in existing]
+        removed = [code for key, code in existing.items() if key not in wanted]
+        retained = [code for key, code in existing.items() if key in wanted]
+
+        if removed:
+            db.query(ConsignmentForeignShipmentCode).filter(
+                ConsignmentForeignShipmentCode.consignment_id == consignment_id,
+                ConsignmentForeignShipmentCode.foreign_shipment_code.in_(removed),
+            ).delete(synchronize_session=False)
+        self.add_foreign_shipment_codes(db, codes_by_consignment={consignment_id: added})
+        return added, removed, retained
+
     def update(
         self,
         db: Session,
@@ -93,64 +182,21 @@ class CRUDConsignment(CRUDBase[Consignment, ConsignmentCreate, ConsignmentUpdate
         update_data["shipping_phone_number"] = user_address.phone_number
         update_data["shipping_address"] = user_address.address
 
-        updated_data = super().update(db, db_obj=db_obj, obj_in=update_data)
-
-        consignment_foreign_codes = db.query(ConsignmentForeignShipmentCode).filter(
-            ConsignmentForeignShipmentCode.consignment_id == db_obj.id
-        ).all()
-        if consignment_foreign_codes:
-            for code in consignment_foreign_codes:
-                db.delete(code)
-            db.commit()
-
-        if obj_in.foreign_shipment_codes:
-            for code in obj_in.foreign_shipment_codes:
-                db_obj_foreign_code = ConsignmentForeignShipmentCode(
-                    consignment_id=db_obj.id,
-                    foreign_shipment_code=code
-                )
-                db.add(db_obj_foreign_code)
-            db.commit()
+        updated_data = super().update(db, db_obj=db_obj, obj_in=update_data, **kwargs)
 
         return updated_data
 
+    def set_image(
+        self, db: Session, *, db_obj: Consignment, image_path: str, thumbnail_path: str, display_path: str,
+        commit: bool = True
+    ) -> Consignment:
+        db_obj.image_path = image_path
+        db_obj.image_thumbnail_path = thumbnail_path
+        db_obj.image_display_path = display_path
+        return self.save(db, db_obj=db_obj, commit=commit)
+
     def get_by_user_id(self, db: Session, *, user_id: int) -> List[Consignment]:
         return db.query(self.model).filter(Consignment.user_id == user_id).all()
 
-    def get_multi(
-        self, db: Session, *, skip: int = 0, limit: int = 100, filters: Dict[str, Any] = None,
-                                              order_by = "id", direction = "desc"
-    ) -> List[Consignment]:
-        query = db.query(self.model)
-        if filters:
-            created_at_start = filters.pop("created_at_start", None)
-            created_at_end = filters.pop("created_at_end", None)
-
-            for key, value in filters.items():
-                if hasattr(self.model, key):  # Ensure the key exists in the model
-                    query = query.filter(getattr(self.model, key) == value)
-                else:
-                    raise ValueError(f"Invalid filter key: {key}")
-
-            if created_at_start and created_at_end:
-                query = query.filter(
-                    self.model.created_at >= created_at_start,
-                    self.model.created_at <= created_at_end
-                )
-            elif created_at_start and not created_at_end:
-                query = query.filter(self.model.created_at >= created_at_start)
-            elif not created_at_start and created_at_end:
-                query = query.filter(self.model.created_at <= created_at_end)
-
-        try:
-            if direction.lower() == "desc":
-                query = query.order_by(desc(order_by))
-            else:
-                query = query.order_by(asc(order_by))
-        except Exception as e:
-            raise ValueError(f"Invalid order_by format: {order_by}") from e
-
-        return query.offset(skip).limit(limit).all()
-
 
 consignment = CRUDConsignment(Consignment)
@@ -0,0 +1,53 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.crud.base import CRUDBase
+from app.models.finance_transaction import FinanceTransaction
+
+
+class CRUDFinanceTransaction(CRUDBase[FinanceTransaction, None, None]):
+    """
+    Read side of the ledger. Rows are written by `crud.user_finance.debit`
+    and `credit`, together with the balance they move.
+    """
+
+    def balance_at(self, db: Session, *, user_id: int, at: datetime) -> Decimal:
+        """
+        The user's balance just before `at`: the snapshot of their last
+        transaction before it, found with one index lookup.
+        """
+        balance = db.execute(
+            select(FinanceTransaction.balance_after)
+            .where(FinanceTransaction.user_id == user_id, FinanceTransaction.created_at < at)
+            .order_by(FinanceTransaction.created_at.desc(), FinanceTransaction.id.desc())
+            .limit(1)
+        ).scalar_one_or_none()
+        return balance if balance is not None else Decimal("0.00")
+
+    def get_range(
+        self,
+        db: Session,
+        *,
+        user_id: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: int = 1000
+    ) -> List[FinanceTransaction]:
+        """Transactions of the user with start <= created_at < end, oldest first."""
+        query = db.query(FinanceTransaction).filter(FinanceTransaction.user_id == user_id)
+        if start is not None:
+            query = query.filter(FinanceTransaction.created_at >= start)
+        if end is not None:
+            query = query.filter(FinanceTransaction.created_at < end)
+        return (
+            query.order_by(FinanceTransaction.created_at, FinanceTransaction.id)
+            .limit(limit)
+            .all()
+        )
+
+
+finance_transaction = CRUDFinanceTransaction(FinanceTransaction)
@@ -1,15 +1,35 @@
 from typing import Union, Dict, Any, List
 
-from sqlalchemy import desc, asc
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 
+from app.constants.general import CompareOperator
+from app.constants.change_log import ObjectType
+from app.crud.audit import AuditedCRUDMixin
 from app.crud.base import CRUDBase
-from app.models import Fulfillment
+from app.models import Fulfillment, Shipment, Consignment
 from app.schemas import FulfillmentCreate, FulfillmentUpdate
 
 
-class CRUDFulfillment(CRUDBase[Fulfillment, FulfillmentCreate, FulfillmentUpdate]):
-    def create(self, db: Session, *, obj_in: FulfillmentCreate, **kwargs) -> Fulfillment:
+class CRUDFulfillment(AuditedCRUDMixin, CRUDBase[Fulfillment, FulfillmentCreate, FulfillmentUpdate]):
+    audit_object_type = ObjectType.FULFILLMENT
+
+    filter_fields = {
+        "fulfillment_status": ("status", CompareOperator.EQUAL),
+        "shipment_ids": ("shipment_id", CompareOperator.IN),
+    }
+    sortable_fields = ("id", "created_at")
+    loader_profiles = {
+        # schemas.Fulfillment -> shipment -> consignment, and consignment,
+        # both with their foreign_shipment_codes
+        "with_shipment_and_consignment": (
+            joinedload(Fulfillment.shipment)
+            .joinedload(Shipment.consignment)
+            .selectinload(Consignment.foreign_shipment_codes),
+            joinedload(Fulfillment.consignment).selectinload(Consignment.foreign_shipment_codes),
+        ),
+    }
+
+    def create(self, db: Session, *, obj_in: FulfillmentCreate, commit: bool = True, **kwargs) -> Fulfillment:
         db_obj = Fulfillment(
             customer_name=obj_in.customer_name,
             customer_phone_number=obj_in.customer_phone_number,
@@ -20,10 +40,7 @@ class CRUDFulfillment(CRUDBase[Fulfillment, FulfillmentCreate, FulfillmentUpdate
             shipping_type=obj_in.shipping_type,
             user_id=obj_in.user_id
         )
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-        return db_obj
+        return self.save(db, db_obj=db_obj, commit=commit)
 
     def update(
         self,
@@ -38,7 +55,7 @@ class CRUDFulfillment(CRUDBase[Fulfillment, FulfillmentCreate, FulfillmentUpdate
         else:
             update_data = obj_in.model_dump(exclude_unset=True)
 
-        return super().update(db, db_obj=db_obj, obj_in=update_data)
+        return super().update(db, db_obj=db_obj, obj_in=update_data, **kwargs)
 
     def get_by_user_id(self, db: Session, *, user_id: int) -> List[Fulfillment]:
         return db.query(self.model).filter(Fulfillment.user_id == user_id).all()
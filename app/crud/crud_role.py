@@ -1,14 +1,52 @@
-from typing import Optional
+from typing import Any, Dict, FrozenSet, Optional, Union
 
+from app.core.config import settings
 from app.crud.base import CRUDBase
 from app.models.role import Role
 from app.schemas.role import RoleCreate, RoleUpdate
+from app.utils.cache import TTLCache
 from sqlalchemy.orm import Session
 
 
 class CRUDRole(CRUDBase[Role, RoleCreate, RoleUpdate]):
+    def __init__(self, model):
+        super().__init__(model)
+        self._names: TTLCache[None, FrozenSet[str]] = TTLCache(maxsize=1, ttl=settings.ROLE_CACHE_TTL_SECONDS)
+
     def get_by_name(self, db: Session, *, name: str) -> Optional[Role]:
         return db.query(self.model).filter(Role.name == name).first()
 
+    def get_names(self, db: Session) -> FrozenSet[str]:
+        """
+        Names of all roles, cached since the role table almost never changes.
+        """
+        names = self._names.get(None)
+        if names is None:
+            names = frozenset(name for name, in db.query(Role.name))
+            self._names.set(None, names)
+        return names
+
+    def create(self, db: Session, *, obj_in: RoleCreate, **kwargs) -> Role:
+        db_obj = super().create(db, obj_in=obj_in, **kwargs)
+        self._names.clear()
+        return db_obj
+
+    def update(
+        self,
+        db: Session,
+        *,
+        db_obj: Role,
+        obj_in: Union[RoleUpdate, Dict[str, Any]],
+        **kwargs: Any
+    ) -> Role:
+        db_obj = super().update(db, db_obj=db_obj, obj_in=obj_in, **kwargs)
+        self._names.clear()
+        return db_obj
+
+    def remove(self, db: Session, *, id: int) -> Role:
+        db_obj = super().remove(db, id=id)
+        self._names.clear()
+        return db_obj
+
 
 role = CRUDRole(Role)
@@ -1,16 +1,37 @@
-from typing import Union, Dict, Any, List
+from typing import Union, Dict, Any, List, Sequence
 
-from sqlalchemy import desc, asc
-from sqlalchemy.orm import Session
+from sqlalchemy import Integer, String, and_, any_, bindparam, func, or_, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session, contains_eager, joinedload
 
-from app.constants.change_log import ObjectType, ActionType
+from app.constants.change_log import ActionType, ObjectType
+from app.constants.general import CompareOperator
+from app.constants.shipment import ShipmentStatus
+from app.crud.audit import AuditedCRUDMixin
 from app.crud.base import CRUDBase
-from app.models import Shipment, ChangeLog
+from app.crud.crud_change_log import change_log
+from app.models import Shipment, Consignment
+from app.models.consignment_foreign_shipment_code import ConsignmentForeignShipmentCode
 from app.schemas import ShipmentCreate, ShipmentUpdate
 
 
-class CRUDShipment(CRUDBase[Shipment, ShipmentCreate, ShipmentUpdate]):
-    def create(self, db: Session, *, obj_in: ShipmentCreate, **kwargs) -> Shipment:
+class CRUDShipment(AuditedCRUDMixin, CRUDBase[Shipment, ShipmentCreate, ShipmentUpdate]):
+    audit_object_type = ObjectType.SHIPMENT
+
+    filter_fields = {
+        "codes": ("code", CompareOperator.IN),
+        "created_at_start": ("created_at", CompareOperator.GREATER_THAN_OR_EQUAL),
+        "created_at_end": ("created_at", CompareOperator.LESS_THAN_OR_EQUAL),
+    }
+    sortable_fields = ("id", "code", "created_at")
+    loader_profiles = {
+        # schemas.Shipment -> consignment -> foreign_shipment_codes
+        "with_consignment": (
+            joinedload(Shipment.consignment).selectinload(Consignment.foreign_shipment_codes),
+        ),
+    }
+
+    def create(self, db: Session, *, obj_in: ShipmentCreate, commit: bool = True, **kwargs) -> Shipment:
         db_obj = Shipment(
             consignment_id=obj_in.consignment_id,
             shipment_status=obj_in.shipment_status,
@@ -38,10 +59,7 @@ class CRUDShipment(CRUDBase[Shipment, ShipmentCreate, ShipmentUpdate]):
             domestic_shipping_fee=obj_in.domestic_shipping_fee,
             user_id = obj_in.user_id
         )
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-        return db_obj
+        return self.save(db, db_obj=db_obj, commit=commit)
 
     def update(
         self,
@@ -49,77 +67,178 @@ class CRUDShipment(CRUDBase[Shipment, ShipmentCreate, ShipmentUpdate]):
         *,
         db_obj: Shipment,
         obj_in: Union[ShipmentUpdate, Dict[str, Any]],
+        commit: bool = True,
         **kwargs: Any
     ) -> Shipment:
         current_user_id = kwargs.get("current_user_id")
         if current_user_id is None:
             raise ValueError("current_user_id is required for update operation")
 
-        if isinstance(obj_in, dict):
-            update_data = obj_in
-        else:
-            update_data = obj_in.model_dump(exclude_unset=True)
-
-        update_data["user_id"] = current_user_id
-
-        changes = []
-        for field, new_value in update_data.items():
-            old_value = getattr(db_obj, field)
-            if old_value != new_value:
-                changes.append({
-                    "field": field,
-                    "old": old_value,
-                    "new": new_value
-                })
-
-        updated_obj = super().update(db, db_obj=db_obj, obj_in=update_data)
-
-        if changes:
-            change_log = ChangeLog(
-                user_id=current_user_id,
-                object_type=ObjectType.SHIPMENT.value,
-                object_id=db_obj.id,
-                action=ActionType.UPDATE.value,
-                changes=changes
+        # current_user_id is who made the change, for the change log: the owner stays as is
+        return super().update(
+            db, db_obj=db_obj, obj_in=obj_in, commit=commit, current_user_id=current_user_id
+        )
+
+    def transition_status(
+        self,
+        db: Session,
+        *,
+        ids: List[int],
+        to_status: ShipmentStatus,
+        from_statuses: Sequence[ShipmentStatus],
+        current_user_id: int,
+        commit: bool = True
+    ) -> Dict[int, int]:
+        """
+        Move the shipments among `ids` whose status is one of `from_statuses`
+        to `to_status` with a single UPDATE, and log the changes with one
+        multi-row INSERT. Shipments leaving FOREIGN_SHIPPING must have been
+        weighed first (weight > 0).
+
+        :return: The previous status of each updated shipment, by id
+        """
+        shipments = Shipment.__table__
+        # Locked in id order, so that overlapping bulk updates can't deadlock
+        previous = (
+            select(shipments.c.id, shipments.c.shipment_status)
+            .where(shipments.c.id == any_(bindparam("ids", ids, type_=ARRAY(Integer))))
+            .order_by(shipments.c.id)
+            .with_for_update()
+            .subquery("previous")
+        )
+        statement = (
+            update(shipments)
+            .where(
+                shipments.c.id == previous.c.id,
+                previous.c.shipment_status == any_(
+                    bindparam("from_statuses", [status.value for status in from_statuses], type_=ARRAY(Integer))
+                ),
+                or_(
+                    previous.c.shipment_status != ShipmentStatus.FOREIGN_SHIPPING.value,
+                    shipments.c.weight > 0,
+                ),
             )
-            db.add(change_log)
+            .values(shipment_status=to_status.value)
+            .returning(shipments.c.id, previous.c.shipment_status)
+        )
+        updated = dict(db.execute(statement).all())
+
+        change_log.record_multi(
+            db,
+            user_id=current_user_id,
+            object_type=ObjectType.SHIPMENT,
+            action=ActionType.UPDATE,
+            changes_by_object_id={
+                shipment_id: [{"field": "shipment_status", "old": old_status, "new": to_status.value}]
+                for shipment_id, old_status in updated.items()
+            },
+        )
+        if commit:
             db.commit()
-
-        return updated_obj
+        return updated
+
+    def get_by_foreign_codes(self, db: Session, *, codes: List[str]) -> List[Shipment]:
+        """
+        Resolve scanned foreign shipment codes, compared case-insensitively,
+        to their shipments with the consignment and customer, in a single
+        `= ANY(:codes)` query over the uniquely indexed code table. The
+        consignments' code lists are then loaded with one IN query.
+        """
+        if not codes:
+            return []
+        statement = (
+            select(Shipment)
+            .join(
+                ConsignmentForeignShipmentCode,
+                and_(
+                    ConsignmentForeignShipmentCode.consignment_id == Shipment.consignment_id,
+                    ConsignmentForeignShipmentCode.foreign_shipment_code == Shipment.code,
+                ),
+            )
+            .join(Shipment.consignment)
+            .join(Shipment.user)
+            .where(
+                func.upper(ConsignmentForeignShipmentCode.foreign_shipment_code) == any_(
+                    bindparam("codes", [code.upper() for code in codes], type_=ARRAY(String))
+                )
+            )
+            .options(
+                contains_eager(Shipment.consignment).selectinload(Consignment.foreign_shipment_codes),
+                contains_eager(Shipment.user),
+            )
+        )
+        return db.scalars(statement).all()
 
     def get_by_user_id(self, db: Session, *, user_id: int) -> List[Shipment]:
         return db.query(self.model).filter(Shipment.user_id == user_id).all()
 
-    def remove_by_consignment_id(self, db: Session, *, consignment_id: int) -> bool:
-        db.query(self.model).filter(Shipment.consignment_id == consignment_id).delete()
-        db.commit()
-
-        return True
-
-    def get_multi(
-        self, db: Session, *, skip: int = 0, limit: int = 100, filters: Dict[str, Any] = None,
-                                              order_by = "id", direction = "desc"
-    ) -> List[Shipment]:
-        query = db.query(self.model)
-        if filters:
-            for key, value in filters.items():
-                if key == "codes":
-                    if value:
-                        query = query.filter(self.model.code.in_(value))
-                elif hasattr(self.model, key):  # Ensure the key exists in the model
-                    query = query.filter(getattr(self.model, key) == value)
-                else:
-                    raise ValueError(f"Invalid filter key: {key}")
-
-        try:
-            if direction.lower() == "desc":
-                query = query.order_by(desc(order_by))
-            else:
-                query = query.order_by(asc(order_by))
-        except Exception as e:
-            raise ValueError(f"Invalid order_by format: {order_by}") from e
-
-        return query.offset(skip).limit(limit).all()
-
+    def update_by_codes(
+        self,
+        db: Session,
+        *,
+        consignment_id: int,
+        codes: List[str],
+        values: Dict[str, Any],
+        current_user_id: int,
+        commit: bool = True
+    ) -> List[int]:
+        """
+        Set `values` on the consignment's shipments with the given codes in a
+        single UPDATE, skipping the rows that already hold them, and log the
+        changes with one multi-row INSERT.
+
+        :return: The ids of the updated shipments
+        """
+        if not codes:
+            return []
+        shipments = Shipment.__table__
+        columns = list(values)
+        previous = (
+            select(shipments.c.id, *(shipments.c[column] for column in columns))
+            .where(
+                shipments.c.consignment_id == consignment_id,
+                shipments.c.code == any_(bindparam("codes", codes, type_=ARRAY(String))),
+            )
+            .order_by(shipments.c.id)
+            .with_for_update()
+            .subquery("previous")
+        )
+        statement = (
+            update(shipments)
+            .where(
+                shipments.c.id == previous.c.id,
+                or_(*(previous.c[column].is_distinct_from(value) for column, value in values.items())),
+            )
+            .values(values)
+            .returning(shipments.c.id, *(previous.c[column] for column in columns))
+        )
+        rows = db.execute(statement).all()
+
+        change_log.record_multi(
+            db,
+            user_id=current_user_id,
+            object_type=ObjectType.SHIPMENT,
+            action=ActionType.UPDATE,
+            changes_by_object_id={
+                shipment_id: [
+                    {"field": column, "old": old, "new": values[column]}
+                    for column, old in zip(columns, old_values)
+                    if old != values[column]
+                ]
+                for shipment_id, *old_values in rows
+            },
+        )
+        if commit:
+            db.commit()
+        return [shipment_id for shipment_id, *_ in rows]
+
+    def remove_by_codes(self, db: Session, *, consignment_id: int, codes: List[str], commit: bool = True) -> None:
+        if not codes:
+            return
+        db.query(self.model).filter(
+            Shipment.consignment_id == consignment_id, Shipment.code.in_(codes)
+        ).delete(synchronize_session=False)
+        if commit:
+            db.commit()
 
 shipment = CRUDShipment(Shipment)
\ No newline at end of file
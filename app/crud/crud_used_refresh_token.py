@@ -0,0 +1,35 @@
+from datetime import datetime, UTC
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.crud.base import CRUDBase
+from app.models.used_refresh_token import UsedRefreshToken
+
+
+class CRUDUsedRefreshToken(CRUDBase[UsedRefreshToken, None, None]):
+    def consume(self, db: Session, *, jti: str, user_id: int, expires_at: datetime) -> bool:
+        """
+        Mark a refresh token as used. Returns False when it had already been
+        used, i.e. it is being replayed.
+        """
+        inserted = db.execute(
+            insert(UsedRefreshToken)
+            .values(jti=jti, user_id=user_id, expires_at=expires_at)
+            .on_conflict_do_nothing(index_elements=[UsedRefreshToken.jti])
+            .returning(UsedRefreshToken.jti)
+        ).first()
+        db.commit()
+        return inserted is not None
+
+    def purge_expired(self, db: Session) -> int:
+        deleted = (
+            db.query(UsedRefreshToken)
+            .filter(UsedRefreshToken.expires_at < datetime.now(UTC).replace(tzinfo=None))
+            .delete(synchronize_session=False)
+        )
+        db.commit()
+        return deleted
+
+
+used_refresh_token = CRUDUsedRefreshToken(UsedRefreshToken)
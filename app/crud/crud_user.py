@@ -1,15 +1,31 @@
 from typing import Any, Dict, List, Optional, Union
 
-from sqlalchemy import desc, asc
 from sqlalchemy.orm import Session, joinedload
 
+from app.constants.general import CompareOperator
+from app.core.config import settings
 from app.core.security import get_password_hash, verify_password
 from app.crud.base import CRUDBase
 from app.models.user import User
+from app.schemas.token import Principal
 from app.schemas.user import UserCreate, UserUpdate
+from app.utils.cache import TTLCache
 
 
 class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
+    filter_fields = {
+        "created_at_start": ("created_at", CompareOperator.GREATER_THAN_OR_EQUAL),
+        "created_at_end": ("created_at", CompareOperator.LESS_THAN_OR_EQUAL),
+        "emails": ("email", CompareOperator.IN),
+    }
+    sortable_fields = ("id", "email", "user_code", "full_name", "phone_number", "created_at")
+
+    def __init__(self, model):
+        super().__init__(model)
+        self._principals: TTLCache[tuple, Principal] = TTLCache(
+            maxsize=settings.PRINCIPAL_CACHE_SIZE, ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS
+        )
+
     def get_by_email(self, db: Session, *, email: str) -> Optional[User]:
         return db.query(self.model).filter(User.email == email).first()
 
@@ -50,7 +66,12 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             hashed_password = get_password_hash(update_data["password"])
             del update_data["password"]
             update_data["hashed_password"] = hashed_password
-        return super().update(db, db_obj=db_obj, obj_in=update_data)
+        # Sign the user out everywhere when the password changes or the user is deactivated
+        if "hashed_password" in update_data or update_data.get("is_active", db_obj.is_active) != db_obj.is_active:
+            update_data["token_version"] = db_obj.token_version + 1
+        user = super().update(db, db_obj=db_obj, obj_in=update_data)
+        self.invalidate_principal(user.id)
+        return user
 
     def authenticate(
         self, db: Session, *, email: str, password: str
@@ -62,6 +83,14 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             return None
         return user
 
+    def set_password_hash(self, db: Session, *, db_obj: User, hashed_password: str) -> User:
+        """
+        Replace the stored hash of an unchanged password, e.g. after the
+        bcrypt cost changed. Tokens stay valid.
+        """
+        db_obj.hashed_password = hashed_password
+        return self.save(db, db_obj=db_obj)
+
     def is_active(self, user: User) -> bool:
         return user.is_active
 
@@ -71,6 +100,48 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             joinedload(User.user_finance)
         ).filter(User.id == id).first()
 
+    def get_principal(self, db: Session, *, id: int, issued_at: Optional[int] = None) -> Optional[Principal]:
+        """
+        Resolve the id, account, active flag and token version of a user,
+        cached per (id, token iat) so repeated requests with the same token
+        skip the database. The role is taken from the token, not loaded here.
+        """
+        key = (id, issued_at)
+        principal = self._principals.get(key)
+        if principal is not None:
+            return principal
+
+        row = (
+            db.query(User.id, User.account_id, User.is_active, User.token_version)
+            .filter(User.id == id)
+            .first()
+        )
+        if row is None:
+            return None
+        principal = Principal(id=row[0], account_id=row[1], is_active=bool(row[2]), token_version=row[3])
+        self._principals.set(key, principal)
+        return principal
+
+    def revoke_tokens(self, db: Session, *, user_id: int, commit: bool = True) -> None:
+        """
+        Invalidate every token issued to the user so far. With commit=False
+        the caller commits and then calls `invalidate_principal`.
+        """
+        db.query(User).filter(User.id == user_id).update(
+            {User.token_version: User.token_version + 1}, synchronize_session=False
+        )
+        if commit:
+            db.commit()
+            self.invalidate_principal(user_id)
+
+    def remove(self, db: Session, *, id: int) -> User:
+        user = super().remove(db, id=id)
+        self.invalidate_principal(id)
+        return user
+
+    def invalidate_principal(self, user_id: int) -> None:
+        self._principals.discard_where(lambda key: key[0] == user_id)
+
     def get_by_account_id(
         self,
         db: Session,
@@ -87,40 +158,5 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             .all()
         )
 
-    def get_multi(
-        self, db: Session, *, skip: int = 0, limit: int = 100, filters: Dict[str, Any] = None,
-                                              order_by = "id", direction = "desc"
-    ) -> List[User]:
-        query = db.query(self.model)
-        if filters:
-            created_at_start = filters.pop("created_at_start", None)
-            created_at_end = filters.pop("created_at_end", None)
-
-            for key, value in filters.items():
-                if hasattr(self.model, key):  # Ensure the key exists in the model
-                    query = query.filter(getattr(self.model, key) == value)
-                else:
-                    raise ValueError(f"Invalid filter key: {key}")
-
-            if created_at_start and created_at_end:
-                query = query.filter(
-                    self.model.created_at >= created_at_start,
-                    self.model.created_at <= created_at_end
-                )
-            elif created_at_start and not created_at_end:
-                query = query.filter(self.model.created_at >= created_at_start)
-            elif not created_at_start and created_at_end:
-                query = query.filter(self.model.created_at <= created_at_end)
-
-        try:
-            if direction.lower() == "desc":
-                query = query.order_by(desc(order_by))
-            else:
-                query = query.order_by(asc(order_by))
-        except Exception as e:
-            raise ValueError(f"Invalid order_by format: {order_by}") from e
-
-        return query.offset(skip).limit(limit).all()
-
 
 user = CRUDUser(User)
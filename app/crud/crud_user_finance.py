@@ -1,25 +1,34 @@
+from decimal import Decimal
 from typing import Optional, Dict, Any, Union
 
+from sqlalchemy import Integer, Numeric, Text, literal, select, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
+from app.constants.change_log import ObjectType
+from app.constants.finance import FinanceTransactionType
+from app.crud.audit import AuditedCRUDMixin
 from app.crud.base import CRUDBase
+from app.db.base_class import utc_now
+from app.models.finance_transaction import FinanceTransaction
 from app.models.user_finance import UserFinance
 from app.schemas.user_finance import UserFinanceCreate, UserFinanceUpdate
+from app.utils.money import to_money
 
 
-class CRUDUserFinance(CRUDBase[UserFinance, UserFinanceCreate, UserFinanceUpdate]):
+class CRUDUserFinance(AuditedCRUDMixin, CRUDBase[UserFinance, UserFinanceCreate, UserFinanceUpdate]):
+    audit_object_type = ObjectType.USER_FINANCE
+
     def get_by_user_id(self, db: Session, *, user_id: int) -> Optional[UserFinance]:
         return db.query(self.model).filter(UserFinance.user_id == user_id).first()
 
     def create(self, db: Session, *, obj_in: UserFinanceCreate, **kwargs) -> UserFinance:
-        db_obj = UserFinance(
-            user_id=obj_in.user_id,
-            balance=obj_in.balance,
+        # The starting balance is a ledger row like any other balance change
+        self.credit(
+            db, user_id=obj_in.user_id, amount=obj_in.balance,
+            transaction_type=FinanceTransactionType.ADJUSTMENT, note="Opening balance"
         )
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-        return db_obj
+        return self.get_by_user_id(db, user_id=obj_in.user_id)
 
     def update(
         self,
@@ -35,9 +44,113 @@ class CRUDUserFinance(CRUDBase[UserFinance, UserFinanceCreate, UserFinanceUpdate
         else:
             update_data = obj_in.model_dump(exclude_unset=True)
 
-        updated_obj = super().update(db, db_obj=db_obj, obj_in=update_data)
+        # The balance must stay the sum of the ledger: it only changes through credit/debit
+        if "balance" in update_data:
+            raise ValueError("balance can only be changed with credit or debit")
+
+        updated_obj = super().update(db, db_obj=db_obj, obj_in=update_data, **kwargs)
 
         return updated_obj
 
+    def debit(
+        self,
+        db: Session,
+        *,
+        user_id: int,
+        amount: Union[Decimal, float],
+        transaction_type: FinanceTransactionType = FinanceTransactionType.FULFILLMENT_CHARGE,
+        reference_type: Optional[ObjectType] = None,
+        reference_id: Optional[int] = None,
+        note: Optional[str] = None,
+        commit: bool = True
+    ) -> Optional[Decimal]:
+        """
+        Subtract `amount` from the user's balance and record it in the ledger,
+        in one statement: a conditional UPDATE (balance >= amount) feeding the
+        ledger INSERT. Concurrent debits can neither overdraw nor overwrite
+        each other, and the row stays locked until the transaction ends.
+
+        :return: The new balance, or None if the user has no finance or not enough balance
+        """
+        amount = to_money(amount)
+        debited = (
+            update(UserFinance)
+            .where(UserFinance.user_id == user_id, UserFinance.balance >= amount)
+            .values(balance=UserFinance.balance - amount)
+            .returning(UserFinance.user_id, UserFinance.balance)
+            .cte("debited")
+        )
+        new_balance = self._record(
+            db, debited, -amount, transaction_type, reference_type, reference_id, note
+        )
+        if commit:
+            db.commit()
+        return new_balance
+
+    def credit(
+        self,
+        db: Session,
+        *,
+        user_id: int,
+        amount: Union[Decimal, float],
+        transaction_type: FinanceTransactionType = FinanceTransactionType.DEPOSIT,
+        reference_type: Optional[ObjectType] = None,
+        reference_id: Optional[int] = None,
+        note: Optional[str] = None,
+        commit: bool = True
+    ) -> Decimal:
+        """
+        Add `amount` to the user's balance and record it in the ledger. The
+        user's finance is created on the first credit
+        (INSERT ... ON CONFLICT DO UPDATE).
+
+        :return: The new balance
+        """
+        amount = to_money(amount)
+        credited = (
+            insert(UserFinance)
+            .values(user_id=user_id, balance=amount)
+            .on_conflict_do_update(
+                index_elements=[UserFinance.user_id],
+                set_={"balance": UserFinance.balance + amount, "updated_at": utc_now},
+            )
+            .returning(UserFinance.user_id, UserFinance.balance)
+            .cte("credited")
+        )
+        new_balance = self._record(
+            db, credited, amount, transaction_type, reference_type, reference_id, note
+        )
+        if commit:
+            db.commit()
+        return new_balance
+
+    def _record(
+        self,
+        db: Session,
+        changed,
+        amount: Decimal,
+        transaction_type: FinanceTransactionType,
+        reference_type: Optional[ObjectType],
+        reference_id: Optional[int],
+        note: Optional[str]
+    ) -> Optional[Decimal]:
+        # The ledger row is only inserted when the balance CTE returned a row
+        return db.execute(
+            insert(FinanceTransaction)
+            .from_select(
+                ["user_id", "transaction_type", "amount", "balance_after", "reference_type", "reference_id", "note"],
+                select(
+                    changed.c.user_id,
+                    literal(transaction_type.value, Integer),
+                    literal(amount, Numeric(18, 2)),
+                    changed.c.balance,
+                    literal(reference_type.value if reference_type else None, Integer),
+                    literal(reference_id, Integer),
+                    literal(note, Text),
+                ),
+            )
+            .returning(FinanceTransaction.balance_after)
+        ).scalar_one_or_none()
+
 
 user_finance = CRUDUserFinance(UserFinance)
\ No newline at end of file
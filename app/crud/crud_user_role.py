@@ -1,6 +1,7 @@
-from typing import Optional
+from typing import Any, Dict, Optional, Union
 
 from app.crud.base import CRUDBase
+from app.crud.crud_user import user
 from app.models.user_role import UserRole
 from app.schemas.user_role import UserRoleCreate, UserRoleUpdate
 from sqlalchemy.orm import Session
@@ -12,5 +13,25 @@ class CRUDUserRole(CRUDBase[UserRole, UserRoleCreate, UserRoleUpdate]):
     ) -> Optional[UserRole]:
         return db.query(UserRole).filter(UserRole.user_id == user_id).first()
 
+    def create(self, db: Session, *, obj_in: UserRoleCreate, **kwargs) -> UserRole:
+        # Tokens carry the role as a claim, so the old ones must go
+        user.revoke_tokens(db, user_id=obj_in.user_id, commit=False)
+        db_obj = super().create(db, obj_in=obj_in, **kwargs)
+        user.invalidate_principal(db_obj.user_id)
+        return db_obj
+
+    def update(
+        self,
+        db: Session,
+        *,
+        db_obj: UserRole,
+        obj_in: Union[UserRoleUpdate, Dict[str, Any]],
+        **kwargs: Any
+    ) -> UserRole:
+        user.revoke_tokens(db, user_id=db_obj.user_id, commit=False)
+        db_obj = super().update(db, db_obj=db_obj, obj_in=obj_in, **kwargs)
+        user.invalidate_principal(db_obj.user_id)
+        return db_obj
+
 
 user_role = CRUDUserRole(UserRole)
@@ -1,6 +1,7 @@
 from typing import Any
 
 import inflect  
+from sqlalchemy import text
 from sqlalchemy.ext.declarative import as_declarative, declared_attr
 
 p = inflect.engine() 
@@ -13,3 +14,9 @@ class Base:
     @declared_attr
     def __tablename__(cls) -> str:
         return p.plural(cls.__name__.lower())
+
+
+# Current UTC time evaluated by the database, for created_at/updated_at
+# server_default and onupdate. A Python default such as datetime.now(UTC)
+# would be evaluated once, when the model module is imported.
+utc_now = text("timezone('utc', now())")
@@ -0,0 +1,141 @@
+import logging
+import threading
+from collections import deque
+from datetime import datetime, UTC
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.change_log import ChangeLog
+
+logger = logging.getLogger(__name__)
+
+# Key of Session.info holding change log rows waiting for the session to commit
+PENDING_CHANGE_LOGS_KEY = "pending_change_logs"
+
+
+class ChangeLogWriter:
+    """
+    Buffers change log rows in process and inserts them from a background
+    thread, `batch_size` rows per multi-row INSERT, at least every
+    `flush_interval` seconds.
+
+    Rows still buffered when the process dies are lost; `stop` flushes them
+    on a clean shutdown. When `max_pending` rows are buffered, `submit`
+    blocks until the flusher catches up rather than dropping entries.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        *,
+        batch_size: int,
+        flush_interval: float,
+        max_pending: int
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: Deque[Dict[str, Any]] = deque()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def submit(self, rows: List[Dict[str, Any]]) -> None:
+        with self._cond:
+            while len(self._pending) >= self.max_pending and not self._closed:
+                self._cond.wait(self.flush_interval)
+            self._pending.extend(rows)
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._run, name="change-log-writer", daemon=True)
+                self._thread.start()
+            if len(self._pending) >= self.batch_size:
+                self._cond.notify_all()
+
+    def flush(self) -> int:
+        """Insert every buffered row now. Returns the number of rows written."""
+        written = 0
+        while batch := self._take_batch():
+            self._write(batch)
+            written += len(batch)
+        return written
+
+    def stop(self) -> None:
+        """Stop the flusher thread and flush; a later `submit` starts it again."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        try:
+            self.flush()
+        finally:
+            with self._cond:
+                self._closed = False
+
+    def _take_batch(self) -> List[Dict[str, Any]]:
+        with self._cond:
+            batch = [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+            self._cond.notify_all()
+            return batch
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        db = self.session_factory()
+        try:
+            db.execute(insert(ChangeLog.__table__), batch)
+            db.commit()
+        except Exception:
+            db.rollback()
+            # Keep the rows for the next attempt
+            with self._cond:
+                self._pending.extendleft(reversed(batch))
+            raise
+        finally:
+            db.close()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._closed or len(self._pending) >= self.batch_size,
+                    timeout=self.flush_interval,
+                )
+                if self._closed:
+                    return
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Could not write change logs, retrying in %ss", self.flush_interval)
+                with self._cond:
+                    self._cond.wait(self.flush_interval)
+
+
+change_log_writer = ChangeLogWriter(
+    SessionLocal,
+    batch_size=settings.CHANGE_LOG_BATCH_SIZE,
+    flush_interval=settings.CHANGE_LOG_FLUSH_INTERVAL_SECONDS,
+    max_pending=settings.CHANGE_LOG_MAX_PENDING,
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _submit_pending_change_logs(session: Session) -> None:
+    rows = session.info.pop(PENDING_CHANGE_LOGS_KEY, None)
+    if rows:
+        # The rows reach the database up to a flush interval later, where the column
+        # default would stamp the flush time: keep the commit time instead, in naive
+        # UTC like timezone('utc', now())
+        committed_at = datetime.now(UTC).replace(tzinfo=None)
+        for row in rows:
+            row["created_at"] = committed_at
+        change_log_writer.submit(rows)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_change_logs(session: Session) -> None:
+    session.info.pop(PENDING_CHANGE_LOGS_KEY, None)
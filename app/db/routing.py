@@ -0,0 +1,132 @@
+import hashlib
+import hmac
+import itertools
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional, Sequence, Tuple, TypeVar
+
+from sqlalchemy import event
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.config import settings
+from app.utils.cache import TTLCache
+
+# Key of Session.info holding the id of the authenticated caller
+PRINCIPAL_ID_KEY = "principal_id"
+
+# Cookie (or header, for clients without a cookie jar) carrying the caller's last commit
+WRITE_MARKER_COOKIE = "last_write"
+WRITE_MARKER_HEADER = "X-Last-Write"
+
+# Commits of the current request, by user id, collected for the response marker
+_request_writes: ContextVar[Optional[Dict[int, float]]] = ContextVar("request_writes", default=None)
+
+F = TypeVar("F")
+
+
+def sign_write_marker(user_id: int, committed_at: float) -> str:
+    payload = f"{user_id}:{committed_at:.3f}"
+    return f"{payload}:{_signature(payload)}"
+
+
+def parse_write_marker(value: Optional[str]) -> Optional[Tuple[int, float]]:
+    """The (user id, commit time) of a marker, or None if it is malformed or forged."""
+    if not value:
+        return None
+    payload, _, signature = value.rpartition(":")
+    if not hmac.compare_digest(signature, _signature(payload)):
+        return None
+    user_id, _, committed_at = payload.partition(":")
+    try:
+        return int(user_id), float(committed_at)
+    except ValueError:
+        return None
+
+
+def _signature(payload: str) -> str:
+    return hmac.new(settings.SECRET_KEY.encode(), payload.encode(), hashlib.sha256).hexdigest()
+
+
+class ReadRouter:
+    """
+    Chooses where a read-only request runs: on a replica, round-robin, or on
+    the primary while the caller is inside the read-your-writes window.
+
+    A caller enters the window when a session tagged with their id commits,
+    so they read their own writes even if the replicas lag behind.
+
+    The worker that handled the write remembers it in process. For the other
+    workers, `read_your_writes_middleware` returns a signed marker with the
+    commit time (cookie and header) that the client sends back; a valid
+    marker younger than the window routes the read to the primary.
+    """
+
+    def __init__(self, window_seconds: float, maxsize: int):
+        self.window_seconds = window_seconds
+        self._recent_writers: TTLCache[int, bool] = TTLCache(maxsize=maxsize, ttl=window_seconds)
+        self._counter = itertools.count()
+
+    def mark_write(self, user_id: int) -> None:
+        self._recent_writers.set(user_id, True)
+        writes = _request_writes.get()
+        if writes is not None:
+            writes[user_id] = time.time()
+
+    def use_primary(self, user_id: Optional[int], marker: Optional[str] = None) -> bool:
+        if user_id is None:
+            return False
+        if self._recent_writers.get(user_id) is not None:
+            return True
+        parsed = parse_write_marker(marker)
+        return (
+            parsed is not None and parsed[0] == user_id
+            and time.time() - parsed[1] < self.window_seconds
+        )
+
+    def choose(
+        self, user_id: Optional[int], primary: F, replicas: Sequence[F], marker: Optional[str] = None
+    ) -> F:
+        if not replicas or self.use_primary(user_id, marker):
+            return primary
+        return replicas[next(self._counter) % len(replicas)]
+
+    def track_writes(self, session_factory) -> None:
+        """
+        Put the caller into the window whenever a session from `session_factory` commits.
+        """
+        @event.listens_for(session_factory, "after_commit")
+        def _after_commit(session):
+            user_id = session.info.get(PRINCIPAL_ID_KEY)
+            if user_id is not None:
+                self.mark_write(user_id)
+
+
+async def read_your_writes_middleware(request: Request, call_next) -> Response:
+    """Return the write marker on responses of requests that committed for a caller."""
+    # A mutable holder: the endpoint may run in a thread on a copy of this context
+    writes: Dict[int, float] = {}
+    token = _request_writes.set(writes)
+    try:
+        response = await call_next(request)
+    finally:
+        _request_writes.reset(token)
+
+    for user_id, committed_at in writes.items():
+        marker = sign_write_marker(user_id, committed_at)
+        response.headers[WRITE_MARKER_HEADER] = marker
+        response.set_cookie(
+            WRITE_MARKER_COOKIE, marker, max_age=settings.REPLICA_READ_YOUR_WRITES_SECONDS,
+            httponly=True, samesite="lax",
+        )
+    return response
+
+
+def request_write_marker(request: Request) -> Optional[str]:
+    return request.headers.get(WRITE_MARKER_HEADER) or request.cookies.get(WRITE_MARKER_COOKIE)
+
+
+read_router = ReadRouter(
+    window_seconds=settings.REPLICA_READ_YOUR_WRITES_SECONDS,
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+)
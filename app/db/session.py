@@ -1,13 +1,108 @@
+from typing import Any, Dict
+
 from app.core.config import settings
-from sqlalchemy import create_engine
+from app.db.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool, track_hold_time
+from app.db.routing import read_router
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+POOL_OPTIONS: Dict[str, Any] = {
+    "pool_pre_ping": True,
+    "pool_size": settings.DB_POOL_SIZE,
+    "max_overflow": settings.DB_MAX_OVERFLOW,
+    "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+    "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+}
+
+# Tag every session so pg_stat_activity shows who holds a connection, and stop
+# runaway statements before they pin the pool
+SYNC_CONNECT_ARGS = {
+    "application_name": settings.DB_APPLICATION_NAME,
+    "options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}",
+}
+ASYNC_CONNECT_ARGS = {
+    "server_settings": {
+        "application_name": settings.DB_APPLICATION_NAME,
+        "statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS),
+    },
+}
 
-engine = create_engine(settings.SQLALCHEMY_DATABASE_URI.__str__(), pool_pre_ping=True)
+engine = create_engine(
+    settings.SQLALCHEMY_DATABASE_URI.__str__(),
+    poolclass=InstrumentedQueuePool,
+    connect_args=SYNC_CONNECT_ARGS,
+    **POOL_OPTIONS,
+)
+track_hold_time(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 test_engine = create_engine(
-    f"{settings.SQLALCHEMY_DATABASE_URI.__str__()}_test", pool_pre_ping=True
+    f"{settings.SQLALCHEMY_DATABASE_URI.__str__()}_test",
+    poolclass=InstrumentedQueuePool,
+    connect_args=SYNC_CONNECT_ARGS,
+    **POOL_OPTIONS,
 )
+track_hold_time(test_engine)
 TestingSessionLocal = sessionmaker(
     autocommit=False, autoflush=False, bind=test_engine
 )
+
+read_router.track_writes(SessionLocal)
+read_router.track_writes(TestingSessionLocal)
+
+
+def _create_replica_engine(uri: str) -> Engine:
+    replica_engine = create_engine(
+        uri, poolclass=InstrumentedQueuePool, connect_args=SYNC_CONNECT_ARGS, **POOL_OPTIONS
+    )
+    track_hold_time(replica_engine)
+    return replica_engine
+
+
+replica_engines = [_create_replica_engine(str(uri)) for uri in settings.SQLALCHEMY_REPLICA_URIS]
+ReplicaSessionLocals = [
+    sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+    for replica_engine in replica_engines
+]
+
+
+def _async_uri(uri: str) -> str:
+    return make_url(uri).set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+
+
+# asyncpg engine for the async endpoints; same database, separate pool
+ASYNC_DATABASE_URI = _async_uri(settings.SQLALCHEMY_DATABASE_URI.__str__())
+
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URI,
+    poolclass=InstrumentedAsyncQueuePool,
+    connect_args=ASYNC_CONNECT_ARGS,
+    **POOL_OPTIONS,
+)
+track_hold_time(async_engine.sync_engine)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
+def _create_async_replica_engine(uri: str) -> AsyncEngine:
+    replica_engine = create_async_engine(
+        _async_uri(uri), poolclass=InstrumentedAsyncQueuePool, connect_args=ASYNC_CONNECT_ARGS, **POOL_OPTIONS
+    )
+    track_hold_time(replica_engine.sync_engine)
+    return replica_engine
+
+
+async_replica_engines = [_create_async_replica_engine(str(uri)) for uri in settings.SQLALCHEMY_REPLICA_URIS]
+AsyncReplicaSessionLocals = [
+    async_sessionmaker(bind=replica_engine, autoflush=False, expire_on_commit=False)
+    for replica_engine in async_replica_engines
+]
+
+# asyncpg connections are bound to the event loop that opened them, and each
+# TestClient runs its own loop, so tests don't pool them
+test_async_engine = create_async_engine(
+    f"{ASYNC_DATABASE_URI}_test", poolclass=NullPool, connect_args=ASYNC_CONNECT_ARGS
+)
+TestingAsyncSessionLocal = async_sessionmaker(bind=test_async_engine, autoflush=False, expire_on_commit=False)
@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -7,15 +9,32 @@ from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from app.api.api_v1.api import api_router
 from app.core.config import settings
+from app.core.security import PasswordHashingBusy
+from app.core.storage import LocalStorage, get_storage
+from app.db.change_log_writer import change_log_writer
+from app.db.routing import WRITE_MARKER_HEADER, read_your_writes_middleware
+from app.services.image_service import shutdown_image_pool
+from app.utils.pagination import InvalidPageRequest
 from fastapi.staticfiles import StaticFiles
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Write the change logs still buffered in async mode
+    change_log_writer.stop()
+    shutdown_image_pool()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
 )
 
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+storage = get_storage()
+if isinstance(storage, LocalStorage):
+    app.mount(storage.base_url, StaticFiles(directory=storage.root), name="uploads")
 
 
 @app.exception_handler(StarletteHTTPException)
@@ -26,6 +45,23 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
     )
 
 
+@app.exception_handler(PasswordHashingBusy)
+async def password_hashing_busy_handler(request: Request, exc: PasswordHashingBusy):
+    return JSONResponse(
+        status_code=429,
+        content={"message": "Too many login attempts in progress, please retry shortly.", "data": None},
+        headers={"Retry-After": "1"},
+    )
+
+
+@app.exception_handler(InvalidPageRequest)
+async def invalid_page_request_handler(request: Request, exc: InvalidPageRequest):
+    return JSONResponse(
+        status_code=400,
+        content={"message": str(exc), "data": None},
+    )
+
+
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     return JSONResponse(
@@ -34,12 +70,15 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     )
 
 
+app.middleware("http")(read_your_writes_middleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[WRITE_MARKER_HEADER],
 )
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
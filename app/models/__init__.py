@@ -12,4 +12,6 @@ from .user_address import UserAddress
 from .user_finance import UserFinance
 from .user_role import UserRole
 from .account import Account
-from .role import Role
\ No newline at end of file
+from .role import Role
+from .used_refresh_token import UsedRefreshToken
+from .finance_transaction import FinanceTransaction
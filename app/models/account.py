@@ -1,6 +1,4 @@
-from datetime import datetime, UTC
-
-from app.db.base_class import Base
+from app.db.base_class import Base, utc_now
 from sqlalchemy import Boolean, Column, DateTime, String, Integer
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
@@ -17,11 +15,12 @@ class Account(Base):
     is_active = Column(Boolean(), default=True)
     plan_id = Column(UUID(as_uuid=True), index=True, default=None)
     current_subscription_ends = Column(DateTime)
-    created_at = Column(DateTime, default=datetime.now(UTC))
+    created_at = Column(DateTime, nullable=False, server_default=utc_now)
     updated_at = Column(
         DateTime,
-        default=datetime.now(UTC),
-        onupdate=datetime.now(UTC),
+        nullable=False,
+        server_default=utc_now,
+        onupdate=utc_now,
     )
 
     users = relationship("User", back_populates="account")
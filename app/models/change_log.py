@@ -1,8 +1,6 @@
-from datetime import datetime, UTC
-
 from sqlalchemy import Column, Integer, String, JSON, DateTime, Index
 
-from app.db.base_class import Base
+from app.db.base_class import Base, utc_now
 
 
 class ChangeLog(Base):
@@ -14,9 +12,11 @@ class ChangeLog(Base):
     object_id = Column(Integer, index=True, nullable=False)
     action = Column(String(50), nullable=False)
     changes = Column(JSON, nullable=False)
-    created_at = Column(DateTime, default=datetime.now(UTC))
+    created_at = Column(DateTime, nullable=False, server_default=utc_now)
 
     __table_args__ = (
         Index("ix_object_type_object_id", "object_type", "object_id"),
-        Index("ix_user_id_object_type", "user_id", "object_type")
+        Index("ix_user_id_object_type", "user_id", "object_type"),
+        # Rows are only appended, in created_at order: a BRIN index stays tiny
+        Index("ix_change_logs_created_at", "created_at", postgresql_using="brin"),
     )
@@ -1,9 +1,12 @@
-from datetime import datetime, UTC
-
-from sqlalchemy import Column, UUID, ForeignKey, String, Integer, DateTime, Float, Boolean, Text
+from sqlalchemy import Column, UUID, ForeignKey, String, Integer, DateTime, Float, Boolean, Text, Index, Sequence
 from sqlalchemy.orm import relationship
 
-from app.db.base_class import Base
+from app.db.base_class import Base, utc_now
+
+# Numbers of the consignment codes. Each session reserves `cache` values at a
+# time, so concurrent creates don't contend on the sequence: codes can have
+# gaps but are never handed out twice.
+consignment_code_seq = Sequence("consignment_code_seq", cache=50, metadata=Base.metadata)
 
 
 class Consignment(Base):
@@ -16,10 +19,10 @@ class Consignment(Base):
     user_address_id = Column(Integer(), ForeignKey("user_addresses.id"), nullable=False)
 
     source_store_id = Column(
-        Integer, ForeignKey("stores.id"), nullable=False, index=True
+        Integer, ForeignKey("stores.id"), nullable=False
     )
     dest_store_id = Column(
-        Integer, ForeignKey("stores.id"), nullable=False, index=True
+        Integer, ForeignKey("stores.id"), nullable=False
     )
 
     shipping_status = Column(Integer(), nullable=False)
@@ -35,14 +38,17 @@ class Consignment(Base):
     wide_packaged = Column(Float(), nullable=False)
     length_packaged = Column(Float(), nullable=False)
 
-    created_at = Column(DateTime, index=True, default=datetime.now(UTC))
+    created_at = Column(DateTime, nullable=False, server_default=utc_now)
     updated_at = Column(
         DateTime,
-        default=datetime.now(UTC),
-        onupdate=datetime.now(UTC),
+        nullable=False,
+        server_default=utc_now,
+        onupdate=utc_now,
     )
 
     image_path = Column(String(255), nullable=True)
+    image_thumbnail_path = Column(String(255), nullable=True)
+    image_display_path = Column(String(255), nullable=True)
     product_name = Column(String(255), nullable=True)
     product_category_id = Column(
         Integer(), ForeignKey("product_categories.id"), nullable=True
@@ -50,12 +56,20 @@ class Consignment(Base):
 
     number_of_packages = Column(Integer(), nullable=False, default=1)
     domestic_shipping_fee = Column(Float(), nullable=False, default=0.0)
-    code = Column(String(255), nullable=False, index=True)
+    code = Column(String(255), nullable=False, unique=True, index=True)
 
     note = Column(Text(), nullable=True)
 
     shipments = relationship("Shipment", back_populates="consignment")
     foreign_shipment_codes = relationship("ConsignmentForeignShipmentCode", back_populates="consignment")
+
+    __table_args__ = (
+        Index("ix_consignments_user_id_created_at", "user_id", "created_at"),
+        # Sort keys of keyset pages, id breaking ties
+        Index("ix_consignments_created_at_id", "created_at", "id"),
+        Index("ix_consignments_source_store_id_id", "source_store_id", "id"),
+        Index("ix_consignments_dest_store_id_id", "dest_store_id", "id"),
+    )
     fulfillments = relationship("Fulfillment", back_populates="consignment")
     product_category = relationship("ProductCategory", back_populates="consignments")
     source_store = relationship(
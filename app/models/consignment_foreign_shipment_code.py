@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, String
+from sqlalchemy import Column, Integer, ForeignKey, String, Index, func
 from sqlalchemy.orm import relationship
 
 from app.db.base_class import Base
@@ -10,4 +10,13 @@ class ConsignmentForeignShipmentCode(Base):
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     consignment_id = Column(Integer, ForeignKey("consignments.id"), index=True, nullable=False)
     consignment = relationship("Consignment", back_populates="foreign_shipment_codes")
-    foreign_shipment_code = Column(String(255), index=True, nullable=False)
\ No newline at end of file
+    foreign_shipment_code = Column(String(255), nullable=False)
+
+    __table_args__ = (
+        # A tracking code belongs to one parcel; scanned codes are matched case-insensitively
+        Index(
+            "ix_consignment_foreign_shipment_codes_upper_code",
+            func.upper(foreign_shipment_code),
+            unique=True,
+        ),
+    )
@@ -1,10 +1,8 @@
-from datetime import datetime, UTC
-
-from sqlalchemy import Column, Integer, Float, Text, String, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, Float, Text, String, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 
 from app.constants.deposit import DepositStatus
-from app.db.base_class import Base
+from app.db.base_class import Base, utc_now
 
 
 class DepositBill(Base):
@@ -17,7 +15,15 @@ class DepositBill(Base):
     deposit_type = Column(Integer, nullable=False)
     note = Column(Text, nullable=True)
     status = Column(Integer, default=DepositStatus.PENDING.value)
-    created_at = Column(DateTime, index=True, default=datetime.now(UTC))
-    updated_at = Column(DateTime, index=True, default=datetime.now(UTC), onupdate=datetime.now(UTC))
+    created_at = Column(DateTime, nullable=False, server_default=utc_now)
+    updated_at = Column(DateTime, nullable=False, server_default=utc_now, onupdate=utc_now)
+
+    user = relationship("User", back_populates="deposit_bills")
 
-    user = relationship("User", back_populates="deposit_bills")
\ No newline at end of file
+    __table_args__ = (
+        Index("ix_deposit_bills_user_id_status", "user_id", "status"),
+        Index("ix_deposit_bills_user_id_created_at", "user_id", "created_at"),
+        # Sort keys of keyset pages, id breaking ties
+        Index("ix_deposit_bills_created_at_id", "created_at", "id"),
+        Index("ix_deposit_bills_updated_at_id", "updated_at", "id"),
+    )
\ No newline at end of file
@@ -0,0 +1,31 @@
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Index, Integer, Numeric, Text, text
+
+from app.db.base_class import Base
+
+
+class FinanceTransaction(Base):
+    """
+    Append-only ledger of balance movements. Rows are never updated or
+    deleted (a trigger enforces it): corrections are new rows.
+
+    `balance_after` snapshots the user's balance once the row is applied, so
+    a statement needs the last row before its range plus the rows inside it.
+    """
+    __tablename__ = "finance_transactions"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    transaction_type = Column(Integer, nullable=False)
+    amount = Column(Numeric(18, 2), nullable=False)
+    balance_after = Column(Numeric(18, 2), nullable=False)
+    reference_type = Column(Integer, nullable=True)
+    reference_id = Column(Integer, nullable=True)
+    note = Column(Text, nullable=True)
+    # clock_timestamp(), not now(): rows of a user are inserted while their
+    # user_finances row is locked, so this follows the order they were applied in.
+    # In UTC like every other timestamp (see base_class.utc_now)
+    created_at = Column(DateTime, nullable=False, server_default=text("timezone('utc', clock_timestamp())"))
+
+    __table_args__ = (
+        Index("ix_finance_transactions_user_id_created_at", "user_id", "created_at", "id"),
+    )
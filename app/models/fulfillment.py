@@ -1,9 +1,7 @@
-from datetime import datetime, UTC
-
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 
-from app.db.base_class import Base
+from app.db.base_class import Base, utc_now
 
 
 class Fulfillment(Base):
@@ -17,7 +15,7 @@ class Fulfillment(Base):
     consignment_id = Column(Integer(), ForeignKey("consignments.id"), nullable=False)
     consignment = relationship("Consignment", back_populates="fulfillments")
 
-    shipment_id = Column(Integer(), ForeignKey("shipments.id"), nullable=False)
+    shipment_id = Column(Integer(), ForeignKey("shipments.id"), nullable=False, index=True)
     shipment = relationship("Shipment", back_populates="fulfillment")
 
     customer_name = Column(String(255), nullable=False)
@@ -26,9 +24,16 @@ class Fulfillment(Base):
 
     status = Column(Integer(), nullable=False)
     shipping_type = Column(Integer(), nullable=False)
-    created_at = Column(DateTime, index=True, default=datetime.now(UTC))
+    created_at = Column(DateTime, nullable=False, server_default=utc_now)
     updated_at = Column(
         DateTime,
-        default=datetime.now(UTC),
-        onupdate=datetime.now(UTC),
+        nullable=False,
+        server_default=utc_now,
+        onupdate=utc_now,
+    )
+
+    __table_args__ = (
+        Index("ix_fulfillments_user_id_status", "user_id", "status"),
+        # Sort key of keyset pages, id breaking ties
+        Index("ix_fulfillments_created_at_id", "created_at", "id"),
     )
@@ -1,9 +1,7 @@
-from datetime import datetime, UTC
-
-from sqlalchemy import Column, UUID, ForeignKey, String, Integer, DateTime, Float, Boolean, Text
+from sqlalchemy import Column, UUID, ForeignKey, String, Integer, DateTime, Float, Boolean, Text, Index
 from sqlalchemy.orm import relationship
 
-from app.db.base_class import Base
+from app.db.base_class import Base, utc_now
 
 
 class Shipment(Base):
@@ -33,7 +31,7 @@ class Shipment(Base):
     finance_status = Column(Integer(), nullable=False, default=0)
 
     note = Column(Text(), nullable=True)
-    code = Column(String(128), index=True, nullable=False, default="")
+    code = Column(String(128), nullable=False, default="")
 
     domestic_shipping_fee = Column(Float(), nullable=False, default=0.0)
 
@@ -47,12 +45,23 @@ class Shipment(Base):
     wide_packaged = Column(Float(), default=0.0, nullable=False)
     length_packaged = Column(Float(), default=0.0, nullable=False)
 
-    created_at = Column(DateTime, index=True, default=datetime.now(UTC))
+    created_at = Column(DateTime, nullable=False, server_default=utc_now)
     updated_at = Column(
         DateTime,
-        default=datetime.now(UTC),
-        onupdate=datetime.now(UTC),
+        nullable=False,
+        server_default=utc_now,
+        onupdate=utc_now,
     )
 
     # Relationships
-    fulfillment = relationship("Fulfillment", back_populates="shipment")
\ No newline at end of file
+    fulfillment = relationship("Fulfillment", back_populates="shipment")
+
+    __table_args__ = (
+        # Customer lists filtered by status, newest first
+        Index("ix_shipments_user_id_shipment_status_id", "user_id", "shipment_status", "id"),
+        Index("ix_shipments_consignment_id_id", "consignment_id", "id"),
+        Index("ix_shipments_user_id_created_at", "user_id", "created_at"),
+        # Sort keys of keyset pages, id breaking ties
+        Index("ix_shipments_code_id", "code", "id"),
+        Index("ix_shipments_created_at_id", "created_at", "id"),
+    )
\ No newline at end of file
@@ -1,9 +1,8 @@
-from datetime import datetime, UTC
 from sqlalchemy import Column, String, Boolean, DateTime, Integer, Float
 from sqlalchemy.orm import relationship
 
 from app.constants.store import StoreType
-from app.db.base_class import Base
+from app.db.base_class import Base, utc_now
 
 
 class Store(Base):
@@ -20,11 +19,12 @@ class Store(Base):
     code = Column(String(255), unique=True, nullable=True)
     base_fee = Column(Float, default=0.0, nullable=True)
 
-    created_at = Column(DateTime, default=datetime.now(UTC))
+    created_at = Column(DateTime, nullable=False, server_default=utc_now)
     updated_at = Column(
         DateTime,
-        default=datetime.now(UTC),
-        onupdate=datetime.now(UTC),
+        nullable=False,
+        server_default=utc_now,
+        onupdate=utc_now,
     )
 
     source_consignments = relationship(
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, DateTime, Integer, String
+
+from app.db.base_class import Base
+
+
+class UsedRefreshToken(Base):
+    """
+    Refresh tokens that were already exchanged. Rows are only needed until
+    the token expires, which keeps the table bounded.
+    """
+    __tablename__ = "used_refresh_tokens"
+
+    jti = Column(String(36), primary_key=True)
+    user_id = Column(Integer(), nullable=False, index=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -1,6 +1,5 @@
-from datetime import datetime, UTC
-from app.db.base_class import Base
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, String, Integer
+from app.db.base_class import Base, utc_now
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, String, Integer
 from sqlalchemy.orm import relationship
 
 
@@ -10,18 +9,21 @@ class User(Base):
     """
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    full_name = Column(String(255), index=True)
+    full_name = Column(String(255))
     user_code = Column(String(255), unique=True, index=True, nullable=False)
     email = Column(String(100), unique=True, index=True, nullable=False)
     phone_number = Column(String(13), unique=True, index=True, nullable=True)
     hashed_password = Column(String(255), nullable=False)
     is_active = Column(Boolean(), default=True)
     is_user_code_edited = Column(Boolean(), default=False, nullable=False)
-    created_at = Column(DateTime, default=datetime.now(UTC))
+    # Bumped to revoke every token issued before; tokens carry it as "ver"
+    token_version = Column(Integer(), default=0, server_default="0", nullable=False)
+    created_at = Column(DateTime, nullable=False, server_default=utc_now)
     updated_at = Column(
         DateTime,
-        default=datetime.now(UTC),
-        onupdate=datetime.now(UTC),
+        nullable=False,
+        server_default=utc_now,
+        onupdate=utc_now,
     )
 
     account_id = Column(
@@ -36,3 +38,9 @@ class User(Base):
     user_finance = relationship("UserFinance", back_populates="user", uselist=False)
     shipments = relationship("Shipment", back_populates="user")
     fulfillments = relationship("Fulfillment", back_populates="user")
+
+    __table_args__ = (
+        # Sort keys of keyset pages, id breaking ties
+        Index("ix_users_full_name_id", "full_name", "id"),
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
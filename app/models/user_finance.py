@@ -1,18 +1,17 @@
-from datetime import datetime, UTC
-
-from sqlalchemy import Column, Integer, ForeignKey, Float, DateTime
+from sqlalchemy import Column, Integer, ForeignKey, Numeric, DateTime
 from sqlalchemy.orm import relationship
 
-from app.db.base_class import Base
+from app.db.base_class import Base, utc_now
 
 
 class UserFinance(Base):
     __tablename__ = "user_finances"
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True, unique=True)
     user = relationship("User", back_populates="user_finance")
 
-    balance = Column(Float, nullable=False)
-    created_at = Column(DateTime, index=True, default=datetime.now(UTC))
-    updated_at = Column(DateTime, index=True, default=datetime.now(UTC), onupdate=datetime.now(UTC))
\ No newline at end of file
+    # Materialized from finance_transactions, updated in the same transaction as each ledger row
+    balance = Column(Numeric(18, 2), nullable=False)
+    created_at = Column(DateTime, index=True, nullable=False, server_default=utc_now)
+    updated_at = Column(DateTime, index=True, nullable=False, server_default=utc_now, onupdate=utc_now)
\ No newline at end of file
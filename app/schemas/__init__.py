@@ -1,16 +1,19 @@
 from .account import Account, AccountCreate, AccountInDB, AccountUpdate
 from .msg import Msg
 from .role import Role, RoleCreate, RoleInDB, RoleUpdate
-from .token import Token, TokenPayload
+from .token import Principal, Token, TokenPayload
 from .user import User, UserCreate, UserInDB, UserUpdate
 from .user_role import UserRole, UserRoleCreate, UserRoleInDB, UserRoleUpdate
 from .exchange import Exchange, ExchangeCreate, ExchangeInDB, ExchangeUpdate
 from .store import Store, StoreCreate, StoreInDB, StoreUpdate
-from .consignment import Consignment, ConsignmentCreate, ConsignmentInDB, ConsignmentUpdate
+from .consignment import Consignment, ConsignmentCreate, ConsignmentInDB, ConsignmentUpdate, \
+    ConsignmentImportResult, ConsignmentImportRowError
 from .product_category import ProductCategory, ProductCategoryCreate, ProductCategoryInDB, ProductCategoryUpdate
 from .deposit_bill import DepositBill, DepositBillCreate, DepositBillInDB, DepositBillUpdate
-from .shipment import Shipment, ShipmentCreate, ShipmentInDB, ShipmentUpdate
+from .shipment import Shipment, ShipmentCreate, ShipmentInDB, ShipmentUpdate, ShipmentScan, ShipmentScanResult, \
+    ShipmentStatusTransition, ShipmentStatusTransitionResult
 from .fulfillment import Fulfillment, FulfillmentCreate, FulfillmentInDB, FulfillmentUpdate
 from .change_log import ChangeLog, ChangeLogCreate, ChangeLogInDB
 from .user_address import UserAddress, UserAddressCreate, UserAddressInDB, UserAddressUpdate
-from .user_finance import UserFinance, UserFinanceCreate, UserFinanceInDB, UserFinanceUpdate
\ No newline at end of file
+from .user_finance import UserFinance, UserFinanceCreate, UserFinanceInDB, UserFinanceUpdate
+from .finance_transaction import FinanceStatement, FinanceTransaction, FinanceTransactionInDB
@@ -7,3 +7,7 @@ T = TypeVar("T")
 class Response(BaseModel, Generic[T]):
     message: str
     data: Optional[T] = None
+
+
+class PaginatedResponse(Response[T], Generic[T]):
+    next_cursor: Optional[str] = None
@@ -1,9 +1,10 @@
 from datetime import datetime
 from typing import List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, computed_field, field_validator
 
 from app.schemas.consignment_foreign_shipment_code import ConsignmentForeignShipmentCode
+from app.core.storage import get_storage
 
 
 class ConsignmentBase(BaseModel):
@@ -32,10 +33,24 @@ class ConsignmentBase(BaseModel):
     foreign_shipment_codes: List[str] = None
     image_base64: Optional[str] = None
 
-
-# Properties to receive via API on creation
+    @field_validator("foreign_shipment_codes")
+    @classmethod
+    def clean_foreign_shipment_codes(cls, codes: Optional[List[str]]) -> Optional[List[str]]:
+        # Codes are unique case-insensitively: drop blanks and repeated codes
+        if codes is None:
+            return codes
+        cleaned = {}
+        for code in codes:
+            code = code.strip()
+            if code:
+                cleaned.setdefault(code.upper(), code)
+        return list(cleaned.values())
+
+
+# Properties to receive via API on creation. Image paths are set by the
+# server only, from image_base64 or POST /consignments/{id}/image
 class ConsignmentCreate(ConsignmentBase):
-    image_path: Optional[str] = None
+    pass
 
 
 # Properties to receive via API on update
@@ -70,6 +85,8 @@ class ConsignmentInDBBase(BaseModel):
     product_name: Optional[str] = None
     code: str
     image_path: Optional[str] = None
+    image_thumbnail_path: Optional[str] = None
+    image_display_path: Optional[str] = None
 
     note: Optional[str] = None
 
@@ -81,9 +98,30 @@ class ConsignmentInDBBase(BaseModel):
 
 # Additional properties to return via API
 class Consignment(ConsignmentInDBBase):
-    pass
+    @computed_field
+    @property
+    def image_thumbnail_url(self) -> Optional[str]:
+        return get_storage().url(self.image_thumbnail_path) if self.image_thumbnail_path else None
+
+    @computed_field
+    @property
+    def image_display_url(self) -> Optional[str]:
+        path = self.image_display_path or self.image_path
+        return get_storage().url(path) if path else None
 
 
 # Additional properties stored in DB
 class ConsignmentInDB(ConsignmentInDBBase):
     pass
+
+
+class ConsignmentImportRowError(BaseModel):
+    row: int
+    errors: List[str]
+
+
+# Result of a bulk consignment import
+class ConsignmentImportResult(BaseModel):
+    total_rows: int = 0
+    created: int = 0
+    errors: List[ConsignmentImportRowError] = []
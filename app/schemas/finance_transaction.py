@@ -0,0 +1,44 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class FinanceTransactionBase(BaseModel):
+    user_id: int
+    transaction_type: int
+    amount: float
+    balance_after: float
+    reference_type: Optional[int] = None
+    reference_id: Optional[int] = None
+    note: Optional[str] = None
+
+
+class FinanceTransactionInDBBase(FinanceTransactionBase):
+    id: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+# Additional properties to return via API
+class FinanceTransaction(FinanceTransactionInDBBase):
+    pass
+
+
+# Additional properties stored in DB
+class FinanceTransactionInDB(FinanceTransactionInDBBase):
+    pass
+
+
+class FinanceStatement(BaseModel):
+    user_id: int
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    opening_balance: float
+    closing_balance: float
+    current_balance: float
+    transactions: List[FinanceTransaction]
+    # More transactions fall in the range than were returned; narrow it
+    truncated: bool = False
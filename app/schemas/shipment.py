@@ -1,7 +1,7 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app.schemas import Consignment
 
@@ -102,4 +102,45 @@ class Shipment(ShipmentInDBBase):
 
 # Additional properties stored in DB
 class ShipmentInDB(ShipmentInDBBase):
-    pass
\ No newline at end of file
+    pass
+
+
+# Warehouse receiving: look up a batch of scanned foreign shipment codes
+class ShipmentScan(BaseModel):
+    codes: List[str] = Field(min_length=1, max_length=1000)
+
+
+class ShipmentCustomer(BaseModel):
+    id: int
+    user_code: Optional[str] = None
+    full_name: Optional[str] = None
+    phone_number: Optional[str] = None
+    email: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class ScannedShipment(Shipment):
+    customer: ShipmentCustomer = Field(validation_alias="user")
+
+
+class ShipmentScanResult(BaseModel):
+    shipments: List[ScannedShipment] = []
+    not_found: List[str] = []
+
+
+# Bulk status change of many shipments
+class ShipmentStatusTransition(BaseModel):
+    ids: List[int] = Field(min_length=1, max_length=1000)
+    shipment_status: int
+
+
+class ShipmentTransitionReject(BaseModel):
+    id: int
+    reason: str
+
+
+class ShipmentStatusTransitionResult(BaseModel):
+    updated: List[int] = []
+    rejected: List[ShipmentTransitionReject] = []
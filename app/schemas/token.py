@@ -1,12 +1,31 @@
-from pydantic import BaseModel
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
 
 
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
 
 
 class TokenPayload(BaseModel):
     id: int
     role: str = None
     # account_id: int = None
+    iat: Optional[int] = None
+    exp: Optional[int] = None
+    ver: int = 0
+    typ: Optional[str] = None
+    jti: Optional[str] = None
+
+
+# The authenticated caller, as resolved by deps.get_current_principal
+class Principal(BaseModel):
+    id: int
+    role: Optional[str] = None
+    account_id: Optional[int] = None
+    is_active: bool = True
+    token_version: int = 0
+
+    model_config = ConfigDict(frozen=True)
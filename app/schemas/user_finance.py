@@ -12,8 +12,9 @@ class UserFinanceCreate(UserFinanceBase):
     pass
 
 
+# The balance is changed through crud.user_finance.credit/debit only
 class UserFinanceUpdate(BaseModel):
-    balance: float
+    pass
 
 
 class UserFinanceInDBBase(UserFinanceBase):
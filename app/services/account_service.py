@@ -21,10 +21,10 @@ def update_account_service(
         db: Session,
         account_id: int,
         account_in: schemas.AccountUpdate,
-        current_user: models.User,
+        current_user: schemas.Principal,
 ) -> schemas.Account:
     # Nếu user là account admin, chỉ được update chính account của họ
-    if current_user.user_role.role.name == Role.ACCOUNT_ADMIN["name"]:
+    if current_user.role == Role.ACCOUNT_ADMIN["name"]:
         if current_user.account_id != account_id:
             raise HTTPException(
                 status_code=401,
@@ -76,7 +76,7 @@ def get_users_for_account_service(
 
 def get_users_for_own_account_service(
     db: Session,
-    current_user: models.User,
+    current_user: schemas.Principal,
     skip: int = 0,
     limit: int = 100,
 ) -> List[models.User]:
@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta, UTC
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from jose import jwt
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app import crud, models, schemas
+from app.core import security
+from app.core.config import settings
+
+
+async def authenticate(db: Session, *, email: str, password: str) -> Optional[models.User]:
+    """
+    Async counterpart of crud.user.authenticate: bcrypt runs in the password
+    hash pool and only the short queries use the request threadpool. Hashes
+    made with outdated CryptContext settings are upgraded on the way.
+    """
+    user = await run_in_threadpool(crud.user.get_by_email, db, email=email)
+    if not user:
+        return None
+    valid, new_hash = await security.verify_and_update_password(password, user.hashed_password)
+    if not valid:
+        return None
+    if new_hash:
+        await run_in_threadpool(crud.user.set_password_hash, db, db_obj=user, hashed_password=new_hash)
+    return user
+
+
+async def login_access_token_service(db: Session, *, email: str, password: str) -> Dict[str, Any]:
+    user = await authenticate(db, email=email, password=password)
+    if not user:
+        raise HTTPException(
+            status_code=400, detail="Incorrect email or password"
+        )
+    elif not crud.user.is_active(user):
+        raise HTTPException(status_code=400, detail="Inactive user")
+    token_payload = await run_in_threadpool(_token_payload, user)
+    return _issue_tokens(token_payload)
+
+
+def refresh_access_token_service(db: Session, *, refresh_token: str) -> Dict[str, Any]:
+    """
+    Exchange a refresh token for a new access/refresh pair.
+
+    Costs one HMAC check, the (cached) principal lookup and one insert into
+    the used-token table; no bcrypt. Each refresh token works once: a replay
+    means it leaked, so every token of the user is revoked.
+    """
+    credentials_exception = HTTPException(
+        status_code=401,
+        detail="Could not validate refresh token",
+    )
+    try:
+        payload = jwt.decode(
+            refresh_token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
+        )
+        token_data = schemas.TokenPayload(**payload)
+    except (jwt.JWTError, ValidationError):
+        raise credentials_exception
+    if token_data.typ != security.REFRESH_TOKEN_TYPE or not token_data.jti:
+        raise credentials_exception
+
+    principal = crud.user.get_principal(db, id=token_data.id, issued_at=token_data.iat)
+    if not principal or principal.token_version != token_data.ver:
+        raise credentials_exception
+    if not principal.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+
+    expires_at = datetime.fromtimestamp(token_data.exp, UTC).replace(tzinfo=None)
+    if not crud.used_refresh_token.consume(db, jti=token_data.jti, user_id=principal.id, expires_at=expires_at):
+        crud.user.revoke_tokens(db, user_id=principal.id)
+        raise credentials_exception
+
+    return _issue_tokens({
+        "id": str(principal.id),
+        "role": token_data.role,
+        "account_id": str(principal.account_id),
+        "ver": principal.token_version,
+    })
+
+
+def _issue_tokens(token_payload: Dict[str, Any]) -> Dict[str, Any]:
+    access_token_expires = timedelta(
+        minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
+    )
+    return {
+        "access_token": security.create_access_token(
+            token_payload, expires_delta=access_token_expires
+        ),
+        "refresh_token": security.create_refresh_token(token_payload),
+        "token_type": "bearer",
+    }
+
+
+def _token_payload(user: models.User) -> Dict[str, Any]:
+    if not user.user_role:
+        role = "USER"
+    else:
+        role = user.user_role.role.name
+    return {
+        "id": str(user.id),
+        "role": role,
+        "account_id": str(user.account_id),
+        "ver": user.token_version,
+    }
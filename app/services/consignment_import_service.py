@@ -0,0 +1,274 @@
+import codecs
+import csv
+import io
+import re
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+from zipfile import BadZipFile
+
+from fastapi import HTTPException, UploadFile
+from openpyxl import Workbook, load_workbook
+from openpyxl.utils.exceptions import InvalidFileException
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app import crud, models, schemas
+from app.constants.role import Role
+from app.constants.shipment import ShipmentStatus, ShipmentFinanceStatus
+from app.schemas import ConsignmentCreate, ConsignmentImportResult, ConsignmentImportRowError, ShipmentCreate
+
+# Rows validated, resolved and inserted together in one transaction
+IMPORT_BATCH_SIZE = 500
+
+_CODES_SEPARATOR = re.compile(r"[;,\s]+")
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+def import_consignments_service(
+    db: Session,
+    upload: UploadFile,
+    current_user: schemas.Principal
+) -> ConsignmentImportResult:
+    """
+    Import consignments from a CSV/XLSX upload, one consignment per row and
+    columns named after the ConsignmentCreate fields.
+
+    Rows are streamed from the spooled upload and written in batches, so
+    memory stays bounded by IMPORT_BATCH_SIZE. Rows that fail validation or
+    reference unknown stores/addresses/categories are reported and skipped.
+    """
+    forced_user_id = None
+    if current_user.role == Role.USER["name"]:
+        forced_user_id = current_user.id
+
+    result = ConsignmentImportResult()
+    batch: List[Tuple[int, ConsignmentCreate]] = []
+    for row_number, raw in _read_rows(upload):
+        result.total_rows += 1
+        try:
+            consignment_in = _parse_row(raw, forced_user_id)
+        except ValidationError as e:
+            result.errors.append(ConsignmentImportRowError(row=row_number, errors=_format_errors(e)))
+            continue
+
+        batch.append((row_number, consignment_in))
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            _import_batch(db, batch, result)
+            batch = []
+
+    if batch:
+        _import_batch(db, batch, result)
+
+    result.errors.sort(key=lambda error: error.row)
+    return result
+
+
+def _read_rows(upload: UploadFile) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    filename = (upload.filename or "").lower()
+    # The file is checked before the first batch is written, so a bad file never leaves a partial import
+    if filename.endswith(".csv") or upload.content_type == "text/csv":
+        _check_utf8(upload.file)
+        return _read_csv(upload.file)
+    if filename.endswith(".xlsx"):
+        try:
+            workbook = load_workbook(upload.file, read_only=True, data_only=True)
+        except (BadZipFile, InvalidFileException, KeyError):
+            raise HTTPException(status_code=400, detail="File is not a valid XLSX.")
+        return _read_xlsx(workbook)
+    raise HTTPException(
+        status_code=400,
+        detail="Only .csv and .xlsx files can be imported."
+    )
+
+
+def _check_utf8(file: BinaryIO) -> None:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    try:
+        while chunk := file.read(_CHUNK_SIZE):
+            decoder.decode(chunk)
+        decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="File is not a valid CSV: it must be UTF-8 encoded.")
+    finally:
+        file.seek(0)
+
+
+def _read_csv(file: BinaryIO) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    reader = csv.DictReader(io.TextIOWrapper(file, encoding="utf-8-sig", newline=""))
+    # Row 1 is the header, as in a spreadsheet
+    for row_number, row in enumerate(reader, start=2):
+        yield row_number, row
+
+
+def _read_xlsx(workbook: Workbook) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        keys = ["" if key is None else str(key) for key in header]
+        for row_number, values in enumerate(rows, start=2):
+            if all(value is None for value in values):
+                continue
+            yield row_number, dict(zip(keys, values))
+    finally:
+        workbook.close()
+
+
+def _parse_row(raw: Dict[str, Any], forced_user_id: Optional[int]) -> ConsignmentCreate:
+    data = {}
+    for key, value in raw.items():
+        if not key:
+            continue
+        if isinstance(value, str):
+            value = value.strip()
+        if value is None or value == "":
+            continue
+        data[key.strip()] = value
+
+    codes = data.get("foreign_shipment_codes")
+    if codes is not None:
+        data["foreign_shipment_codes"] = [code for code in _CODES_SEPARATOR.split(str(codes)) if code]
+    # Images are not imported in bulk
+    data.pop("image_base64", None)
+
+    if forced_user_id is not None:
+        data["user_id"] = forced_user_id
+    return ConsignmentCreate(**data)
+
+
+def _format_errors(error: ValidationError) -> List[str]:
+    return [
+        f"{'.'.join(str(loc) for loc in item['loc'])}: {item['msg']}"
+        for item in error.errors()
+    ]
+
+
+def _import_batch(
+    db: Session,
+    batch: List[Tuple[int, ConsignmentCreate]],
+    result: ConsignmentImportResult
+) -> None:
+    # One IN query per referenced table for the whole batch
+    stores = crud.store.get_by_ids(
+        db, ids=[c.source_store_id for _, c in batch] + [c.dest_store_id for _, c in batch]
+    )
+    user_addresses = crud.user_address.get_by_ids(db, ids=[c.user_address_id for _, c in batch])
+    product_categories = crud.product_category.get_by_ids(
+        db, ids=[c.product_category_id for _, c in batch if c.product_category_id]
+    )
+
+    # Codes already used, in the database or by an earlier row of the file
+    used_codes = {
+        code.upper() for code in crud.consignment.get_taken_foreign_shipment_codes(
+            db, codes=[code for _, c in batch for code in c.foreign_shipment_codes or []]
+        )
+    }
+
+    valid: List[Tuple[int, ConsignmentCreate]] = []
+    for row_number, consignment_in in batch:
+        errors = _check_references(consignment_in, stores, user_addresses, product_categories)
+        codes = consignment_in.foreign_shipment_codes or []
+        errors += [f"Foreign shipment code {code} is already used." for code in codes if code.upper() in used_codes]
+        used_codes.update(code.upper() for code in codes)
+        if errors:
+            result.errors.append(ConsignmentImportRowError(row=row_number, errors=errors))
+        else:
+            valid.append((row_number, consignment_in))
+
+    if not valid:
+        return
+
+    numbers = crud.consignment.next_code_numbers(db, count=len(valid))
+    rows = [(row_number, consignment_in, number) for (row_number, consignment_in), number in zip(valid, numbers)]
+    try:
+        _insert_rows(db, rows, stores)
+        db.commit()
+        result.created += len(rows)
+        return
+    except SQLAlchemyError:
+        db.rollback()
+
+    # A row the checks above could not catch failed the batch: save the rows one by one
+    # so that only the failing ones are reported, each keeping its reserved number
+    for row in rows:
+        try:
+            _insert_rows(db, [row], stores)
+            db.commit()
+            result.created += 1
+        except SQLAlchemyError as e:
+            db.rollback()
+            result.errors.append(ConsignmentImportRowError(
+                row=row[0], errors=[f"Could not be saved: {_describe_db_error(e)}"]
+            ))
+
+
+def _insert_rows(
+    db: Session,
+    rows: List[Tuple[int, ConsignmentCreate, int]],
+    stores: Dict[int, models.Store]
+) -> None:
+    consignments = crud.consignment.create_multi(db, objs_in=[
+        {
+            **consignment_in.model_dump(),
+            "code": crud.consignment.generate_code(
+                stores[consignment_in.source_store_id],
+                stores[consignment_in.dest_store_id],
+                consignment_in.user_id,
+                number,
+            ),
+        }
+        for _, consignment_in, number in rows
+    ], commit=False)
+
+    crud.consignment.add_foreign_shipment_codes(db, codes_by_consignment={
+        consignment.id: consignment_in.foreign_shipment_codes
+        for consignment, (_, consignment_in, _) in zip(consignments, rows)
+        if consignment_in.foreign_shipment_codes
+    })
+
+    crud.shipment.create_multi(db, objs_in=[
+        ShipmentCreate(
+            consignment_id=consignment.id,
+            shipment_status=ShipmentStatus.FOREIGN_SHIPPING.value,
+            finance_status=ShipmentFinanceStatus.NOT_APPROVED.value,
+            code=code,
+            user_id=consignment.user_id
+        )
+        for consignment, (_, consignment_in, _) in zip(consignments, rows)
+        for code in consignment_in.foreign_shipment_codes or []
+    ], commit=False)
+
+
+def _describe_db_error(error: SQLAlchemyError) -> str:
+    # psycopg2 exposes the server's message, e.g. "Key (code)=(...) already exists."
+    diag = getattr(getattr(error, "orig", None), "diag", None)
+    message = diag and (diag.message_detail or diag.message_primary)
+    return message or error.__class__.__name__
+
+
+def _check_references(
+    consignment_in: ConsignmentCreate,
+    stores: Dict[int, models.Store],
+    user_addresses: Dict[int, models.UserAddress],
+    product_categories: Dict[int, models.ProductCategory]
+) -> List[str]:
+    errors = []
+    if consignment_in.source_store_id not in stores:
+        errors.append(f"Store with id {consignment_in.source_store_id} does not exist.")
+    if consignment_in.dest_store_id not in stores:
+        errors.append(f"Store with id {consignment_in.dest_store_id} does not exist.")
+
+    user_address = user_addresses.get(consignment_in.user_address_id)
+    if not user_address:
+        errors.append(f"User address with id {consignment_in.user_address_id} does not exist.")
+    elif user_address.user_id != consignment_in.user_id:
+        errors.append(
+            f"User address with id {consignment_in.user_address_id} does not belong to user "
+            f"with id {consignment_in.user_id}."
+        )
+
+    if consignment_in.product_category_id and consignment_in.product_category_id not in product_categories:
+        errors.append(f"Product category with id {consignment_in.product_category_id} does not exist.")
+    return errors
@@ -1,74 +1,77 @@
 import base64
-import os
-import uuid
-from datetime import datetime, UTC
+import binascii
+import io
+from typing import List, Optional
 
-from fastapi import HTTPException
+from fastapi import HTTPException, UploadFile
 from sqlalchemy.orm import Session
 
 from app import crud, schemas, models
 from app.constants.role import Role
 from app.constants.shipment import ShipmentStatus, ShipmentFinanceStatus
-from app.models import User
-from app.schemas import ConsignmentCreate, ShipmentCreate, ShipmentUpdate
+from app.schemas import ConsignmentCreate, ShipmentCreate
+from app.services.upload_service import save_consignment_image
 
 
 def create_consignment_with_shipments(
     db: Session,
     consignment_in: ConsignmentCreate,
-    current_user: User
+    current_user: schemas.Principal
 ):
     # Gán user_id nếu là người dùng thường
-    if current_user.user_role.role.name == Role.USER["name"]:
+    if current_user.role == Role.USER["name"]:
         consignment_in.user_id = current_user.id
 
-    # Xử lý ảnh nếu có
+    # Xử lý ảnh nếu có (legacy: nên dùng POST /consignments/{id}/image)
+    image = None
     if consignment_in.image_base64:
         try:
             header, base64_data = consignment_in.image_base64.split(",", 1)
         except ValueError:
             base64_data = consignment_in.image_base64
 
-        image_data = base64.b64decode(base64_data)
-
-        today = datetime.now(UTC)
-        upload_subdir = os.path.join(
-            "uploads", "consignments",
-            str(today.year), f"{today.month:02}", f"{today.day:02}"
-        )
-        os.makedirs(upload_subdir, exist_ok=True)
+        try:
+            image_data = base64.b64decode(base64_data)
+        except binascii.Error:
+            raise HTTPException(status_code=422, detail="image_base64 is not valid base64.")
 
-        image_filename = f"{uuid.uuid4()}.jpg"
-        image_path = os.path.join(upload_subdir, image_filename)
+        image = save_consignment_image(io.BytesIO(image_data))
 
-        with open(image_path, "wb") as f:
-            f.write(image_data)
+    _check_foreign_shipment_codes(db, consignment_in.foreign_shipment_codes)
 
-        consignment_in.image_path = image_path
+    # Tạo consignment và các foreign shipments trong cùng một transaction
+    try:
+        consignment = crud.consignment.create(db, obj_in=consignment_in, commit=False)
+        if image:
+            crud.consignment.set_image(
+                db, db_obj=consignment, image_path=image.key, thumbnail_path=image.thumbnail_key,
+                display_path=image.display_key, commit=False
+            )
 
-    # Tạo consignment
-    consignment = crud.consignment.create(db, obj_in=consignment_in)
+        if consignment_in.foreign_shipment_codes:
+            crud.shipment.create_multi(db, objs_in=[
+                ShipmentCreate(
+                    consignment_id=consignment.id,
+                    shipment_status=ShipmentStatus.FOREIGN_SHIPPING.value,
+                    finance_status=ShipmentFinanceStatus.NOT_APPROVED.value,
+                    code=code,
+                    user_id=consignment.user_id
+                )
+                for code in consignment_in.foreign_shipment_codes
+            ], commit=False)
 
-    # Tạo các foreign shipments nếu có
-    if consignment_in.foreign_shipment_codes:
-        for code in consignment_in.foreign_shipment_codes:
-            shipment_in = ShipmentCreate(
-                consignment_id=consignment.id,
-                shipment_status=ShipmentStatus.FOREIGN_SHIPPING.value,
-                finance_status=ShipmentFinanceStatus.NOT_APPROVED.value,
-                code=code,
-                user_id = consignment.user_id
-            )
-            crud.shipment.create(db, obj_in=shipment_in)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
 
-    consignment.image_path = consignment_in.image_path  # Gán lại path ảnh
     return consignment
 
 def update_consignment_with_shipments(
     db: Session,
     consignment_id: int,
     consignment_in: schemas.ConsignmentUpdate,
-    current_user: models.User,
+    current_user: schemas.Principal,
 ) -> models.Consignment:
     consignment = crud.consignment.get(db, id=consignment_id)
     if not consignment:
@@ -77,58 +80,125 @@ def update_consignment_with_shipments(
             detail="The consignment does not exist in the system."
         )
 
-    if current_user.user_role == Role.USER and consignment.user_id != current_user.id:
+    if current_user.role == Role.USER["name"] and consignment.user_id != current_user.id:
         raise HTTPException(
             status_code=403,
             detail="You do not have permission to perform this action."
         )
 
-    if consignment_in.foreign_shipment_codes:
-        if not crud.shipment.remove_by_consignment_id(db, consignment_id=consignment.id):
+    _check_foreign_shipment_codes(db, consignment_in.foreign_shipment_codes, consignment_id=consignment.id)
+
+    # Consignment, mã vận đơn và shipments được ghi trong cùng một transaction
+    try:
+        consignment = crud.consignment.update(
+            db, db_obj=consignment, obj_in=consignment_in, current_user_id=current_user.id, commit=False
+        )
+        if consignment_in.foreign_shipment_codes is not None:
+            _sync_shipments(db, consignment, consignment_in, current_user)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return consignment
+
+
+def _sync_shipments(
+    db: Session,
+    consignment: models.Consignment,
+    consignment_in: schemas.ConsignmentUpdate,
+    current_user: schemas.Principal
+) -> None:
+    """
+    Apply the set difference between the stored and the submitted foreign
+    shipment codes: shipments of removed codes are deleted, new codes get a
+    shipment, and retained shipments keep their id, status and history.
+    """
+    added, removed, retained = crud.consignment.sync_foreign_shipment_codes(
+        db, consignment_id=consignment.id, codes=consignment_in.foreign_shipment_codes
+    )
+
+    if removed:
+        in_progress = [
+            shipment.code
+            for shipment in crud.shipment.get_multi(
+                db, limit=len(removed), filters={"consignment_id": consignment.id, "codes": removed}
+            )
+            if shipment.shipment_status != ShipmentStatus.FOREIGN_SHIPPING.value
+        ]
+        if in_progress:
             raise HTTPException(
                 status_code=400,
-                detail="Failed to remove existing foreign shipment codes."
+                detail=f"Shipments already received can not be removed: {', '.join(in_progress)}."
             )
+        crud.shipment.remove_by_codes(db, consignment_id=consignment.id, codes=removed, commit=False)
+
+    dimensions = {
+        "weight": consignment_in.weight,
+        "height": consignment_in.height,
+        "wide": consignment_in.wide,
+        "length": consignment_in.length,
+        "weight_packaged": consignment_in.weight_packaged,
+        "height_packaged": consignment_in.height_packaged,
+        "wide_packaged": consignment_in.wide_packaged,
+        "length_packaged": consignment_in.length_packaged,
+    }
+    crud.shipment.update_by_codes(
+        db, consignment_id=consignment.id, codes=retained, values=dimensions,
+        current_user_id=current_user.id, commit=False
+    )
+
+    crud.shipment.create_multi(db, objs_in=[
+        ShipmentCreate(
+            consignment_id=consignment.id,
+            shipment_status=ShipmentStatus.FOREIGN_SHIPPING.value,
+            finance_status=ShipmentFinanceStatus.NOT_APPROVED.value,
+            code=code,
+            user_id=consignment.user_id,
+            domestic_shipping_fee=consignment_in.domestic_shipping_fee,
+            **dimensions,
+        )
+        for code in added
+    ], commit=False)
+
+
+def _check_foreign_shipment_codes(
+    db: Session,
+    codes: Optional[List[str]],
+    consignment_id: Optional[int] = None
+) -> None:
+    taken = crud.consignment.get_taken_foreign_shipment_codes(
+        db, codes=codes or [], exclude_consignment_id=consignment_id
+    )
+    if taken:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Foreign shipment codes already used by another consignment: {', '.join(taken)}."
+        )
 
-    consignment = crud.consignment.update(db, db_obj=consignment, obj_in=consignment_in)
 
-    if consignment_in.foreign_shipment_codes:
-        db_shipments = crud.shipment.get_multi(
-            db, limit=1000, filters={"consignment_id": consignment.id}
+def upload_consignment_image(
+    db: Session,
+    consignment_id: int,
+    upload: UploadFile,
+    current_user: schemas.Principal,
+) -> models.Consignment:
+    consignment = crud.consignment.get(db, id=consignment_id)
+    if not consignment:
+        raise HTTPException(
+            status_code=404,
+            detail="The consignment does not exist in the system."
+        )
+
+    if current_user.role == Role.USER["name"] and consignment.user_id != current_user.id:
+        raise HTTPException(
+            status_code=403,
+            detail="You do not have permission to perform this action."
         )
 
-        for code in consignment_in.foreign_shipment_codes:
-            db_shipment = next((s for s in db_shipments if s.code == code), None)
-            if not db_shipment:
-                shipment_in = ShipmentCreate(
-                    consignment_id=consignment.id,
-                    shipment_status=ShipmentStatus.FOREIGN_SHIPPING.value,
-                    finance_status=ShipmentFinanceStatus.NOT_APPROVED.value,
-                    code=code,
-                    weight=consignment_in.weight,
-                    height=consignment_in.height,
-                    wide=consignment_in.wide,
-                    length=consignment_in.length,
-                    weight_packaged=consignment_in.weight_packaged,
-                    height_packaged=consignment_in.height_packaged,
-                    wide_packaged=consignment_in.wide_packaged,
-                    length_packaged=consignment_in.length_packaged,
-                    domestic_shipping_fee=consignment_in.domestic_shipping_fee,
-                )
-                crud.shipment.create(db, obj_in=shipment_in)
-            else:
-                shipment_in = ShipmentUpdate(
-                    shipment_status=db_shipment.shipment_status,
-                    finance_status=db_shipment.finance_status,
-                    weight=consignment_in.weight,
-                    height=consignment_in.height,
-                    wide=consignment_in.wide,
-                    length=consignment_in.length,
-                    weight_packaged=consignment_in.weight_packaged,
-                    height_packaged=consignment_in.height_packaged,
-                    wide_packaged=consignment_in.wide_packaged,
-                    length_packaged=consignment_in.length_packaged,
-                )
-                crud.shipment.update(db, db_obj=db_shipment, obj_in=shipment_in)
+    image = save_consignment_image(upload.file)
 
-    return consignment
\ No newline at end of file
+    return crud.consignment.set_image(
+        db, db_obj=consignment, image_path=image.key, thumbnail_path=image.thumbnail_key,
+        display_path=image.display_key
+    )
@@ -2,17 +2,19 @@ from fastapi import HTTPException
 from sqlalchemy.orm import Session
 
 from app import schemas, models, crud
+from app.constants.change_log import ObjectType
 from app.constants.deposit import DepositStatus
-from app.schemas import UserFinanceCreate, UserFinanceUpdate
+from app.constants.finance import FinanceTransactionType
 
 
 def update_deposit_bill_service(
     db: Session,
     deposit_bill_id: int,
     deposit_bill_in: schemas.DepositBillUpdate,
-    current_user: models.User
+    current_user: schemas.Principal
 ) -> models.DepositBill:
-    deposit_bill = crud.deposit_bill.get(db, id=deposit_bill_id)
+    # Locked so that a bill can't be approved (and credited) twice concurrently
+    deposit_bill = crud.deposit_bill.get_for_update(db, id=deposit_bill_id)
     if not deposit_bill:
         raise HTTPException(
             status_code=404,
@@ -25,28 +27,31 @@ def update_deposit_bill_service(
             detail="The deposit bill has already been processed.",
         )
 
-    deposit_bill = crud.deposit_bill.update(
-        db,
-        db_obj=deposit_bill,
-        obj_in=deposit_bill_in,
-        current_user_id=current_user.id,
-    )
-
-    # Nếu được duyệt, cập nhật user finance
-    if deposit_bill.status == DepositStatus.APPROVED.value:
-        user_finance = crud.user_finance.get_by_user_id(db, user_id=deposit_bill.user_id)
-        if not user_finance:
-            crud.user_finance.create(db, obj_in=UserFinanceCreate(
-                user_id=deposit_bill.user_id,
-                balance=deposit_bill.amount
-            ))
-        else:
-            new_amount = (user_finance.balance or 0) + deposit_bill.amount
-            crud.user_finance.update(
+    try:
+        deposit_bill = crud.deposit_bill.update(
+            db,
+            db_obj=deposit_bill,
+            obj_in=deposit_bill_in,
+            current_user_id=current_user.id,
+            commit=False,
+        )
+
+        # Nếu được duyệt, cộng tiền vào user finance trong cùng transaction
+        if deposit_bill.status == DepositStatus.APPROVED.value:
+            crud.user_finance.credit(
                 db,
-                db_obj=user_finance,
-                obj_in=UserFinanceUpdate(balance=new_amount),
-                current_user_id=current_user.id
+                user_id=deposit_bill.user_id,
+                amount=deposit_bill.amount,
+                transaction_type=FinanceTransactionType.DEPOSIT,
+                reference_type=ObjectType.DEPOSIT_BILL,
+                reference_id=deposit_bill.id,
+                commit=False,
             )
 
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    db.refresh(deposit_bill)
     return deposit_bill
\ No newline at end of file
@@ -23,7 +23,7 @@ def update_exchange_service(
     db: Session,
     exchange_id: int,
     exchange_in: schemas.ExchangeUpdate,
-    # current_user_id: int
+    current_user_id: int
 ) -> models.Exchange:
     exchange = crud.exchange.get(db, exchange_id)
     if not exchange:
@@ -33,6 +33,6 @@ def update_exchange_service(
         )
 
     updated_exchange = crud.exchange.update(
-        db, db_obj=exchange, obj_in=exchange_in, current_user_id=None
+        db, db_obj=exchange, obj_in=exchange_in, current_user_id=current_user_id
     )
     return updated_exchange
\ No newline at end of file
@@ -23,7 +23,8 @@ def update_fulfillment_service(
     fulfillment = crud.fulfillment.update(
         db=db,
         db_obj=fulfillment,
-        obj_in=update_data
+        obj_in=update_data,
+        current_user_id=updated_by
     )
 
     fulfillment.consignment = crud.consignment.get(db, id=fulfillment.consignment_id)
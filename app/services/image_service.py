@@ -0,0 +1,84 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from fastapi import HTTPException
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from app.core.config import settings
+
+THUMBNAIL_SIZE = (320, 320)
+THUMBNAIL_QUALITY = 75
+DISPLAY_SIZE = (1600, 1600)
+DISPLAY_QUALITY = 82
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Forking a process that runs the event loop and DB connection pools copies
+            # their threads' locks and sockets into the children; start clean ones instead
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.IMAGE_PROCESS_WORKERS,
+                mp_context=multiprocessing.get_context(method),
+            )
+        return _pool
+
+
+def _discard_pool(broken: ProcessPoolExecutor) -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is broken:
+            _pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_image_pool() -> None:
+    """Stop the image worker processes. Called when the app shuts down."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def create_image_variants(source_path: str, thumbnail_path: str, display_path: str) -> None:
+    """
+    Write the JPEG thumbnail and display variants of the image at
+    `source_path` to the given paths.
+
+    Decoding and re-encoding are CPU bound, so the work runs in a process
+    pool; the calling worker thread only waits for the result.
+    """
+    try:
+        try:
+            pool = _get_pool()
+            pool.submit(_write_variants, source_path, thumbnail_path, display_path).result()
+        except BrokenProcessPool:
+            # A worker died (OOM killer, segfault in a decoder): the pool is unusable from now on
+            _discard_pool(pool)
+            _get_pool().submit(_write_variants, source_path, thumbnail_path, display_path).result()
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError):
+        raise HTTPException(status_code=422, detail="The file is not a valid image.")
+
+
+def _write_variants(source_path: str, thumbnail_path: str, display_path: str) -> None:
+    with Image.open(source_path) as image:
+        # Let the JPEG decoder downscale while decoding instead of at full camera resolution
+        image.draft("RGB", DISPLAY_SIZE)
+        image = ImageOps.exif_transpose(image)
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+
+        image.thumbnail(DISPLAY_SIZE)
+        image.save(display_path, "JPEG", quality=DISPLAY_QUALITY, optimize=True, progressive=True)
+
+        image.thumbnail(THUMBNAIL_SIZE)
+        image.save(thumbnail_path, "JPEG", quality=THUMBNAIL_QUALITY, optimize=True, progressive=True)
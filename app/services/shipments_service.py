@@ -2,17 +2,20 @@ from fastapi import HTTPException
 from sqlalchemy.orm import Session
 
 from app import models, schemas, crud
+from app.constants.change_log import ObjectType
+from app.constants.finance import FinanceTransactionType
 from app.constants.fulfillment import FulfillmentStatus, FulfillmentShippingType
-from app.constants.shipment import ShipmentStatus
+from app.constants.shipment import SHIPMENT_STATUS_SOURCES, ShipmentStatus
 
 
 def update_shipment_service(
     db: Session,
     shipment_id: int,
     shipment_in: schemas.ShipmentUpdate,
-    current_user: models.User
+    current_user: schemas.Principal
 ) -> models.Shipment:
-    db_shipment = crud.shipment.get(db, id=shipment_id)
+    # Locked so that concurrent requests can't both apply the same status transition
+    db_shipment = crud.shipment.get_for_update(db, id=shipment_id)
     if not db_shipment:
         raise HTTPException(
             status_code=404,
@@ -42,14 +45,22 @@ def update_shipment_service(
             detail="The consignment of this shipment does not exist in the system."
         )
 
-    # Check fulfillment creation logic
-    if (db_shipment.shipment_status == ShipmentStatus.VN_RECEIVED.value and
-            shipment_in.shipment_status == ShipmentStatus.VN_SHIPMENT_REQUESTED.value):
-        _create_fulfillment_if_possible(db, db_shipment, db_consignment)
+    # Phí, fulfillment và shipment được ghi trong cùng một transaction
+    try:
+        # Check fulfillment creation logic
+        if (db_shipment.shipment_status == ShipmentStatus.VN_RECEIVED.value and
+                shipment_in.shipment_status == ShipmentStatus.VN_SHIPMENT_REQUESTED.value):
+            _create_fulfillment_if_possible(db, db_shipment, db_consignment)
 
-    shipment = crud.shipment.update(
-        db, db_obj=db_shipment, obj_in=shipment_in, current_user_id=current_user.id
-    )
+        shipment = crud.shipment.update(
+            db, db_obj=db_shipment, obj_in=shipment_in, current_user_id=current_user.id, commit=False
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    db.refresh(shipment)
     shipment.consignment = crud.consignment.get(db, id=shipment.consignment_id)
 
     return shipment
@@ -68,13 +79,6 @@ def _create_fulfillment_if_possible(db: Session, shipment: models.Shipment, cons
             detail="The store's base fee is not valid."
         )
 
-    user_finance = crud.user_finance.get_by_user_id(db, user_id=consignment.user_id)
-    if not user_finance:
-        raise HTTPException(
-            status_code=404,
-            detail="User finance does not exist in the system."
-        )
-
     shipping_fee = (
         store.base_fee * shipment.weight +
         shipment.wooden_packaging_required_fee +
@@ -82,12 +86,6 @@ def _create_fulfillment_if_possible(db: Session, shipment: models.Shipment, cons
         shipment.domestic_shipping_fee
     )
 
-    if user_finance.balance < shipping_fee:
-        raise HTTPException(
-            status_code=400,
-            detail="Not enough balance to create fulfillment."
-        )
-
     user_address = crud.user_address.get(db, id=consignment.user_address_id)
     if not user_address:
         raise HTTPException(
@@ -105,9 +103,100 @@ def _create_fulfillment_if_possible(db: Session, shipment: models.Shipment, cons
         shipping_type=FulfillmentShippingType.BUS_SHIPMENT.value,
         user_id=shipment.user_id
     )
-    crud.fulfillment.create(db, obj_in=fulfillment_in)
+    fulfillment = crud.fulfillment.create(db, obj_in=fulfillment_in, commit=False)
+
+    # Trừ phí ngay trong câu UPDATE, chỉ khi số dư đủ; commit cùng với fulfillment
+    new_balance = crud.user_finance.debit(
+        db,
+        user_id=consignment.user_id,
+        amount=shipping_fee,
+        transaction_type=FinanceTransactionType.FULFILLMENT_CHARGE,
+        reference_type=ObjectType.FULFILLMENT,
+        reference_id=fulfillment.id,
+        commit=False,
+    )
+    if new_balance is None:
+        if not crud.user_finance.get_by_user_id(db, user_id=consignment.user_id):
+            raise HTTPException(
+                status_code=404,
+                detail="User finance does not exist in the system."
+            )
+        raise HTTPException(
+            status_code=400,
+            detail="Not enough balance to create fulfillment."
+        )
 
-    # Update user finance
-    new_balance = user_finance.balance - shipping_fee
-    user_finance_in = schemas.UserFinanceUpdate(balance=new_balance)
-    crud.user_finance.update(db, db_obj=user_finance, obj_in=user_finance_in)
\ No newline at end of file
+
+def transition_shipments_service(
+    db: Session,
+    transition_in: schemas.ShipmentStatusTransition,
+    current_user: schemas.Principal
+) -> schemas.ShipmentStatusTransitionResult:
+    """
+    Move many shipments to one status, allowed only from the statuses that
+    lead to it in SHIPMENT_STATUS_TRANSITIONS. Shipments that can't be moved
+    are reported with the reason and left unchanged.
+    """
+    try:
+        to_status = ShipmentStatus(transition_in.shipment_status)
+    except ValueError:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown shipment status: {transition_in.shipment_status}."
+        )
+    if to_status == ShipmentStatus.VN_SHIPMENT_REQUESTED:
+        # Needs a fulfillment and a fee debit per shipment
+        raise HTTPException(
+            status_code=422,
+            detail="Shipments must be moved to this status one by one."
+        )
+    from_statuses = SHIPMENT_STATUS_SOURCES[to_status]
+    if not from_statuses:
+        raise HTTPException(
+            status_code=422,
+            detail="No shipment can be moved to this status."
+        )
+
+    ids = list(dict.fromkeys(transition_in.ids))
+    try:
+        updated = crud.shipment.transition_status(
+            db, ids=ids, to_status=to_status, from_statuses=from_statuses,
+            current_user_id=current_user.id, commit=False
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    rejected_ids = [shipment_id for shipment_id in ids if shipment_id not in updated]
+    shipments = crud.shipment.get_by_ids(db, ids=rejected_ids)
+    rejected = []
+    for shipment_id in rejected_ids:
+        shipment = shipments.get(shipment_id)
+        if not shipment:
+            reason = "The shipment does not exist in the system."
+        elif ShipmentStatus(shipment.shipment_status) not in from_statuses:
+            reason = f"Can not move from {ShipmentStatus(shipment.shipment_status).name} to {to_status.name}."
+        else:
+            reason = "The weight of the shipment must be greater than 0."
+        rejected.append({"id": shipment_id, "reason": reason})
+
+    return schemas.ShipmentStatusTransitionResult(
+        updated=[shipment_id for shipment_id in ids if shipment_id in updated],
+        rejected=rejected,
+    )
+
+
+def scan_shipments_service(db: Session, scan_in: schemas.ShipmentScan) -> schemas.ShipmentScanResult:
+    """
+    Resolve a batch of scanned foreign shipment codes in one round trip.
+    Codes matching no shipment are returned in `not_found`, in scan order.
+    """
+    codes = list(dict.fromkeys(code.strip() for code in scan_in.codes if code.strip()))
+    shipments = crud.shipment.get_by_foreign_codes(db, codes=codes)
+
+    found = {shipment.code.upper() for shipment in shipments}
+    return schemas.ShipmentScanResult.model_validate(
+        {"shipments": shipments, "not_found": [code for code in codes if code.upper() not in found]},
+        from_attributes=True,
+    )
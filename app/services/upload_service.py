@@ -0,0 +1,108 @@
+import hashlib
+import os
+import tempfile
+from typing import BinaryIO, NamedTuple, Tuple
+
+from fastapi import HTTPException
+from PIL import Image, UnidentifiedImageError
+
+from app.core.storage import get_storage
+from app.services.image_service import create_image_variants
+
+CHUNK_SIZE = 1024 * 1024
+MAX_IMAGE_SIZE = 20 * 1024 * 1024
+
+# Pillow format -> (extension, content type)
+IMAGE_FORMATS = {
+    "JPEG": ("jpg", "image/jpeg"),
+    "PNG": ("png", "image/png"),
+    "WEBP": ("webp", "image/webp"),
+}
+
+
+class StoredImage(NamedTuple):
+    key: str
+    thumbnail_key: str
+    display_key: str
+
+
+def save_consignment_image(file: BinaryIO) -> StoredImage:
+    """
+    Store a consignment image and its thumbnail/display variants, and return
+    their storage keys.
+
+    The image is spooled to a temporary file chunk by chunk while hashing, so
+    it is never held in memory as a whole. Keys are derived from the SHA-256
+    of the content: an image uploaded before is neither re-encoded nor stored
+    again. The extension comes from the decoded format, never from what the
+    client claims.
+    """
+    tmp_path, digest = _spool(file)
+    try:
+        extension, content_type = _image_format(tmp_path)
+        key = f"consignments/{digest[:2]}/{digest[2:4]}/{digest}.{extension}"
+        base = key.rsplit(".", 1)[0]
+        stored = StoredImage(key, f"{base}_thumb.jpg", f"{base}_display.jpg")
+
+        storage = get_storage()
+        if all(storage.exists(k) for k in stored):
+            return stored
+
+        thumbnail_path, display_path = f"{tmp_path}_thumb", f"{tmp_path}_display"
+        try:
+            create_image_variants(tmp_path, thumbnail_path, display_path)
+            for path, storage_key, content_type in (
+                (tmp_path, stored.key, content_type),
+                (thumbnail_path, stored.thumbnail_key, "image/jpeg"),
+                (display_path, stored.display_key, "image/jpeg"),
+            ):
+                with open(path, "rb") as f:
+                    storage.save(storage_key, f, content_type)
+        finally:
+            for path in (thumbnail_path, display_path):
+                if os.path.exists(path):
+                    os.remove(path)
+        return stored
+    finally:
+        os.remove(tmp_path)
+
+
+def _spool(file: BinaryIO) -> Tuple[str, str]:
+    digest = hashlib.sha256()
+    size = 0
+    with tempfile.NamedTemporaryFile(suffix=".part", delete=False) as tmp:
+        try:
+            while chunk := file.read(CHUNK_SIZE):
+                size += len(chunk)
+                if size > MAX_IMAGE_SIZE:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"The image must not exceed {MAX_IMAGE_SIZE // (1024 * 1024)} MB."
+                    )
+                digest.update(chunk)
+                tmp.write(chunk)
+        except BaseException:
+            tmp.close()
+            os.remove(tmp.name)
+            raise
+
+    if size == 0:
+        os.remove(tmp.name)
+        raise HTTPException(status_code=422, detail="The image is empty.")
+    return tmp.name, digest.hexdigest()
+
+
+def _image_format(path: str) -> Tuple[str, str]:
+    # Only reads the header; the full decode happens in the image process pool
+    try:
+        with Image.open(path) as image:
+            image_format = image.format
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError):
+        raise HTTPException(status_code=422, detail="The file is not a valid image.")
+
+    if image_format not in IMAGE_FORMATS:
+        raise HTTPException(
+            status_code=415,
+            detail=f"Unsupported image format: {image_format}. Allowed: {', '.join(IMAGE_FORMATS)}."
+        )
+    return IMAGE_FORMATS[image_format]
@@ -11,7 +11,7 @@ def update_user_address_service(
     db: Session,
     user_address_id: int,
     address_in: schemas.UserAddressUpdate,
-    current_user: models.User,
+    current_user: schemas.Principal,
     user_id: Optional[int] = None,
 ) -> models.UserAddress:
     final_user_id = get_user_id_from_role(current_user, user_id)
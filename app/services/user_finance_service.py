@@ -0,0 +1,63 @@
+from datetime import datetime
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app import crud, schemas
+from app.constants.role import Role
+
+
+def get_finance_statement_service(
+    db: Session,
+    user_id: Optional[int],
+    start: Optional[datetime],
+    end: Optional[datetime],
+    limit: int,
+    current_user: schemas.Principal
+) -> schemas.FinanceStatement:
+    """
+    Ledger transactions of a user with start <= created_at < end, with the
+    balances at both ends of the range.
+
+    The balances come from the `balance_after` snapshot of the last
+    transaction before each end, and the current balance from
+    `user_finances`, so no query sums the ledger.
+    """
+    if current_user.role == Role.USER["name"]:
+        user_id = current_user.id
+    elif user_id is None:
+        raise HTTPException(status_code=422, detail="user_id is required.")
+
+    if start and end and start >= end:
+        raise HTTPException(status_code=422, detail="start must be before end.")
+
+    user_finance = crud.user_finance.get_by_user_id(db, user_id=user_id)
+    if not user_finance:
+        raise HTTPException(
+            status_code=404,
+            detail="User finance does not exist in the system."
+        )
+
+    transactions = crud.finance_transaction.get_range(
+        db, user_id=user_id, start=start, end=end, limit=limit + 1
+    )
+    truncated = len(transactions) > limit
+    transactions = transactions[:limit]
+
+    opening_balance = crud.finance_transaction.balance_at(db, user_id=user_id, at=start) if start else 0
+    if end:
+        closing_balance = crud.finance_transaction.balance_at(db, user_id=user_id, at=end)
+    else:
+        closing_balance = user_finance.balance
+
+    return schemas.FinanceStatement(
+        user_id=user_id,
+        start=start,
+        end=end,
+        opening_balance=opening_balance,
+        closing_balance=closing_balance,
+        current_balance=user_finance.balance,
+        transactions=transactions,
+        truncated=truncated,
+    )
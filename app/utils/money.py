@@ -0,0 +1,15 @@
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Union
+
+CENT = Decimal("0.01")
+
+
+def to_money(amount: Union[Decimal, float, int, str]) -> Decimal:
+    """
+    Round an amount to cents, half up. Floats go through their shortest
+    repr, so 2.675 becomes 2.68 rather than 2.67 (its binary value
+    is 2.67499...).
+    """
+    if not isinstance(amount, Decimal):
+        amount = Decimal(str(amount))
+    return amount.quantize(CENT, rounding=ROUND_HALF_UP)
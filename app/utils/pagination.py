@@ -0,0 +1,34 @@
+import base64
+import json
+from typing import Any, Dict
+
+from fastapi.encoders import jsonable_encoder
+
+
+class InvalidPageRequest(ValueError):
+    """A cursor, order_by or direction sent by the client that can't be used."""
+
+
+def encode_cursor(data: Dict[str, Any]) -> str:
+    """
+    Encode keyset pagination state into an opaque, url-safe cursor.
+    """
+    raw = json.dumps(jsonable_encoder(data), separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """
+    Decode a cursor produced by `encode_cursor`.
+
+    :raises InvalidPageRequest: if the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise InvalidPageRequest(f"Invalid cursor: {cursor}") from e
+
+    if not isinstance(data, dict) or "id" not in data:
+        raise InvalidPageRequest(f"Invalid cursor: {cursor}")
+    return data
@@ -0,0 +1,203 @@
+import argparse
+import os
+import statistics
+import sys
+import time
+
+# Thêm thư mục gốc dự án vào sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection
+
+from app.db.session import test_engine
+
+# Schema tạm, dữ liệu benchmark không đụng tới các bảng thật
+SCHEMA = "bench"
+TABLES = ["users", "consignments", "shipments", "fulfillments", "deposit_bills"]
+
+# Các index của migration e7c1a4f90b26
+NEW_INDEXES = {
+    "ix_shipments_user_id_shipment_status_id": "shipments (user_id, shipment_status, id)",
+    "ix_shipments_consignment_id_id": "shipments (consignment_id, id)",
+    "ix_consignments_user_id_created_at": "consignments (user_id, created_at)",
+    "ix_fulfillments_user_id_status": "fulfillments (user_id, status)",
+    "ix_fulfillments_shipment_id": "fulfillments (shipment_id)",
+    "ix_deposit_bills_user_id_status": "deposit_bills (user_id, status)",
+}
+
+# Các câu query nóng của các trang danh sách
+QUERIES = {
+    "shipments by user + status": (
+        "SELECT * FROM shipments WHERE user_id = :user_id AND shipment_status = 1 "
+        "ORDER BY id DESC LIMIT 20"
+    ),
+    "shipments by consignment": (
+        "SELECT * FROM shipments WHERE consignment_id = :consignment_id ORDER BY id DESC"
+    ),
+    "consignments by user + created_at": (
+        "SELECT * FROM consignments WHERE user_id = :user_id "
+        "AND created_at >= now() - interval '30 days' ORDER BY created_at DESC LIMIT 20"
+    ),
+    "fulfillments by user + status": (
+        "SELECT * FROM fulfillments WHERE user_id = :user_id AND status = 1 ORDER BY id DESC LIMIT 20"
+    ),
+    "fulfillments by shipment": "SELECT * FROM fulfillments WHERE shipment_id = :shipment_id",
+    "deposit_bills by user + status": (
+        "SELECT * FROM deposit_bills WHERE user_id = :user_id AND status = 0 ORDER BY id DESC LIMIT 20"
+    ),
+}
+
+
+def create_schema(conn: Connection) -> None:
+    conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    for table in TABLES:
+        # Không copy khóa ngoại: các bảng tham chiếu (stores, addresses...) không được seed
+        conn.execute(text(f"CREATE TABLE {SCHEMA}.{table} (LIKE public.{table} INCLUDING DEFAULTS)"))
+        conn.execute(text(f"ALTER TABLE {SCHEMA}.{table} ADD PRIMARY KEY (id)"))
+
+    # Chép lại các index cũ (trước migration) sang schema benchmark
+    rows = conn.execute(text(
+        "SELECT indexname, indexdef FROM pg_indexes "
+        "WHERE schemaname = 'public' AND tablename = ANY(:tables) AND indexname NOT LIKE '%_pkey'"
+    ), {"tables": TABLES}).all()
+    for name, definition in rows:
+        if name in NEW_INDEXES:
+            continue
+        conn.execute(text(definition.replace(" ON public.", f" ON {SCHEMA}.")))
+
+
+def seed(conn: Connection, users: int, consignments_per_user: int, shipments_per_consignment: int) -> None:
+    consignments = users * consignments_per_user
+    shipments = consignments * shipments_per_consignment
+    params = {
+        "users": users,
+        "consignments": consignments,
+        "per_user": consignments_per_user,
+        "shipments": shipments,
+        "per_consignment": shipments_per_consignment,
+    }
+    conn.execute(text(
+        "INSERT INTO users (id, user_code, email, hashed_password, is_user_code_edited, is_active, token_version) "
+        "SELECT g, 'U' || g, 'user' || g || '@bench.local', 'x', false, true, 0 "
+        "FROM generate_series(1, :users) g"
+    ), params)
+    conn.execute(text(
+        "INSERT INTO consignments (id, user_id, user_address_id, source_store_id, dest_store_id, shipping_status, "
+        "store_status, weight, height, wide, length, weight_packaged, height_packaged, wide_packaged, "
+        "length_packaged, number_of_packages, domestic_shipping_fee, code, created_at, updated_at) "
+        "SELECT g, (g - 1) / :per_user + 1, 1, 1, 2, g % 5, g % 3, 1, 1, 1, 1, 1, 1, 1, 1, "
+        ":per_consignment, 0, 'C' || g, now() - (random() * interval '365 days'), now() "
+        "FROM generate_series(1, :consignments) g"
+    ), params)
+    conn.execute(text(
+        "INSERT INTO shipments (id, user_id, consignment_id, contains_liquid, is_fragile, "
+        "wooden_packaging_required, insurance_required, item_count_check_required, contains_liquid_fee, "
+        "is_fragile_fee, wooden_packaging_required_fee, insurance_required_fee, item_count_check_required_fee, "
+        "shipment_status, finance_status, code, domestic_shipping_fee, weight, height, wide, length, "
+        "weight_packaged, height_packaged, wide_packaged, length_packaged, created_at, updated_at) "
+        "SELECT g, ((g - 1) / :per_consignment) / :per_user + 1, (g - 1) / :per_consignment + 1, "
+        "false, false, false, false, false, 0, 0, 0, 0, 0, g % 7, g % 3, 'S' || g, 0, "
+        "1, 1, 1, 1, 1, 1, 1, 1, now(), now() "
+        "FROM generate_series(1, :shipments) g"
+    ), params)
+    conn.execute(text(
+        "INSERT INTO fulfillments (id, user_id, consignment_id, shipment_id, customer_name, "
+        "customer_phone_number, customer_address, status, shipping_type, created_at, updated_at) "
+        "SELECT id, user_id, consignment_id, id, 'Customer', '0900000000', 'Address', id % 4, 0, now(), now() "
+        "FROM shipments WHERE id % 2 = 0"
+    ))
+    conn.execute(text(
+        "INSERT INTO deposit_bills (id, user_id, user_fullname, amount, deposit_type, status, created_at, updated_at) "
+        "SELECT g, (g - 1) % :users + 1, 'User', 100000, 0, g % 3, now(), now() "
+        "FROM generate_series(1, :consignments) g"
+    ), params)
+    for table in TABLES:
+        conn.execute(text(f"ANALYZE {table}"))
+
+
+def measure(conn: Connection, params: dict, runs: int) -> dict:
+    results = {}
+    for name, query in QUERIES.items():
+        plan = conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {query}"), params).scalars().all()
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            conn.execute(text(query), params).all()
+            timings.append((time.perf_counter() - start) * 1000)
+        results[name] = (plan, statistics.median(timings))
+    return results
+
+
+def print_results(title: str, results: dict) -> None:
+    print(f"\n📊 {title}")
+    for name, (plan, median_ms) in results.items():
+        print(f"\n--- {name}: median {median_ms:.3f} ms")
+        for line in plan:
+            print(f"    {line}")
+
+
+def benchmark(database_url: str, users: int, consignments_per_user: int,
+              shipments_per_consignment: int, runs: int, keep: bool) -> None:
+    engine = create_engine(database_url) if database_url else test_engine
+    with engine.connect() as conn:
+        try:
+            print(f"🔧 Creating schema '{SCHEMA}' ...")
+            create_schema(conn)
+            conn.execute(text(f"SET search_path TO {SCHEMA}"))
+
+            print(f"🌱 Seeding {users} users, {users * consignments_per_user} consignments, "
+                  f"{users * consignments_per_user * shipments_per_consignment} shipments ...")
+            seed(conn, users, consignments_per_user, shipments_per_consignment)
+            conn.commit()
+
+            user_id = users // 2
+            consignment_id = user_id * consignments_per_user
+            params = {
+                "user_id": user_id,
+                "consignment_id": consignment_id,
+                "shipment_id": consignment_id * shipments_per_consignment,
+            }
+
+            before = measure(conn, params, runs)
+            print_results("Before (without the new indexes)", before)
+
+            print("\n🏗️ Creating the new indexes ...")
+            for name, columns in NEW_INDEXES.items():
+                conn.execute(text(f"CREATE INDEX {name} ON {columns}"))
+            for table in TABLES:
+                conn.execute(text(f"ANALYZE {table}"))
+            conn.commit()
+
+            after = measure(conn, params, runs)
+            print_results("After", after)
+
+            print("\n🎉 Summary (median ms)")
+            for name in QUERIES:
+                old, new = before[name][1], after[name][1]
+                print(f"  {name:<36} {old:>10.3f} -> {new:>10.3f}  (x{old / new if new else 0:.1f})")
+        except Exception as e:
+            conn.rollback()
+            print(f"❌ Error during benchmark: {e}")
+            raise
+        finally:
+            if not keep:
+                conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+                conn.commit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Seed a scratch schema and compare list query plans before/after the composite indexes."
+    )
+    parser.add_argument("--database-url", default=None, help="Defaults to the *_test database")
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--consignments-per-user", type=int, default=50)
+    parser.add_argument("--shipments-per-consignment", type=int, default=4)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--keep", action="store_true", help="Keep the seeded schema afterwards")
+    args = parser.parse_args()
+
+    benchmark(args.database_url, args.users, args.consignments_per_user,
+              args.shipments_per_consignment, args.runs, args.keep)
@@ -0,0 +1,23 @@
+import os
+import sys
+
+# Thêm thư mục gốc dự án vào sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.orm import Session
+from app import crud
+from app.db.session import SessionLocal
+
+def purge_used_refresh_tokens():
+    db: Session = SessionLocal()
+    try:
+        deleted = crud.used_refresh_token.purge_expired(db)
+        print(f"🎉 Done. Removed {deleted} expired refresh tokens.")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error during purge: {e}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    purge_used_refresh_tokens()
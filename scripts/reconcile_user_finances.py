@@ -0,0 +1,43 @@
+import os
+import sys
+
+# Thêm thư mục gốc dự án vào sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.db.session import SessionLocal
+
+# So sánh số dư đã lưu với sổ cái: tổng các giao dịch và snapshot của giao dịch cuối
+RECONCILE_SQL = text("""
+    SELECT f.user_id, f.balance, ledger.total, ledger.last_balance
+    FROM user_finances f
+    LEFT JOIN LATERAL (
+        SELECT
+            coalesce(sum(t.amount), 0) AS total,
+            (SELECT t2.balance_after FROM finance_transactions t2
+             WHERE t2.user_id = f.user_id
+             ORDER BY t2.created_at DESC, t2.id DESC LIMIT 1) AS last_balance
+        FROM finance_transactions t
+        WHERE t.user_id = f.user_id
+    ) ledger ON true
+    WHERE f.user_id IS NOT NULL
+      AND (f.balance <> ledger.total OR f.balance <> coalesce(ledger.last_balance, 0))
+""")
+
+
+def reconcile_user_finances():
+    db: Session = SessionLocal()
+    try:
+        mismatches = db.execute(RECONCILE_SQL).all()
+        for user_id, balance, total, last_balance in mismatches:
+            print(f"⚠️ User {user_id}: balance {balance}, ledger total {total}, last snapshot {last_balance}")
+        if mismatches:
+            print(f"❌ {len(mismatches)} user finances do not match the ledger.")
+            sys.exit(1)
+        print("🎉 All user finances match the ledger.")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    reconcile_user_finances()
@@ -1,8 +1,15 @@
 from typing import Dict
 
+import pytest
+from app import crud
+from app.core import security
 from app.core.config import settings
+from app.schemas.user import UserCreate
 from fastapi.testclient import TestClient
-from tests.utils.user import regular_user_email, regular_user_password
+from passlib.context import CryptContext
+from sqlalchemy.orm import Session
+from tests.utils.user import regular_user_email, regular_user_password, user_authentication_headers
+from tests.utils.utils import random_email, random_lower_string
 
 
 def test_get_access_token(client: TestClient) -> None:
@@ -29,3 +36,71 @@ def test_use_access_token(
     result = r.json()
     assert r.status_code == 200
     assert "email" in result
+
+
+def test_revoked_access_token_is_rejected(client: TestClient, db: Session) -> None:
+    email, password = random_email(), random_lower_string()
+    user = crud.user.create(db, obj_in=UserCreate(email=email, password=password))
+    headers = user_authentication_headers(client=client, email=email, password=password)
+
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+    assert r.status_code == 200
+
+    crud.user.revoke_tokens(db, user_id=user.id)
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+    assert r.status_code == 401
+
+
+def test_login_rehashes_outdated_password_hash(client: TestClient, db: Session) -> None:
+    email, password = random_email(), random_lower_string()
+    user = crud.user.create(db, obj_in=UserCreate(email=email, password=password))
+    weak_hash = CryptContext(schemes=["bcrypt"], bcrypt__default_rounds=4).hash(password)
+    crud.user.set_password_hash(db, db_obj=user, hashed_password=weak_hash)
+
+    user_authentication_headers(client=client, email=email, password=password)
+
+    db.refresh(user)
+    assert user.hashed_password != weak_hash
+    assert security.pwd_context.verify(password, user.hashed_password)
+    assert not security.pwd_context.needs_update(user.hashed_password)
+
+
+def test_login_rejected_when_hash_pool_is_saturated(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(security, "password_hash_pool", security.PasswordHashPool(workers=1, max_pending=0))
+    r = client.post(
+        f"{settings.API_V1_STR}/auth/access-token",
+        data={"username": regular_user_email, "password": regular_user_password},
+    )
+    assert r.status_code == 429
+    assert r.headers["Retry-After"] == "1"
+
+
+def test_refresh_token_rotation(client: TestClient, db: Session) -> None:
+    email, password = random_email(), random_lower_string()
+    crud.user.create(db, obj_in=UserCreate(email=email, password=password))
+    r = client.post(
+        f"{settings.API_V1_STR}/auth/access-token", data={"username": email, "password": password}
+    )
+    refresh_token = r.json()["refresh_token"]
+
+    # A refresh token is not an access token
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers={"Authorization": f"Bearer {refresh_token}"})
+    assert r.status_code == 401
+
+    r = client.post(f"{settings.API_V1_STR}/auth/refresh-token", json={"refresh_token": refresh_token})
+    assert r.status_code == 200
+    tokens = r.json()
+    assert tokens["refresh_token"] != refresh_token
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    assert client.get(f"{settings.API_V1_STR}/users/me", headers=headers).status_code == 200
+
+    # Replaying a used refresh token revokes every token of the user
+    r = client.post(f"{settings.API_V1_STR}/auth/refresh-token", json={"refresh_token": refresh_token})
+    assert r.status_code == 401
+    assert client.get(f"{settings.API_V1_STR}/users/me", headers=headers).status_code == 401
+    r = client.post(
+        f"{settings.API_V1_STR}/auth/refresh-token", json={"refresh_token": tokens["refresh_token"]}
+    )
+    assert r.status_code == 401
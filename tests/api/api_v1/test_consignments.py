@@ -0,0 +1,330 @@
+import csv
+import io
+import os
+from concurrent.futures.process import BrokenProcessPool
+from typing import Generator
+
+import pytest
+from app import crud
+from app.core.config import settings
+from app.core.storage import LocalStorage, get_storage
+from app.services import image_service
+from fastapi.testclient import TestClient
+from PIL import Image
+from sqlalchemy.orm import Session
+from tests.utils.consignment import create_random_consignment, create_random_store, create_random_user_with_address
+from tests.utils.utils import random_lower_string
+
+IMPORT_COLUMNS = [
+    "user_id", "source_store_id", "dest_store_id", "user_address_id",
+    "shipping_status", "store_status", "weight", "height", "wide", "length",
+    "weight_packaged", "height_packaged", "wide_packaged", "length_packaged",
+    "number_of_packages", "foreign_shipment_codes",
+]
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch) -> Generator:
+    """Local storage rooted in a temporary directory instead of the repo's uploads/."""
+    monkeypatch.setattr(settings, "STORAGE_BACKEND", "local")
+    monkeypatch.setattr(settings, "STORAGE_LOCAL_DIR", str(tmp_path))
+    get_storage.cache_clear()
+    yield get_storage()
+    get_storage.cache_clear()
+
+
+def _import_row(user_address, source_store, dest_store, codes):
+    return {
+        "user_id": user_address.user_id,
+        "source_store_id": source_store.id,
+        "dest_store_id": dest_store.id,
+        "user_address_id": user_address.id,
+        "shipping_status": 0,
+        "store_status": 0,
+        "weight": 1.5,
+        "height": 1,
+        "wide": 1,
+        "length": 1,
+        "weight_packaged": 2,
+        "height_packaged": 1,
+        "wide_packaged": 1,
+        "length_packaged": 1,
+        "number_of_packages": 1,
+        "foreign_shipment_codes": ";".join(codes),
+    }
+
+
+def test_import_consignments_csv(
+    client: TestClient, superadmin_token_headers: dict, db: Session
+) -> None:
+    source_store = create_random_store(db)
+    dest_store = create_random_store(db)
+    user_address = create_random_user_with_address(db)
+    codes = [random_lower_string() for _ in range(2)]
+
+    rows = [
+        _import_row(user_address, source_store, dest_store, codes),
+        {**_import_row(user_address, source_store, dest_store, []), "dest_store_id": 0},
+        {**_import_row(user_address, source_store, dest_store, []), "weight": "heavy"},
+    ]
+    content = io.StringIO()
+    writer = csv.DictWriter(content, fieldnames=IMPORT_COLUMNS)
+    writer.writeheader()
+    writer.writerows(rows)
+
+    r = client.post(
+        f"{settings.API_V1_STR}/consignments/import",
+        headers=superadmin_token_headers,
+        files={"file": ("consignments.csv", content.getvalue(), "text/csv")},
+    )
+    assert r.status_code == 200
+    result = r.json()["data"]
+    assert result["total_rows"] == 3
+    assert result["created"] == 1
+    assert [error["row"] for error in result["errors"]] == [3, 4]
+
+    shipments = crud.shipment.get_multi(db, filters={"codes": codes})
+    assert sorted(s.code for s in shipments) == sorted(codes)
+    assert len({s.consignment_id for s in shipments}) == 1
+
+
+def test_import_consignments_reports_only_the_rows_that_fail_to_save(
+    client: TestClient, superadmin_token_headers: dict, db: Session
+) -> None:
+    source_store = create_random_store(db)
+    dest_store = create_random_store(db)
+    user_address = create_random_user_with_address(db)
+    codes = [random_lower_string() for _ in range(2)]
+
+    rows = [
+        _import_row(user_address, source_store, dest_store, codes[:1]),
+        # Valid for the schema, rejected by the database
+        {**_import_row(user_address, source_store, dest_store, []), "number_of_packages": 2 ** 40},
+        _import_row(user_address, source_store, dest_store, codes[1:]),
+    ]
+    content = io.StringIO()
+    writer = csv.DictWriter(content, fieldnames=IMPORT_COLUMNS)
+    writer.writeheader()
+    writer.writerows(rows)
+
+    r = client.post(
+        f"{settings.API_V1_STR}/consignments/import",
+        headers=superadmin_token_headers,
+        files={"file": ("consignments.csv", content.getvalue(), "text/csv")},
+    )
+    assert r.status_code == 200
+    result = r.json()["data"]
+    assert result["created"] == 2
+    assert result["errors"] == [{"row": 3, "errors": ["Could not be saved: integer out of range"]}]
+
+    shipments = crud.shipment.get_multi(db, filters={"codes": codes})
+    assert sorted(s.code for s in shipments) == sorted(codes)
+
+
+def test_import_consignments_ignores_image_paths(
+    client: TestClient, superadmin_token_headers: dict, db: Session
+) -> None:
+    source_store = create_random_store(db)
+    dest_store = create_random_store(db)
+    user_address = create_random_user_with_address(db)
+    codes = [random_lower_string()]
+    row = {
+        **_import_row(user_address, source_store, dest_store, codes),
+        "image_path": "../../etc/passwd",
+        "image_display_path": "http://example.com/image.jpg",
+    }
+
+    content = io.StringIO()
+    writer = csv.DictWriter(content, fieldnames=list(row))
+    writer.writeheader()
+    writer.writerow(row)
+
+    r = client.post(
+        f"{settings.API_V1_STR}/consignments/import",
+        headers=superadmin_token_headers,
+        files={"file": ("consignments.csv", content.getvalue(), "text/csv")},
+    )
+    assert r.status_code == 200
+    assert r.json()["data"]["created"] == 1
+
+    shipment, = crud.shipment.get_multi(db, filters={"codes": codes})
+    consignment = crud.consignment.get(db, id=shipment.consignment_id)
+    assert consignment.image_path is None
+    assert consignment.image_display_path is None
+
+
+def test_import_consignments_rejects_unknown_format(
+    client: TestClient, superadmin_token_headers: dict
+) -> None:
+    r = client.post(
+        f"{settings.API_V1_STR}/consignments/import",
+        headers=superadmin_token_headers,
+        files={"file": ("consignments.txt", "hello", "text/plain")},
+    )
+    assert r.status_code == 400
+
+
+def test_import_consignments_rejects_non_utf8_csv(
+    client: TestClient, superadmin_token_headers: dict
+) -> None:
+    content = "user_id,note\n1,Hàng\n".encode("latin-1")
+    r = client.post(
+        f"{settings.API_V1_STR}/consignments/import",
+        headers=superadmin_token_headers,
+        files={"file": ("consignments.csv", content, "text/csv")},
+    )
+    assert r.status_code == 400
+
+
+def test_import_consignments_rejects_corrupt_xlsx(
+    client: TestClient, superadmin_token_headers: dict
+) -> None:
+    r = client.post(
+        f"{settings.API_V1_STR}/consignments/import",
+        headers=superadmin_token_headers,
+        files={"file": ("consignments.xlsx", b"PK\x03\x04" + os.urandom(64), "application/octet-stream")},
+    )
+    assert r.status_code == 400
+
+
+def test_upload_consignment_image(
+    client: TestClient, superadmin_token_headers: dict, db: Session, storage: LocalStorage
+) -> None:
+    consignment = create_random_consignment(db, with_shipments=False)
+    buffer = io.BytesIO()
+    Image.new("RGB", (2000, 1000), color=tuple(os.urandom(3))).save(buffer, "PNG")
+    image = buffer.getvalue()
+
+    paths = []
+    data = None
+    for _ in range(2):
+        r = client.post(
+            f"{settings.API_V1_STR}/consignments/{consignment.id}/image",
+            headers=superadmin_token_headers,
+            files={"file": ("package.png", image, "image/png")},
+        )
+        assert r.status_code == 200
+        data = r.json()["data"]
+        paths.append(data["image_path"])
+
+    # Same content is stored once, under its hash
+    assert paths[0] == paths[1]
+    assert paths[0].endswith(".png")
+    with open(storage.path(paths[0]), "rb") as f:
+        assert f.read() == image
+
+    db.refresh(consignment)
+    assert consignment.image_path == paths[0]
+    assert data["image_thumbnail_url"] == f"{settings.STORAGE_LOCAL_URL}/{consignment.image_thumbnail_path}"
+    with Image.open(storage.path(consignment.image_thumbnail_path)) as thumbnail:
+        assert thumbnail.format == "JPEG"
+        assert max(thumbnail.size) <= 320
+    with Image.open(storage.path(consignment.image_display_path)) as display:
+        assert display.size == (1600, 800)
+
+
+def test_upload_consignment_image_recovers_from_broken_pool(
+    client: TestClient, superadmin_token_headers: dict, db: Session, storage: LocalStorage
+) -> None:
+    broken = image_service._get_pool()
+    # A worker exiting abruptly breaks the pool, as when one is OOM killed
+    with pytest.raises(BrokenProcessPool):
+        broken.submit(os._exit, 1).result()
+
+    consignment = create_random_consignment(db, with_shipments=False)
+    buffer = io.BytesIO()
+    Image.new("RGB", (100, 100), color=tuple(os.urandom(3))).save(buffer, "PNG")
+    r = client.post(
+        f"{settings.API_V1_STR}/consignments/{consignment.id}/image",
+        headers=superadmin_token_headers,
+        files={"file": ("package.png", buffer.getvalue(), "image/png")},
+    )
+    assert r.status_code == 200
+    assert image_service._get_pool() is not broken
+
+
+def test_upload_consignment_image_rejects_invalid_image(
+    client: TestClient, superadmin_token_headers: dict, db: Session, storage: LocalStorage
+) -> None:
+    consignment = create_random_consignment(db, with_shipments=False)
+    r = client.post(
+        f"{settings.API_V1_STR}/consignments/{consignment.id}/image",
+        headers=superadmin_token_headers,
+        files={"file": ("package.png", random_lower_string().encode(), "image/png")},
+    )
+    assert r.status_code == 422
+
+
+def test_upload_consignment_image_rejects_unknown_type(
+    client: TestClient, superadmin_token_headers: dict, db: Session, storage: LocalStorage
+) -> None:
+    consignment = create_random_consignment(db, with_shipments=False)
+    buffer = io.BytesIO()
+    Image.new("RGB", (10, 10)).save(buffer, "GIF")
+    r = client.post(
+        f"{settings.API_V1_STR}/consignments/{consignment.id}/image",
+        headers=superadmin_token_headers,
+        files={"file": ("package.png", buffer.getvalue(), "image/png")},
+    )
+    assert r.status_code == 415
+
+
+def test_upload_consignment_image_extension_comes_from_content(
+    client: TestClient, superadmin_token_headers: dict, db: Session, storage: LocalStorage
+) -> None:
+    consignment = create_random_consignment(db, with_shipments=False)
+    buffer = io.BytesIO()
+    Image.new("RGB", (10, 10), color=tuple(os.urandom(3))).save(buffer, "WEBP")
+    r = client.post(
+        f"{settings.API_V1_STR}/consignments/{consignment.id}/image",
+        headers=superadmin_token_headers,
+        files={"file": ("package.html", buffer.getvalue(), "text/html")},
+    )
+    assert r.status_code == 200
+    assert r.json()["data"]["image_path"].endswith(".webp")
+
+
+def test_read_consignments(
+    client: TestClient, superadmin_token_headers: dict, db: Session
+) -> None:
+    consignment = create_random_consignment(db)
+    r = client.get(
+        f"{settings.API_V1_STR}/consignments",
+        headers=superadmin_token_headers,
+        params={"code": consignment.code},
+    )
+    assert r.status_code == 200
+    data = r.json()["data"]
+    assert [c["id"] for c in data] == [consignment.id]
+    assert len(data[0]["foreign_shipment_codes"]) == 3
+
+
+def test_update_consignment_syncs_shipments_by_code(
+    client: TestClient, superadmin_token_headers: dict, db: Session
+) -> None:
+    codes = [random_lower_string() for _ in range(3)]
+    consignment = create_random_consignment(db, codes=codes)
+    before = {s.code: s.id for s in crud.shipment.get_multi(db, filters={"consignment_id": consignment.id})}
+    new_code = random_lower_string()
+
+    payload = {
+        key: getattr(consignment, key)
+        for key in IMPORT_COLUMNS if key != "foreign_shipment_codes"
+    }
+    r = client.put(
+        f"{settings.API_V1_STR}/consignments/{consignment.id}",
+        headers=superadmin_token_headers,
+        json={**payload, "weight": 3.0, "foreign_shipment_codes": [codes[1], codes[2], new_code]},
+    )
+    assert r.status_code == 200
+    assert sorted(c["foreign_shipment_code"] for c in r.json()["data"]["foreign_shipment_codes"]) == sorted(
+        [codes[1], codes[2], new_code]
+    )
+
+    db.expire_all()
+    after = {s.code: s for s in crud.shipment.get_multi(db, filters={"consignment_id": consignment.id})}
+    assert sorted(after) == sorted([codes[1], codes[2], new_code])
+    # Retained shipments are updated in place, not re-created
+    assert after[codes[1]].id == before[codes[1]] and after[codes[2]].id == before[codes[2]]
+    assert all(s.weight == 3.0 for s in after.values())
+    assert after[new_code].user_id == consignment.user_id
@@ -0,0 +1,17 @@
+from app.core.config import settings
+from fastapi.testclient import TestClient
+
+
+def test_read_pool_stats(client: TestClient, superadmin_token_headers: dict) -> None:
+    r = client.get(f"{settings.API_V1_STR}/internal/pool-stats", headers=superadmin_token_headers)
+    assert r.status_code == 200
+    data = r.json()["data"]
+    assert data["db"]["size"] == settings.DB_POOL_SIZE
+    assert data["db"]["timeout_seconds"] == settings.DB_POOL_TIMEOUT_SECONDS
+    assert "wait_seconds_max" in data["db_async"]
+    assert "password_hash" in data
+
+
+def test_read_pool_stats_requires_super_admin(client: TestClient, normal_user_token_headers: dict) -> None:
+    r = client.get(f"{settings.API_V1_STR}/internal/pool-stats", headers=normal_user_token_headers)
+    assert r.status_code in (401, 403)
@@ -0,0 +1,86 @@
+from app import crud
+from app.constants.shipment import ShipmentStatus
+from app.core.config import settings
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from tests.utils.consignment import create_random_consignment
+from tests.utils.utils import random_lower_string
+
+
+def test_read_shipments_pages_with_cursor(
+    client: TestClient, superadmin_token_headers: dict, db: Session
+) -> None:
+    codes = [random_lower_string() for _ in range(3)]
+    consignment = create_random_consignment(db, codes=codes)
+
+    seen = []
+    cursor = None
+    for _ in range(3):
+        params = {"consignment_id": consignment.id, "limit": 2, "order_by": "id", "direction": "asc"}
+        if cursor:
+            params["cursor"] = cursor
+        r = client.get(f"{settings.API_V1_STR}/shipments", headers=superadmin_token_headers, params=params)
+        assert r.status_code == 200
+        body = r.json()
+        seen.extend(body["data"])
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+
+    assert [shipment["code"] for shipment in seen] == codes
+    # Loaded through the profile, not lazily
+    assert seen[0]["consignment"]["id"] == consignment.id
+    assert sorted(c["foreign_shipment_code"] for c in seen[0]["consignment"]["foreign_shipment_codes"]) == sorted(codes)
+
+
+def test_scan_shipments_resolves_codes_in_one_query(
+    client: TestClient, superadmin_token_headers: dict, db: Session
+) -> None:
+    codes = [random_lower_string() for _ in range(3)]
+    consignment = create_random_consignment(db, codes=codes)
+    missing = random_lower_string()
+
+    r = client.post(
+        f"{settings.API_V1_STR}/shipments/scan",
+        headers=superadmin_token_headers,
+        json={"codes": [codes[0].upper(), f" {codes[1]} ", missing]},
+    )
+    assert r.status_code == 200
+    data = r.json()["data"]
+    assert sorted(s["code"] for s in data["shipments"]) == sorted(codes[:2])
+    assert all(s["consignment"]["id"] == consignment.id for s in data["shipments"])
+    assert all(s["customer"]["id"] == consignment.user_id for s in data["shipments"])
+    assert data["not_found"] == [missing]
+
+
+def test_transition_shipments_reports_rejects(
+    client: TestClient, superadmin_token_headers: dict, db: Session
+) -> None:
+    consignment = create_random_consignment(db)
+    weighed, also_weighed, not_weighed = crud.shipment.get_multi(
+        db, filters={"consignment_id": consignment.id}, order_by="id", direction="asc"
+    )
+    for shipment in (weighed, also_weighed):
+        shipment.weight = 1.5
+    db.commit()
+
+    r = client.post(
+        f"{settings.API_V1_STR}/shipments/status-transitions",
+        headers=superadmin_token_headers,
+        json={
+            "ids": [weighed.id, also_weighed.id, not_weighed.id, 0],
+            "shipment_status": ShipmentStatus.FOREIGN_STORE_RECEIVED.value,
+        },
+    )
+    assert r.status_code == 200
+    data = r.json()["data"]
+    assert data["updated"] == [weighed.id, also_weighed.id]
+    assert [reject["id"] for reject in data["rejected"]] == [not_weighed.id, 0]
+
+    # Already moved: a second call rejects them
+    r = client.post(
+        f"{settings.API_V1_STR}/shipments/status-transitions",
+        headers=superadmin_token_headers,
+        json={"ids": [weighed.id], "shipment_status": ShipmentStatus.FOREIGN_STORE_RECEIVED.value},
+    )
+    assert r.json()["data"]["rejected"][0]["reason"].startswith("Can not move from FOREIGN_STORE_RECEIVED")
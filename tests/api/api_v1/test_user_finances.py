@@ -0,0 +1,26 @@
+from app import crud, schemas
+from app.core.config import settings
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from tests.utils.utils import random_email, random_lower_string
+
+
+def test_read_finance_statement(client: TestClient, superadmin_token_headers: dict, db: Session) -> None:
+    user_in = schemas.UserCreate(email=random_email(), password=random_lower_string())
+    user_id = crud.user.create(db, obj_in=user_in).id
+    crud.user_finance.credit(db, user_id=user_id, amount=100.0)
+    crud.user_finance.debit(db, user_id=user_id, amount=30.0)
+    crud.user_finance.debit(db, user_id=user_id, amount=20.0)
+    second = crud.finance_transaction.get_range(db, user_id=user_id)[1]
+
+    r = client.get(
+        f"{settings.API_V1_STR}/user-finances/statement",
+        headers=superadmin_token_headers,
+        params={"user_id": user_id, "start": second.created_at.isoformat()},
+    )
+    assert r.status_code == 200
+    statement = r.json()["data"]
+    assert statement["opening_balance"] == 100.0
+    assert [t["amount"] for t in statement["transactions"]] == [-30.0, -20.0]
+    assert statement["closing_balance"] == statement["current_balance"] == 50.0
+    assert statement["truncated"] is False
@@ -3,6 +3,7 @@ from typing import Dict
 from app import crud
 from app.core.config import settings
 from app.schemas.user import UserCreate
+from app.utils.pagination import encode_cursor
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 from tests.utils.user import regular_user_email
@@ -187,3 +188,41 @@ def test_retrieve_users_by_normal_user_is_unauthorized(
         f"{settings.API_V1_STR}/users/", headers=normal_user_token_headers
     )
     assert r.status_code == 401
+
+
+def test_retrieve_users_with_invalid_cursor(
+    client: TestClient, superadmin_token_headers: dict
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/users/",
+        headers=superadmin_token_headers,
+        params={"cursor": "not-a-cursor"},
+    )
+    assert r.status_code == 400
+
+    r = client.get(
+        f"{settings.API_V1_STR}/users/",
+        headers=superadmin_token_headers,
+        params={"order_by": "password"},
+    )
+    assert r.status_code == 400
+
+
+def test_retrieve_users_with_tampered_cursor(
+    client: TestClient, superadmin_token_headers: dict
+) -> None:
+    for order_by, value, last_id in [
+        ("id", None, "x"),
+        ("id", None, True),
+        ("email", 5, 1),
+        ("created_at", ["2026-01-01"], 1),
+        ("created_at", "yesterday", 1),
+        ("user_code", None, 1),
+    ]:
+        cursor = encode_cursor({"order_by": order_by, "direction": "desc", "value": value, "id": last_id})
+        r = client.get(
+            f"{settings.API_V1_STR}/users/",
+            headers=superadmin_token_headers,
+            params={"cursor": cursor, "order_by": order_by},
+        )
+        assert r.status_code == 400, (order_by, value, last_id)
@@ -1,8 +1,8 @@
 from typing import Dict, Generator
 
 import pytest
-from app.api.deps import get_db
-from app.db.session import TestingSessionLocal
+from app.api.deps import get_async_db, get_async_read_db, get_db, get_read_db
+from app.db.session import TestingAsyncSessionLocal, TestingSessionLocal
 from app.main import app
 from fastapi.testclient import TestClient
 
@@ -21,6 +21,11 @@ def override_get_db():
         db.close()
 
 
+async def override_get_async_db():
+    async with TestingAsyncSessionLocal() as db:
+        yield db
+
+
 @pytest.fixture(scope="session")
 def db() -> Generator:
     yield TestingSessionLocal()
@@ -29,6 +34,9 @@ def db() -> Generator:
 @pytest.fixture(scope="module")
 def client() -> Generator:
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_async_read_db] = override_get_async_db
     with TestClient(app) as c:
         yield c
 
@@ -0,0 +1,159 @@
+from datetime import datetime
+
+import pytest
+from app import crud, schemas
+from app.crud.base import CRUDBase
+from sqlalchemy.orm import Session
+from tests.utils.utils import random_email, random_lower_string
+
+
+def _create_account_with_users(db: Session, count: int):
+    account_in = schemas.AccountCreate(
+        name=random_lower_string(), description=random_lower_string()
+    )
+    account = crud.account.create(db, obj_in=account_in)
+    for _ in range(count):
+        user_in = schemas.UserCreate(
+            email=random_email(),
+            full_name="same name",
+            password=random_lower_string(),
+            account_id=account.id,
+        )
+        crud.user.create(db, obj_in=user_in)
+    return account
+
+
+def test_cursor_pagination_walks_all_rows(db: Session) -> None:
+    account = _create_account_with_users(db, 5)
+    filters = {"account_id": account.id}
+
+    seen = []
+    cursor = None
+    while True:
+        page = crud.user.get_multi(db, limit=2, filters=filters, cursor=cursor)
+        seen.extend(user.id for user in page)
+        cursor = crud.user.next_cursor(page, limit=2)
+        if cursor is None:
+            break
+
+    offset_ids = [
+        user.id for user in crud.user.get_multi(db, limit=100, filters=filters)
+    ]
+    assert seen == offset_ids
+    assert len(seen) == 5
+
+
+def test_cursor_pagination_by_non_unique_column(db: Session) -> None:
+    account = _create_account_with_users(db, 3)
+    filters = {"account_id": account.id}
+
+    first = crud.user.get_multi(
+        db, limit=2, filters=filters, order_by="full_name", direction="asc"
+    )
+    cursor = crud.user.next_cursor(first, limit=2, order_by="full_name", direction="asc")
+    second = crud.user.get_multi(
+        db, limit=2, filters=filters, order_by="full_name", direction="asc", cursor=cursor
+    )
+
+    assert len(first) == 2
+    assert len(second) == 1
+    assert not {u.id for u in first} & {u.id for u in second}
+
+
+@pytest.mark.parametrize("direction", ["asc", "desc"])
+def test_cursor_pagination_keeps_null_values(db: Session, direction: str) -> None:
+    account = _create_account_with_users(db, 2)
+    for full_name in (None, None, "other name"):
+        user_in = schemas.UserCreate(
+            email=random_email(),
+            full_name=full_name,
+            password=random_lower_string(),
+            account_id=account.id,
+        )
+        crud.user.create(db, obj_in=user_in)
+    filters = {"account_id": account.id}
+
+    seen = []
+    cursor = None
+    while True:
+        page = crud.user.get_multi(
+            db, limit=2, filters=filters, order_by="full_name", direction=direction, cursor=cursor
+        )
+        seen.extend(user.id for user in page)
+        cursor = crud.user.next_cursor(page, limit=2, order_by="full_name", direction=direction)
+        if cursor is None:
+            break
+
+    offset_ids = [
+        user.id
+        for user in crud.user.get_multi(
+            db, limit=100, filters=filters, order_by="full_name", direction=direction
+        )
+    ]
+    assert seen == offset_ids
+    assert len(seen) == 5
+
+
+def test_cursor_rejects_mismatched_order(db: Session) -> None:
+    account = _create_account_with_users(db, 2)
+    page = crud.user.get_multi(db, limit=1, filters={"account_id": account.id})
+    cursor = crud.user.next_cursor(page, limit=1)
+
+    with pytest.raises(ValueError):
+        crud.user.get_multi(db, limit=1, order_by="email", cursor=cursor)
+
+
+def test_filter_operators(db: Session) -> None:
+    account = _create_account_with_users(db, 3)
+    users = crud.user.get_multi(db, filters={"account_id": account.id})
+    emails = [users[0].email, users[1].email]
+
+    in_range = crud.user.get_multi(
+        db,
+        filters={
+            "account_id": account.id,
+            "created_at_start": datetime(2000, 1, 1),
+            "created_at_end": datetime(2100, 1, 1),
+        },
+    )
+    assert len(in_range) == 3
+
+    by_email = crud.user.get_multi(
+        db, filters={"account_id": account.id, "emails": emails}
+    )
+    assert sorted(u.email for u in by_email) == sorted(emails)
+
+
+def test_invalid_filter_and_order_are_rejected(db: Session) -> None:
+    with pytest.raises(ValueError):
+        crud.user.get_multi(db, filters={"not_a_column": 1})
+    with pytest.raises(ValueError):
+        crud.user.get_multi(db, order_by="hashed_password")
+    with pytest.raises(ValueError):
+        crud.user.get_multi(db, direction="sideways")
+
+
+def test_timestamps_are_set_by_the_database(db: Session) -> None:
+    first = _create_account_with_users(db, 0)
+    second = _create_account_with_users(db, 0)
+    assert first.created_at < second.created_at
+
+    updated = crud.account.update(db, db_obj=first, obj_in={"description": random_lower_string()})
+    assert updated.updated_at > updated.created_at
+
+
+def test_sortable_fields_are_indexed() -> None:
+    for crud_obj in vars(crud).values():
+        if not isinstance(crud_obj, CRUDBase):
+            continue
+        table = crud_obj.model.__table__
+        # Keyset pages order by (field, id): unique fields need no tie-break
+        indexed = {
+            tuple(column.name for column in index.columns)
+            for index in table.indexes
+        }
+        for field in crud_obj.sortable_fields:
+            unique = field == "id" or (field,) in {
+                tuple(column.name for column in index.columns) for index in table.indexes if index.unique
+            }
+            assert unique or (field, "id") in indexed, f"{table.name}.{field} has no ({field}, id) index"
@@ -0,0 +1,52 @@
+import random
+
+from app import crud, models
+from app.constants.change_log import ActionType, ObjectType
+from app.db.change_log_writer import ChangeLogWriter
+from app.db.session import TestingSessionLocal
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from tests.utils.utils import count_queries, random_lower_string
+
+
+def test_record_commits_with_the_callers_transaction(db: Session) -> None:
+    # Unique per run, the test database is not reset between runs
+    object_id = random.randint(10 ** 8, 2 ** 31 - 1)
+    crud.change_log.record(
+        db, user_id=1, object_type=ObjectType.SHIPMENT, object_id=object_id,
+        action=ActionType.UPDATE, changes=[{"field": "weight", "old": 1.0, "new": 2.0}],
+    )
+    db.rollback()
+    assert db.query(models.ChangeLog).filter_by(object_id=object_id).count() == 0
+
+    crud.change_log.record(
+        db, user_id=1, object_type=ObjectType.SHIPMENT, object_id=object_id,
+        action=ActionType.UPDATE, changes=[{"field": "weight", "old": 1.0, "new": 2.0}],
+    )
+    db.flush()
+    # Stamped by the database, with the time of the transaction
+    entry = db.query(models.ChangeLog).filter_by(object_id=object_id).one()
+    assert entry.created_at == db.scalar(select(func.timezone("utc", func.now())))
+    db.commit()
+    assert db.query(models.ChangeLog).filter_by(object_id=object_id).count() == 1
+
+
+def test_writer_flushes_in_batches() -> None:
+    writer = ChangeLogWriter(TestingSessionLocal, batch_size=2, flush_interval=60, max_pending=100)
+    marker = random_lower_string()
+    rows = [
+        {"user_id": 1, "object_type": marker, "object_id": i, "action": "1", "changes": []}
+        for i in range(5)
+    ]
+
+    session = TestingSessionLocal()
+    try:
+        with count_queries(session) as statements:
+            writer.submit(rows)
+            writer.stop()
+
+        # One multi-row INSERT per batch
+        assert len([s for s in statements if s.startswith("INSERT INTO change_logs")]) == 3
+        assert session.query(models.ChangeLog).filter_by(object_type=marker).count() == 5
+    finally:
+        session.close()
@@ -0,0 +1,69 @@
+from app import crud, schemas
+from app.constants.shipment import ShipmentFinanceStatus, ShipmentStatus
+from app.db.session import TestingSessionLocal
+from sqlalchemy.orm import Session
+from tests.utils.consignment import create_random_consignment
+from tests.utils.utils import random_lower_string
+
+
+def test_create_consignment_with_codes(db: Session) -> None:
+    codes = [random_lower_string() for _ in range(3)]
+    consignment = create_random_consignment(db, codes=codes, with_shipments=False)
+    assert consignment.id
+    assert sorted(c.foreign_shipment_code for c in consignment.foreign_shipment_codes) == sorted(codes)
+
+
+def test_create_multi_shipments_keeps_order(db: Session) -> None:
+    consignment = create_random_consignment(db, with_shipments=False)
+    codes = [random_lower_string() for _ in range(5)]
+    shipments = crud.shipment.create_multi(db, objs_in=[
+        schemas.ShipmentCreate(
+            consignment_id=consignment.id,
+            shipment_status=ShipmentStatus.FOREIGN_SHIPPING.value,
+            finance_status=ShipmentFinanceStatus.NOT_APPROVED.value,
+            code=code,
+            user_id=consignment.user_id,
+        )
+        for code in codes
+    ])
+    assert [s.code for s in shipments] == codes
+    assert all(s.id for s in shipments)
+
+
+def test_uncommitted_create_is_rolled_back(db: Session) -> None:
+    consignment = create_random_consignment(db, with_shipments=False)
+    shipment_in = schemas.ShipmentCreate(
+        consignment_id=consignment.id,
+        shipment_status=ShipmentStatus.FOREIGN_SHIPPING.value,
+        finance_status=ShipmentFinanceStatus.NOT_APPROVED.value,
+        code=random_lower_string(),
+        user_id=consignment.user_id,
+    )
+    shipment = crud.shipment.create(db, obj_in=shipment_in, commit=False)
+    shipment_id = shipment.id
+    assert shipment_id
+
+    db.rollback()
+    assert crud.shipment.get(db, id=shipment_id) is None
+
+
+def test_foreign_shipment_codes_are_unique_case_insensitively(db: Session) -> None:
+    code = random_lower_string()
+    consignment = create_random_consignment(db, codes=[code], with_shipments=False)
+
+    taken = crud.consignment.get_taken_foreign_shipment_codes(db, codes=[code.upper(), random_lower_string()])
+    assert taken == [code]
+    assert crud.consignment.get_taken_foreign_shipment_codes(
+        db, codes=[code], exclude_consignment_id=consignment.id
+    ) == []
+
+
+def test_code_numbers_are_never_reused(db: Session) -> None:
+    other = TestingSessionLocal()
+    try:
+        first = crud.consignment.next_code_numbers(db, count=100)
+        second = crud.consignment.next_code_numbers(other, count=100)
+    finally:
+        other.close()
+
+    assert len(set(first) | set(second)) == 200
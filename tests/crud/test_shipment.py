@@ -0,0 +1,69 @@
+from app import crud, models, schemas
+from app.constants.change_log import ObjectType
+from sqlalchemy.orm import Session
+from tests.utils.consignment import create_random_consignment, create_random_user_with_address
+from tests.utils.utils import count_queries, random_lower_string
+
+
+def test_list_shipments_with_consignment_profile_is_bounded(db: Session) -> None:
+    consignments = [create_random_consignment(db) for _ in range(3)]
+    consignment_ids = [c.id for c in consignments]
+    db.expire_all()
+
+    with count_queries(db) as statements:
+        shipments = crud.shipment.get_multi(db, limit=100, profile="with_consignment")
+        data = [
+            schemas.Shipment.model_validate(shipment)
+            for shipment in shipments
+            if shipment.consignment_id in consignment_ids
+        ]
+
+    assert len(data) == 9
+    assert all(len(s.consignment.foreign_shipment_codes) == 3 for s in data)
+    # One query for shipments joined with consignments, one for the codes
+    assert len(statements) <= 2
+
+
+def test_list_consignments_with_codes_profile_is_bounded(db: Session) -> None:
+    for _ in range(3):
+        create_random_consignment(db, with_shipments=False)
+    db.expire_all()
+
+    with count_queries(db) as statements:
+        consignments = crud.consignment.get_multi(db, limit=50, profile="with_foreign_codes")
+        [schemas.Consignment.model_validate(c) for c in consignments]
+
+    assert len(statements) <= 2
+
+
+def test_update_logs_only_changed_columns(db: Session) -> None:
+    consignment = create_random_consignment(db, codes=[random_lower_string()])
+    shipment = crud.shipment.get_multi(db, filters={"consignment_id": consignment.id})[0]
+    # Expired by the commit: the old values are loaded before the diff
+    db.commit()
+
+    crud.shipment.update(
+        db, db_obj=shipment, obj_in={"weight": 2.5, "note": None}, current_user_id=shipment.user_id
+    )
+
+    logs = db.query(models.ChangeLog).filter_by(
+        object_type=str(ObjectType.SHIPMENT.value), object_id=shipment.id
+    ).all()
+    assert len(logs) == 1
+    # note was already None: only the weight changed
+    assert logs[0].changes == [{"field": "weight", "old": 0.0, "new": 2.5}]
+
+
+def test_update_keeps_the_owner(db: Session) -> None:
+    consignment = create_random_consignment(db, codes=[random_lower_string()])
+    shipment = crud.shipment.get_multi(db, filters={"consignment_id": consignment.id})[0]
+    staff_id = create_random_user_with_address(db).user_id
+
+    crud.shipment.update(db, db_obj=shipment, obj_in={"weight": 1.5}, current_user_id=staff_id)
+
+    db.refresh(shipment)
+    assert shipment.user_id == consignment.user_id
+    log = db.query(models.ChangeLog).filter_by(
+        object_type=str(ObjectType.SHIPMENT.value), object_id=shipment.id
+    ).one()
+    assert log.user_id == staff_id
@@ -1,9 +1,11 @@
 from app import crud
 from app.core.security import verify_password
+from app.constants.role import Role
 from app.schemas.user import UserCreate, UserUpdate
+from app.schemas.user_role import UserRoleCreate
 from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
-from tests.utils.utils import random_email, random_lower_string
+from tests.utils.utils import count_queries, random_email, random_lower_string
 
 
 def test_create_user(db: Session) -> None:
@@ -89,3 +91,22 @@ def test_update_password(db: Session) -> None:
     assert user_2
     assert user.email == user_2.email
     assert verify_password(password, user_2.hashed_password)
+
+
+def test_get_principal_is_cached_and_invalidated(db: Session) -> None:
+    user_in = UserCreate(email=random_email(), password=random_lower_string())
+    user = crud.user.create(db, obj_in=user_in)
+
+    principal = crud.user.get_principal(db, id=user.id, issued_at=1)
+    assert principal.id == user.id
+    assert principal.is_active
+    assert principal.token_version == 0
+
+    with count_queries(db) as statements:
+        assert crud.user.get_principal(db, id=user.id, issued_at=1) == principal
+    assert statements == []
+
+    # Assigning a role revokes the tokens that carry the previous role claim
+    role = crud.role.get_by_name(db, name=Role.USER["name"])
+    crud.user_role.create(db, obj_in=UserRoleCreate(user_id=user.id, role_id=role.id))
+    assert crud.user.get_principal(db, id=user.id, issued_at=1).token_version == 1
@@ -0,0 +1,103 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from app import crud, schemas
+from app.constants.change_log import ObjectType
+from app.constants.finance import FinanceTransactionType
+from app.db.base_class import utc_now
+from app.db.session import TestingSessionLocal
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+from tests.utils.utils import random_email, random_lower_string
+
+
+def _create_user_id(db: Session) -> int:
+    user_in = schemas.UserCreate(email=random_email(), password=random_lower_string())
+    return crud.user.create(db, obj_in=user_in).id
+
+
+def test_credit_creates_then_adds_to_balance(db: Session) -> None:
+    user_id = _create_user_id(db)
+
+    assert crud.user_finance.credit(db, user_id=user_id, amount=100.0) == 100.0
+    assert crud.user_finance.credit(db, user_id=user_id, amount=50.0) == 150.0
+
+    db.expire_all()
+    assert crud.user_finance.get_by_user_id(db, user_id=user_id).balance == 150.0
+
+
+def test_debit_refuses_to_overdraw(db: Session) -> None:
+    user_id = _create_user_id(db)
+    assert crud.user_finance.debit(db, user_id=user_id, amount=10.0) is None
+
+    crud.user_finance.credit(db, user_id=user_id, amount=30.0)
+    assert crud.user_finance.debit(db, user_id=user_id, amount=20.0) == 10.0
+    assert crud.user_finance.debit(db, user_id=user_id, amount=20.0) is None
+
+
+def test_concurrent_debits_never_overdraw(db: Session) -> None:
+    user_id = _create_user_id(db)
+    crud.user_finance.credit(db, user_id=user_id, amount=50.0)
+
+    def debit(_):
+        session = TestingSessionLocal()
+        try:
+            return crud.user_finance.debit(session, user_id=user_id, amount=10.0)
+        finally:
+            session.close()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(debit, range(8)))
+
+    assert sum(balance is not None for balance in results) == 5
+    db.expire_all()
+    assert crud.user_finance.get_by_user_id(db, user_id=user_id).balance == 0.0
+
+
+def test_balance_changes_are_recorded_in_the_ledger(db: Session) -> None:
+    user_id = _create_user_id(db)
+    crud.user_finance.credit(
+        db, user_id=user_id, amount=100.0,
+        reference_type=ObjectType.DEPOSIT_BILL, reference_id=7,
+    )
+    crud.user_finance.debit(db, user_id=user_id, amount=22.999999999999996)
+    # Refused debits leave no trace
+    crud.user_finance.debit(db, user_id=user_id, amount=1000.0)
+
+    transactions = crud.finance_transaction.get_range(db, user_id=user_id)
+    assert [(t.transaction_type, t.amount, t.balance_after) for t in transactions] == [
+        (FinanceTransactionType.DEPOSIT.value, Decimal("100.00"), Decimal("100.00")),
+        (FinanceTransactionType.FULFILLMENT_CHARGE.value, Decimal("-23.00"), Decimal("77.00")),
+    ]
+    assert transactions[0].reference_id == 7
+    assert crud.finance_transaction.balance_at(db, user_id=user_id, at=transactions[1].created_at) == Decimal("100.00")
+
+
+def test_ledger_times_are_utc_whatever_the_session_time_zone(db: Session) -> None:
+    user_id = _create_user_id(db)
+    session = TestingSessionLocal()
+    try:
+        session.execute(text("SET TIME ZONE 'Asia/Ho_Chi_Minh'"))
+        crud.user_finance.credit(session, user_id=user_id, amount=10.0, commit=False)
+        transaction, = crud.finance_transaction.get_range(session, user_id=user_id)
+        assert abs(transaction.created_at - session.scalar(select(utc_now))) < timedelta(minutes=1)
+    finally:
+        session.rollback()
+        session.close()
+
+
+def test_balance_only_changes_through_the_ledger(db: Session) -> None:
+    user_id = _create_user_id(db)
+    user_finance = crud.user_finance.create(
+        db, obj_in=schemas.UserFinanceCreate(user_id=user_id, balance=40.0)
+    )
+    assert user_finance.balance == Decimal("40.00")
+    transaction, = crud.finance_transaction.get_range(db, user_id=user_id)
+    assert transaction.balance_after == Decimal("40.00")
+
+    with pytest.raises(ValueError):
+        crud.user_finance.update(db, db_obj=user_finance, obj_in={"balance": 1000.0}, current_user_id=user_id)
+    db.expire_all()
+    assert crud.user_finance.get_by_user_id(db, user_id=user_id).balance == Decimal("40.00")
@@ -0,0 +1,54 @@
+import time
+
+from app.core.config import settings
+from app.db.routing import (
+    PRINCIPAL_ID_KEY, WRITE_MARKER_COOKIE, WRITE_MARKER_HEADER, ReadRouter, parse_write_marker, sign_write_marker
+)
+from app.db.session import TestingSessionLocal
+from fastapi.testclient import TestClient
+
+
+def test_read_router_round_robins_replicas() -> None:
+    router = ReadRouter(window_seconds=10, maxsize=100)
+    assert [router.choose(1, "primary", ["r1", "r2"]) for _ in range(4)] == ["r1", "r2", "r1", "r2"]
+    assert router.choose(1, "primary", []) == "primary"
+
+
+def test_read_router_reads_own_writes_from_primary() -> None:
+    router = ReadRouter(window_seconds=10, maxsize=100)
+    router.track_writes(TestingSessionLocal)
+
+    db = TestingSessionLocal()
+    try:
+        db.info[PRINCIPAL_ID_KEY] = 42
+        db.commit()
+    finally:
+        db.close()
+
+    assert router.choose(42, "primary", ["r1"]) == "primary"
+    assert router.choose(43, "primary", ["r1"]) == "r1"
+    assert router.choose(None, "primary", ["r1"]) == "r1"
+
+
+def test_read_router_honours_write_marker_from_another_worker() -> None:
+    # A fresh router stands for a worker that did not handle the write
+    router = ReadRouter(window_seconds=10, maxsize=100)
+    marker = sign_write_marker(42, time.time())
+
+    assert router.choose(42, "primary", ["r1"], marker) == "primary"
+    assert router.choose(43, "primary", ["r1"], marker) == "r1"
+    tampered = marker[:-1] + ("1" if marker.endswith("0") else "0")
+    assert router.choose(42, "primary", ["r1"], tampered) == "r1"
+    assert router.choose(42, "primary", ["r1"], sign_write_marker(42, time.time() - 60)) == "r1"
+    assert router.choose(42, "primary", ["r1"], "garbage") == "r1"
+
+
+def test_writes_return_a_signed_write_marker(client: TestClient, superadmin_token_headers: dict) -> None:
+    r = client.post(
+        f"{settings.API_V1_STR}/change_logs",
+        headers=superadmin_token_headers,
+        json={"user_id": 1, "object_type": "1", "object_id": 1, "action": "1", "changes": []},
+    )
+    assert r.status_code == 200
+    assert parse_write_marker(r.headers[WRITE_MARKER_HEADER]) is not None
+    assert WRITE_MARKER_COOKIE in r.cookies
@@ -0,0 +1,77 @@
+from typing import List, Optional
+
+from app import crud, models, schemas
+from app.constants.shipment import ShipmentFinanceStatus, ShipmentStatus
+from app.constants.store import StoreType
+from sqlalchemy.orm import Session
+from tests.utils.utils import random_email, random_lower_string
+
+
+def create_random_store(db: Session, type_store: StoreType = StoreType.SOURCE) -> models.Store:
+    store_in = schemas.StoreCreate(
+        name=random_lower_string(),
+        description=random_lower_string(),
+        is_active=True,
+        type_store=type_store.value,
+        code=random_lower_string()[:8].upper(),
+        base_fee=10.0,
+    )
+    return crud.store.create(db, obj_in=store_in)
+
+
+def create_random_user_with_address(db: Session) -> models.UserAddress:
+    user_in = schemas.UserCreate(email=random_email(), password=random_lower_string())
+    user = crud.user.create(db, obj_in=user_in)
+    address_in = schemas.UserAddressCreate(
+        name=random_lower_string(),
+        phone_number="0900000000",
+        address=random_lower_string(),
+    )
+    return crud.user_address.create(db, obj_in=address_in, user_id=user.id)
+
+
+def create_random_consignment(
+    db: Session, *, codes: Optional[List[str]] = None, with_shipments: bool = True
+) -> models.Consignment:
+    """
+    Create a consignment with its own stores and customer, plus one
+    shipment per foreign shipment code.
+    """
+    source_store = create_random_store(db, StoreType.SOURCE)
+    dest_store = create_random_store(db, StoreType.DESTINATION)
+    user_address = create_random_user_with_address(db)
+    if codes is None:
+        codes = [random_lower_string() for _ in range(3)]
+
+    consignment_in = schemas.ConsignmentCreate(
+        user_id=user_address.user_id,
+        source_store_id=source_store.id,
+        dest_store_id=dest_store.id,
+        user_address_id=user_address.id,
+        shipping_status=0,
+        store_status=0,
+        weight=1.0,
+        height=1.0,
+        wide=1.0,
+        length=1.0,
+        weight_packaged=1.0,
+        height_packaged=1.0,
+        wide_packaged=1.0,
+        length_packaged=1.0,
+        number_of_packages=len(codes),
+        foreign_shipment_codes=codes,
+    )
+    consignment = crud.consignment.create(db, obj_in=consignment_in)
+
+    if with_shipments:
+        for code in codes:
+            shipment_in = schemas.ShipmentCreate(
+                consignment_id=consignment.id,
+                shipment_status=ShipmentStatus.FOREIGN_SHIPPING.value,
+                finance_status=ShipmentFinanceStatus.NOT_APPROVED.value,
+                code=code,
+                user_id=consignment.user_id,
+            )
+            crud.shipment.create(db, obj_in=shipment_in)
+
+    return consignment